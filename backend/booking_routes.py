@@ -1,111 +1,223 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from backend.database import get_db
-from backend.services.booking_service import BookingService
+from backend.config import settings
+from backend.database import get_async_db
+from backend.services.booking_service import AsyncBookingService
+from backend.services.booking_events import booking_events
+from backend.services.track_store import track_store
+from backend.services import dispatch_service
+from backend.services.dispatch_queue import dispatch_queue
 from backend.schemas import (
     BookingCreate, BookingResponse, BookingUpdate, BookingStatusUpdate,
-    BookingWithDetailsResponse, BookingStatusHistoryResponse, TruckAssignmentRequest
+    BookingWithDetailsResponse, BookingStatusHistoryResponse, TruckAssignmentRequest,
+    DispatchRunResponse, DispatchQueueStatsResponse, BookingDetailsBatchRequest, TrackPointResponse, TripTrackResponse
 )
+from backend.core.read_replicas import get_async_read_db
 from backend.core.security import get_current_active_user
+from backend.core.exceptions import ValidationException
 from backend.models.user import User, UserRole
 from backend.models.booking import BookingStatus
+from backend.utils.pagination import PageParams, set_next_cursor
 
 router = APIRouter(prefix="/api/v1/bookings", tags=["Bookings"])
 
 # POST /bookings - Create a new material booking
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
-def create_booking(
+async def create_booking(
     booking_data: BookingCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Create a new material booking with automatic truck assignment"""
-    service = BookingService(db)
-    booking = service.create_booking(current_user.id, booking_data)
+    service = AsyncBookingService(db)
+    booking = await service.create_booking(current_user.id, booking_data)
     return booking
 
 # GET /bookings - List all bookings
 @router.get("/", response_model=List[BookingResponse])
-def get_bookings(
+async def get_bookings(
+    response: Response,
     status: Optional[BookingStatus] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all bookings with optional status filtering"""
-    service = BookingService(db)
-    bookings = service.get_bookings(current_user.id, status)
+    """Get bookings newest first with optional status filtering; the next page's cursor is in X-Next-Cursor"""
+    service = AsyncBookingService(db)
+    bookings, next_cursor = await service.get_bookings(current_user.id, status, page)
+    set_next_cursor(response, next_cursor)
     return bookings
 
+# POST /bookings/dispatch/run - Assign all pending bookings in one batch (Admin only)
+@router.post("/dispatch/run", response_model=DispatchRunResponse)
+def run_batch_dispatch(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Run the batch dispatch optimizer over all pending bookings (Admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can run batch dispatch")
+    return dispatch_service.run_dispatch_once()
+
+# GET /bookings/dispatch/stats - Statistics of the last batch dispatch run (Admin only)
+@router.get("/dispatch/stats", response_model=Optional[DispatchRunResponse])
+def get_batch_dispatch_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get statistics of the last batch dispatch run (Admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view dispatch statistics")
+    return dispatch_service.last_run
+
+# GET /bookings/dispatch/queue - State of the background dispatch queue (Admin only)
+@router.get("/dispatch/queue", response_model=DispatchQueueStatsResponse)
+def get_dispatch_queue_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the background dispatch queue's backlog and how many bookings it gave up on (Admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view dispatch statistics")
+    return DispatchQueueStatsResponse(running=dispatch_queue.running, queued=len(dispatch_queue), gave_up=dispatch_queue.gave_up)
+
+# POST /bookings/details - Get details of many bookings at once
+@router.post("/details", response_model=List[BookingWithDetailsResponse])
+async def get_bookings_details(
+    batch: BookingDetailsBatchRequest,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get detailed booking information for up to BOOKING_DETAILS_BATCH_MAX bookings in one request"""
+    if len(batch.booking_ids) > settings.BOOKING_DETAILS_BATCH_MAX:
+        raise ValidationException(f"At most {settings.BOOKING_DETAILS_BATCH_MAX} booking ids can be requested at once")
+
+    # Non-admins only get their own bookings back
+    owner_id = None if current_user.role == UserRole.ADMIN else current_user.id
+    service = AsyncBookingService(db)
+    return await service.get_bookings_with_details(batch.booking_ids, owner_id)
+
+# GET /bookings/events - Stream status changes of the user's bookings
+@router.get("/events")
+async def stream_booking_events(
+    booking_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Server-Sent Events stream of status changes of the current user's bookings, as customer or truck owner.
+
+    Admins receive every booking's changes. ``booking_id`` narrows the stream to one booking.
+    """
+    if not booking_events.running:
+        raise HTTPException(status_code=503, detail="Booking event stream is not available")
+
+    # The stream can stay open for hours; hand the authentication query's connection back to the pool now
+    await db.close()
+    user_id = None if current_user.role == UserRole.ADMIN else current_user.id
+    subscription = booking_events.subscribe(user_id, booking_id)
+    return StreamingResponse(
+        booking_events.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # GET /bookings/:id - Get booking details + status history
 @router.get("/{booking_id}", response_model=BookingWithDetailsResponse)
-def get_booking_details(
+async def get_booking_details(
     booking_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get detailed booking information with all related data"""
-    service = BookingService(db)
-    booking = service.get_booking_with_details(booking_id)
+    service = AsyncBookingService(db)
+    booking = await service.get_booking_with_details(booking_id)
     
     # Check if user is authorized to view this booking
-    if booking.user_id != current_user.id and current_user.role != UserRole.ADMIN:
+    if booking.user_id != str(current_user.id) and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized to view this booking")
     
     return booking
 
 # GET /bookings/:id/status-history - Get booking status history
 @router.get("/{booking_id}/status-history", response_model=List[BookingStatusHistoryResponse])
-def get_booking_status_history(
+async def get_booking_status_history(
     booking_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get booking status history"""
-    service = BookingService(db)
-    booking = service.get_booking_details(booking_id)
+    service = AsyncBookingService(db)
+    booking = await service.get_booking_details(booking_id)
     
     # Check if user is authorized to view this booking
-    if booking.user_id != current_user.id and current_user.role != UserRole.ADMIN:
+    if str(booking.user_id) != str(current_user.id) and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized to view this booking")
     
-    history = service.get_booking_status_history(booking_id)
+    history = await service.get_booking_status_history(booking_id)
     return history
 
+# GET /bookings/:id/track - Get the trip's GPS track
+@router.get("/{booking_id}/track", response_model=TripTrackResponse)
+async def get_booking_track(
+    booking_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution_seconds: float = Query(0, ge=0, description="Keep at most one point per this many seconds"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the GPS track of a booking's trip between start and end, downsampled to resolution_seconds"""
+    service = AsyncBookingService(db)
+    booking = await service.get_booking_details(booking_id)
+
+    # The customer, the assigned truck's owner and admins can follow the truck
+    if current_user.role != UserRole.ADMIN and str(booking.user_id) != str(current_user.id):
+        if str(await service.get_truck_owner_id(booking) or "") != str(current_user.id):
+            raise HTTPException(status_code=403, detail="Not authorized to view this booking")
+
+    points, segments_read = await db.run_sync(
+        lambda session: track_store.polyline(session, booking.id, start, end, resolution_seconds)
+    )
+    return TripTrackResponse(
+        booking_id=str(booking.id),
+        points=[TrackPointResponse(recorded_at=t, latitude=lat, longitude=lon) for t, lat, lon in points],
+        segments_read=segments_read
+    )
+
 # PATCH /bookings/:id/assign-truck - Auto-assign best truck
 @router.patch("/{booking_id}/assign-truck", response_model=BookingResponse)
-def assign_truck(
+async def assign_truck(
     booking_id: str,
     assignment_data: TruckAssignmentRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Assign truck to booking (manual or auto-assign)"""
-    service = BookingService(db)
-    booking = service.assign_truck(booking_id, assignment_data)
+    service = AsyncBookingService(db)
+    booking = await service.assign_truck(booking_id, assignment_data)
     return booking
 
 # PATCH /bookings/:id/status - Update booking state/status
 @router.patch("/{booking_id}/status", response_model=BookingResponse)
-def update_booking_status(
+async def update_booking_status(
     booking_id: str,
     status_update: BookingStatusUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update booking status and state"""
-    service = BookingService(db)
-    booking = service.update_booking_status(booking_id, status_update)
+    service = AsyncBookingService(db)
+    booking = await service.update_booking_status(booking_id, status_update)
     return booking
 
 # DELETE /bookings/:id - Cancel booking
 @router.delete("/{booking_id}", response_model=BookingResponse)
-def cancel_booking(
+async def cancel_booking(
     booking_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Cancel a booking"""
-    service = BookingService(db)
-    booking = service.cancel_booking(booking_id, current_user.id)
+    service = AsyncBookingService(db)
+    booking = await service.cancel_booking(booking_id, current_user.id)
     return booking 
\ No newline at end of file
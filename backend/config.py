@@ -1,11 +1,31 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import Dict, List, Optional
 from functools import lru_cache
 
 
 class Settings(BaseSettings):
     # Required environment variables with defaults
     DATABASE_URL: str
+    # Async routes' connection; derived from DATABASE_URL (aiomysql / aiosqlite) when unset
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Connection pool of each engine (sync and async each get their own): connections kept open,
+    # extra ones opened under load, how long a checkout waits before failing, and connection lifetime
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 3600
+    DB_POOL_PRE_PING: bool = True
+    # Async engine overrides of DB_POOL_SIZE / DB_MAX_OVERFLOW
+    DB_ASYNC_POOL_SIZE: Optional[int] = None
+    DB_ASYNC_MAX_OVERFLOW: Optional[int] = None
+    # Read replicas serving read-only routes (none: every read goes to the primary), how often and
+    # how patiently they are health checked, and how long a user's reads stay on the primary after
+    # they commit a write, for at most READ_YOUR_WRITES_MAX_USERS recent writers
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_HEALTH_CHECK_SECONDS: float = 10.0
+    REPLICA_HEALTH_TIMEOUT_SECONDS: float = 2.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    READ_YOUR_WRITES_MAX_USERS: int = 100000
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -15,6 +35,97 @@ class Settings(BaseSettings):
     APP_NAME: str = "Mudline Backend"
     APP_VERSION: str = "1.0.0"
 
+    # Truck matching
+    TRUCK_MATCH_RADIUS_KM: float = 50.0
+    TRUCK_MATCH_CANDIDATES: int = 10
+    TRUCK_INDEX_CELL_DEG: float = 0.1
+    TRUCK_POOL_RECONCILE_SECONDS: float = 60.0
+    # Positions of trucks moved this recently by GPS pings (possibly not yet written
+    # behind) are kept by reconcile; their other fields are still taken from the row
+    TRUCK_POOL_RECONCILE_KEEP_MOVED_SECONDS: float = 15.0
+    # Weights of the truck scoring signals (see backend/services/truck_scoring.py)
+    TRUCK_SCORE_WEIGHTS: Dict[str, float] = {
+        "distance": 0.45,
+        "idle_time": 0.2,
+        "least_used": 0.1,
+        "owner_rating": 0.15,
+        "preferred_owner": 0.1
+    }
+
+    # Dispatch: "immediate" assigns inside create_booking, "queue" hands new bookings to
+    # background dispatch workers, "batch" assigns pending bookings together every window
+    DISPATCH_MODE: str = "immediate"
+    DISPATCH_QUEUE_WORKERS: int = 4
+    DISPATCH_MAX_ATTEMPTS: int = 8
+    DISPATCH_RETRY_BASE_SECONDS: float = 2.0
+    DISPATCH_RETRY_MAX_SECONDS: float = 60.0
+    DISPATCH_BATCH_WINDOW_SECONDS: float = 30.0
+    DISPATCH_BATCH_MAX_BOOKINGS: int = 2000
+    # Consecutive batch runs a booking may go unassigned before batch dispatch leaves it to admins
+    DISPATCH_BATCH_MAX_MISSES: int = 20
+    DISPATCH_MAX_DISTANCE_KM: float = 150.0
+    DISPATCH_SOLVER_WORKERS: int = 1
+
+    # Bookings more than this far in the future are held by the scheduler and
+    # dispatched this long before their booking_time
+    BOOKING_SCHEDULE_LEAD_MINUTES: int = 60
+
+    # Most booking ids accepted by one batch details request
+    BOOKING_DETAILS_BATCH_MAX: int = 200
+
+    # Booking status history: "transactional" inserts it with the status change's commit,
+    # "buffered" writes committed rows in batches from a background task
+    HISTORY_WRITE_MODE: str = "transactional"
+    HISTORY_BATCH_SIZE: int = 500
+    HISTORY_FLUSH_INTERVAL_SECONDS: float = 0.5
+    # Most rows buffered while the database keeps failing; the oldest are dropped beyond it
+    HISTORY_BUFFER_MAX: int = 50000
+
+    # Booking status event stream: events buffered per slow client, and keep-alive interval
+    BOOKING_EVENTS_QUEUE_SIZE: int = 100
+    BOOKING_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # GPS ingestion: most pings per request, and how often latest positions and raw
+    # pings buffered in memory are written to the database
+    TRUCK_LOCATION_BATCH_MAX: int = 500
+    TRUCK_LOCATION_FLUSH_SECONDS: float = 5.0
+    TRUCK_LOCATION_INSERT_CHUNK: int = 5000
+    # Most raw pings held while the database is unavailable; the oldest are dropped beyond it
+    TRUCK_LOCATION_BUFFER_MAX: int = 200000
+    # Trip tracks of bookings are stored in blobs covering this many seconds each
+    TRACK_SEGMENT_SECONDS: int = 600
+
+    # Preloaded-material offer search: reload interval of the in-memory index and result cap
+    OFFER_INDEX_RELOAD_SECONDS: float = 60.0
+    OFFER_SEARCH_LIMIT_MAX: int = 100
+
+    # Nearby material location search
+    LOCATION_SEARCH_RADIUS_MAX_KM: float = 200.0
+    LOCATION_SEARCH_LIMIT_MAX: int = 100
+
+    # Price quotes: tariff/price cache lifetime, most quotes per batch request, and the
+    # factor turning straight-line distance into an estimate of road distance
+    QUOTE_TABLES_TTL_SECONDS: float = 300.0
+    QUOTE_BATCH_MAX: int = 1000
+    QUOTE_ROAD_DISTANCE_FACTOR: float = 1.25
+
+    # Authentication: per-process cache of the user fields authorization needs, and whether
+    # role and active status are taken from the claims of short-lived tokens without a lookup
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+    AUTH_TRUSTED_TOKEN_MAX_MINUTES: int = 15
+
+    # Password hashing: bcrypt processes (default one per CPU, 0 hashes in the request thread),
+    # calls that may wait for a free process, and how long one waits before being refused with 503
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_HASH_WAIT_SECONDS: float = 2.0
+
+    # Keyset pagination of list endpoints
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+
     # CORS Configuration
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.models.user import User
+from backend.models.user_role import UserRole
+
+# Session.info key holding the ids of users changed in the session's current transaction
+_CHANGED_KEY = "auth_user_changes"
+
+
+class AuthenticatedUser:
+    """The fields of the current user that authorization needs.
+
+    Returned by get_current_user instead of a User row; routes that need the
+    rest of the user load it themselves.
+    """
+
+    __slots__ = ("id", "role", "is_active")
+
+    def __init__(self, id: str, role: UserRole, is_active: bool):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        return cls(str(user.id), user.role, bool(user.is_active))
+
+
+class AuthUserCache:
+    """Bounded LRU of AuthenticatedUser by user id, each entry kept for AUTH_USER_CACHE_TTL_SECONDS.
+
+    Entries are dropped when a transaction that changed or deleted the user
+    commits, so updates, deactivation and password changes made by this
+    process apply to the next request; other workers see them within the TTL.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, Tuple[float, AuthenticatedUser]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: str) -> Optional[AuthenticatedUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user: AuthenticatedUser) -> None:
+        expires_at = time.monotonic() + settings.AUTH_USER_CACHE_TTL_SECONDS
+        with self._lock:
+            self._entries[user.id] = (expires_at, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > settings.AUTH_USER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _after_flush(self, session: Session, flush_context) -> None:
+        for instance in list(session.dirty) + list(session.deleted):
+            if isinstance(instance, User):
+                session.info.setdefault(_CHANGED_KEY, set()).add(str(instance.id))
+
+    def _after_commit(self, session: Session) -> None:
+        for user_id in session.info.pop(_CHANGED_KEY, ()):
+            self.invalidate(user_id)
+
+    def _after_transaction_end(self, session: Session, transaction) -> None:
+        if transaction.parent is None:
+            session.info.pop(_CHANGED_KEY, None)
+
+
+auth_user_cache = AuthUserCache()
+
+event.listen(Session, "after_flush", auth_user_cache._after_flush)
+event.listen(Session, "after_commit", auth_user_cache._after_commit)
+event.listen(Session, "after_transaction_end", auth_user_cache._after_transaction_end)
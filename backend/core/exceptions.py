@@ -42,6 +42,12 @@ class LocationNotFoundException(MudlineXException):
         super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
 
 
+class OfferNotFoundException(MudlineXException):
+    def __init__(self, offer_id: str = None):
+        detail = f"Offer not found" if offer_id is None else f"Offer with id {offer_id} not found"
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
 class TruckNotAvailableException(MudlineXException):
     def __init__(self, truck_id: str):
         super().__init__(
@@ -50,11 +56,24 @@ class TruckNotAvailableException(MudlineXException):
         )
 
 
+class OfferNotAvailableException(MudlineXException):
+    def __init__(self, offer_id: str):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Offer {offer_id} is no longer available"
+        )
+
+
 class BookingNotAllowedException(MudlineXException):
     def __init__(self, message: str):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
 
 
+class RatingNotAllowedException(MudlineXException):
+    def __init__(self, message: str):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+
+
 class InsufficientCapacityException(MudlineXException):
     def __init__(self, truck_capacity: float, requested_quantity: float):
         super().__init__(
@@ -80,4 +99,13 @@ class UnauthorizedAccessException(MudlineXException):
 
 class ValidationException(MudlineXException):
     def __init__(self, message: str):
-        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=message) 
\ No newline at end of file
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=message)
+
+
+class ServiceBusyException(MudlineXException):
+    def __init__(self, message: str = "Service is busy, please retry shortly", retry_after_seconds: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=message,
+            headers={"Retry-After": str(retry_after_seconds)}
+        )
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from passlib.context import CryptContext
+from backend.config import settings
+from backend.core.exceptions import ServiceBusyException
+
+# Password hashing
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+# Calls allowed to run or wait for a worker at once; the rest are refused
+_hash_slots: Optional[threading.BoundedSemaphore] = None
+_pool_lock = threading.Lock()
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def hash_workers() -> int:
+    if settings.PASSWORD_HASH_WORKERS is None:
+        return os.cpu_count() or 1
+    return settings.PASSWORD_HASH_WORKERS
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool, _hash_slots
+    with _pool_lock:
+        if _hash_pool is None:
+            workers = hash_workers()
+            _hash_pool = ProcessPoolExecutor(max_workers=workers)
+            _hash_slots = threading.BoundedSemaphore(workers + settings.PASSWORD_HASH_QUEUE_SIZE)
+        return _hash_pool
+
+
+def run_in_hash_pool(fn, *args):
+    """Run a bcrypt call in the password hashing processes and wait for its result.
+
+    bcrypt keeps a CPU busy for tens of milliseconds per call; in its own
+    processes it neither blocks this worker's other requests nor is limited
+    to one core. Hashing runs inline when PASSWORD_HASH_WORKERS is 0.
+    Raises ServiceBusyException when all workers are busy and the queue is
+    still full after PASSWORD_HASH_WAIT_SECONDS.
+    """
+    if hash_workers() == 0:
+        return fn(*args)
+    pool = _get_hash_pool()
+    if not _hash_slots.acquire(timeout=settings.PASSWORD_HASH_WAIT_SECONDS):
+        raise ServiceBusyException("Too many logins in progress, please retry shortly")
+    try:
+        return pool.submit(fn, *args).result()
+    finally:
+        _hash_slots.release()
+
+
+async def run_in_hash_pool_async(fn, *args):
+    """run_in_hash_pool for async callers: the event loop keeps serving other requests meanwhile"""
+    if hash_workers() == 0:
+        return await asyncio.to_thread(fn, *args)
+    pool = _get_hash_pool()
+    slots = _hash_slots
+    # Only a full queue makes the wait block, so that rare wait gets a thread
+    if not slots.acquire(blocking=False) and not await asyncio.to_thread(
+        slots.acquire, timeout=settings.PASSWORD_HASH_WAIT_SECONDS
+    ):
+        raise ServiceBusyException("Too many logins in progress, please retry shortly")
+    try:
+        return await asyncio.wrap_future(pool.submit(fn, *args))
+    finally:
+        slots.release()
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool, _hash_slots
+    with _pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+            _hash_pool = None
+            _hash_slots = None
@@ -0,0 +1,169 @@
+import bisect
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is unbounded
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolMetrics:
+    """Counters and checkout wait histogram of one engine's connection pool.
+
+    Connection lifecycle counters come from pool events. Checkout wait is the
+    time a caller spends getting a connection from the pool, including opening
+    a new one, and is only measured by the instrumented pool classes below.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._seen = weakref.WeakSet()
+        self._invalidated = weakref.WeakSet()
+        self.checkouts = 0
+        self.checkins = 0
+        self.checkout_timeouts = 0
+        self.connections_created = 0
+        self.connections_recycled = 0
+        self.connections_invalidated = 0
+        self.connections_closed = 0
+        self.wait_buckets = [0] * (len(CHECKOUT_WAIT_BUCKETS_MS) + 1)
+        self.wait_count = 0
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def observe_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_buckets[bisect.bisect_left(CHECKOUT_WAIT_BUCKETS_MS, wait_ms)] += 1
+            self.wait_count += 1
+            self.wait_sum_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            if timed_out:
+                self.checkout_timeouts += 1
+
+    def _on_connect(self, dbapi_connection, record) -> None:
+        with self._lock:
+            self.connections_created += 1
+            # A record reconnecting without having been invalidated replaced a connection past pool_recycle
+            if record in self._invalidated:
+                self._invalidated.discard(record)
+            elif record in self._seen:
+                self.connections_recycled += 1
+            self._seen.add(record)
+
+    def _on_checkout(self, dbapi_connection, record, proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, record) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, record, exception) -> None:
+        with self._lock:
+            self.connections_invalidated += 1
+            self._invalidated.add(record)
+
+    def _on_close(self, dbapi_connection, record) -> None:
+        with self._lock:
+            self.connections_closed += 1
+
+    def snapshot(self, pool) -> dict:
+        """Current counters, plus the live occupancy of ``pool`` where its class reports it"""
+        sized = isinstance(pool, QueuePool)
+        with self._lock:
+            cumulative, buckets = 0, []
+            for bound, count in zip(CHECKOUT_WAIT_BUCKETS_MS + (None,), self.wait_buckets):
+                cumulative += count
+                buckets.append({"le_ms": bound, "count": cumulative})
+            return {
+                "name": self.name,
+                "pool_class": type(pool).__name__,
+                "pool_size": pool.size() if sized else None,
+                "max_overflow": pool._max_overflow if sized else None,
+                "checked_out": pool.checkedout() if sized else self.checkouts - self.checkins,
+                "checked_in": pool.checkedin() if sized else None,
+                "overflow": max(pool.overflow(), 0) if sized else None,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "connections_created": self.connections_created,
+                "connections_recycled": self.connections_recycled,
+                "connections_invalidated": self.connections_invalidated,
+                "connections_closed": self.connections_closed,
+                "checkout_wait": {
+                    "count": self.wait_count,
+                    "sum_ms": round(self.wait_sum_ms, 3),
+                    "max_ms": round(self.wait_max_ms, 3),
+                    "buckets": buckets
+                }
+            }
+
+
+class _TimedCheckout:
+    """Pool mixin recording how long each checkout waited into the pool's PoolMetrics"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            self._observe(started, timed_out=True)
+            raise
+        self._observe(started)
+        return record
+
+    def _observe(self, started: float, timed_out: bool = False) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_wait((time.perf_counter() - started) * 1000, timed_out)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; it keeps reporting to the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool that times checkouts"""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times checkouts"""
+
+
+class PoolMetricsRegistry:
+    """PoolMetrics of every engine of the process, by name"""
+
+    def __init__(self):
+        self._engines: Dict[str, object] = {}
+        self._metrics: Dict[str, PoolMetrics] = {}
+
+    def register(self, name: str, engine) -> PoolMetrics:
+        """Start collecting metrics of ``engine`` (a sync Engine, or an AsyncEngine's sync_engine)"""
+        metrics = PoolMetrics(name)
+        event.listen(engine, "connect", metrics._on_connect)
+        event.listen(engine, "checkout", metrics._on_checkout)
+        event.listen(engine, "checkin", metrics._on_checkin)
+        event.listen(engine, "invalidate", metrics._on_invalidate)
+        event.listen(engine, "soft_invalidate", metrics._on_invalidate)
+        event.listen(engine, "close", metrics._on_close)
+        if isinstance(engine.pool, _TimedCheckout):
+            engine.pool.metrics = metrics
+        self._engines[name] = engine
+        self._metrics[name] = metrics
+        return metrics
+
+    def get(self, name: str) -> Optional[PoolMetrics]:
+        return self._metrics.get(name)
+
+    def snapshot(self) -> List[dict]:
+        return [metrics.snapshot(self._engines[name].pool) for name, metrics in self._metrics.items()]
+
+
+pool_metrics = PoolMetricsRegistry()
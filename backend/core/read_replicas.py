@@ -0,0 +1,156 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+import structlog
+from fastapi import Depends
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from backend.config import settings
+from backend.core.pool_metrics import pool_metrics
+from backend.core.security import verify_token
+from backend.database import (
+    AsyncSessionLocal, SessionLocal, _async_engine_options, _engine_options, async_database_url, request_user_id
+)
+
+logger = structlog.get_logger()
+
+# Session.info key set once the session's current transaction has flushed changes
+_WROTE_KEY = "replica_router_wrote"
+
+# Like oauth2_scheme, but anonymous requests get None instead of a 401
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
+
+
+class Replica:
+    """A read replica, with a sync and an async engine like the primary's"""
+
+    def __init__(self, name: str, engine, async_engine):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.async_session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+        self.healthy = True
+
+    @classmethod
+    def from_url(cls, name: str, url: str) -> "Replica":
+        engine = create_engine(url, **_engine_options())
+        async_engine = create_async_engine(async_database_url(url), **_async_engine_options(url))
+        pool_metrics.register(name, engine)
+        pool_metrics.register(f"{name}-async", async_engine.sync_engine)
+        return cls(name, engine, async_engine)
+
+
+class ReplicaRouter:
+    """Chooses where read-only requests read from.
+
+    Reads go round-robin to the replicas that passed their last health check.
+    They fall back to the primary when no replica is healthy, and for
+    READ_YOUR_WRITES_SECONDS after the requesting user committed a write, so
+    users see their own changes despite replication lag.
+    """
+
+    def __init__(self, replicas: List[Replica]):
+        self.replicas = replicas
+        self._turn = itertools.count()
+        self._writes: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def note_write(self, user_id) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._writes[str(user_id)] = now + settings.READ_YOUR_WRITES_SECONDS
+            self._writes.move_to_end(str(user_id))
+            # Entries are in deadline order, so expired ones are at the front
+            while self._writes and (
+                next(iter(self._writes.values())) <= now or len(self._writes) > settings.READ_YOUR_WRITES_MAX_USERS
+            ):
+                self._writes.popitem(last=False)
+
+    def recently_wrote(self, user_id) -> bool:
+        deadline = self._writes.get(str(user_id))
+        return deadline is not None and deadline > time.monotonic()
+
+    def pick(self, user_id=None) -> Optional[Replica]:
+        """The replica to read from, or None to read from the primary"""
+        if not self.replicas or (user_id is not None and self.recently_wrote(user_id)):
+            return None
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    async def check_health(self) -> None:
+        for replica in self.replicas:
+            try:
+                async with replica.async_engine.connect() as conn:
+                    await asyncio.wait_for(conn.execute(text("SELECT 1")), settings.REPLICA_HEALTH_TIMEOUT_SECONDS)
+                healthy = True
+            except Exception as e:
+                healthy = False
+                if replica.healthy:
+                    logger.warning("Read replica failed its health check", replica=replica.name, error=str(e))
+            if healthy and not replica.healthy:
+                logger.info("Read replica healthy again", replica=replica.name)
+            replica.healthy = healthy
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            replica.engine.dispose()
+            await replica.async_engine.dispose()
+
+    def _after_flush(self, session: Session, flush_context) -> None:
+        session.info[_WROTE_KEY] = True
+
+    def _after_commit(self, session: Session) -> None:
+        user_id = request_user_id.get()
+        if session.info.pop(_WROTE_KEY, False) and user_id is not None:
+            self.note_write(user_id)
+
+    def _after_transaction_end(self, session: Session, transaction) -> None:
+        if transaction.parent is None:
+            session.info.pop(_WROTE_KEY, None)
+
+
+replica_router = ReplicaRouter(
+    [Replica.from_url(f"replica-{i}", url) for i, url in enumerate(settings.DATABASE_REPLICA_URLS)]
+)
+
+event.listen(Session, "after_flush", replica_router._after_flush)
+event.listen(Session, "after_commit", replica_router._after_commit)
+event.listen(Session, "after_transaction_end", replica_router._after_transaction_end)
+
+
+async def replica_health_loop() -> None:
+    """Re-check every replica each REPLICA_HEALTH_CHECK_SECONDS"""
+    while True:
+        await replica_router.check_health()
+        await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+
+def _token_user_id(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[str]:
+    """The user a request's bearer token names, if any; only used to route its reads"""
+    payload = verify_token(token) if token else None
+    return payload.get("sub") if payload else None
+
+
+def get_read_db(user_id: Optional[str] = Depends(_token_user_id)):
+    """get_db for read-only routes: a session on a replica, or on the primary when replica_router says so."""
+    replica = replica_router.pick(user_id)
+    db = (replica.session_factory if replica else SessionLocal)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(user_id: Optional[str] = Depends(_token_user_id)):
+    """get_async_db for read-only routes: a session on a replica, or on the primary when replica_router says so."""
+    replica = replica_router.pick(user_id)
+    async with (replica.async_session_factory if replica else AsyncSessionLocal)() as db:
+        yield db
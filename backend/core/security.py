@@ -1,29 +1,39 @@
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from backend.config import settings
-from backend.database import get_db
+from backend.database import get_async_db, request_user_id
 from backend.models.user import User
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from backend.models.user_role import UserRole
+from backend.core.auth_cache import AuthenticatedUser, auth_user_cache
+from backend.core.password_hashing import (
+    check_password, hash_password, pwd_context, run_in_hash_pool, run_in_hash_pool_async
+)
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash, in the password hashing pool"""
+    return run_in_hash_pool(check_password, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
+    """Hash a password, in the password hashing pool"""
+    return run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_in_hash_pool_async(check_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_in_hash_pool_async(hash_password, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -34,7 +44,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -48,11 +58,30 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
+def _trusted_claims(payload: dict) -> Optional[AuthenticatedUser]:
+    """The user described by a short-lived token's own claims, when AUTH_TRUST_TOKEN_CLAIMS allows it"""
+    if not settings.AUTH_TRUST_TOKEN_CLAIMS:
+        return None
+    issued_at, expires_at = payload.get("iat"), payload.get("exp")
+    if issued_at is None or expires_at is None or "role" not in payload or "active" not in payload:
+        return None
+    if expires_at - issued_at > settings.AUTH_TRUSTED_TOKEN_MAX_MINUTES * 60:
+        return None
+    try:
+        return AuthenticatedUser(payload["sub"], UserRole(payload["role"]), bool(payload["active"]))
+    except ValueError:
+        return None
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user"""
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthenticatedUser:
+    """Get the current authenticated user's id, role and active status.
+
+    Served from the token's claims when they are trusted, otherwise from the
+    auth user cache, and only on a miss from the database.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -67,9 +96,14 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _trusted_claims(payload) or auth_user_cache.get(str(user_id))
     if user is None:
-        raise credentials_exception
+        result = await db.execute(select(User.id, User.role, User.is_active).where(User.id == user_id))
+        row = result.first()
+        if row is None:
+            raise credentials_exception
+        user = AuthenticatedUser(str(row.id), row.role, bool(row.is_active))
+        auth_user_cache.put(user)
     
     if not user.is_active:
         raise HTTPException(
@@ -77,10 +111,12 @@ async def get_current_user(
             detail="Inactive user"
         )
     
+    # Commits made while serving the request count as this user's writes (see read_replicas)
+    request_user_id.set(user.id)
     return user
 
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
     """Get the current active user"""
     if not current_user.is_active:
         raise HTTPException(
@@ -90,11 +126,11 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
     return current_user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """Authenticate a user with email and password"""
-    user = db.query(User).filter(User.email == email).first()
+    user = (await db.execute(select(User).where(User.email == email))).scalar_one_or_none()
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         return None
-    return user 
\ No newline at end of file
+    return user
@@ -1,26 +1,107 @@
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from backend.config import settings
+from backend.core.pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, pool_metrics
+
+# Async driver replacing each sync driver in DATABASE_URL
+_ASYNC_DRIVERS = {"mysql": "mysql+aiomysql", "sqlite": "sqlite+aiosqlite"}
+
+
+def _engine_options() -> dict:
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Enable connection health checks
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "echo": False            # Set to True for SQL query logging
+    }
+
 
 # MySQL engine configuration
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,  # Enable connection health checks
-    pool_recycle=3600,    # Recycle connections after 1 hour
-    pool_size=5,          # Number of connections to keep open
-    max_overflow=10,      # Number of connections to allow in overflow
-    echo=False            # Set to True for SQL query logging
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_options())
+pool_metrics.register("sync", engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def async_database_url(url: str) -> str:
+    """``url`` with its driver swapped for the async one"""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    return parsed.set(drivername=driver).render_as_string(hide_password=False) if driver else url
+
+
+def _async_engine_options(url: str) -> dict:
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS, "echo": False}
+    # aiosqlite opens a connection per checkout; there is no pool to size
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=settings.DB_ASYNC_POOL_SIZE if settings.DB_ASYNC_POOL_SIZE is not None else settings.DB_POOL_SIZE,
+            max_overflow=(
+                settings.DB_ASYNC_MAX_OVERFLOW if settings.DB_ASYNC_MAX_OVERFLOW is not None else settings.DB_MAX_OVERFLOW
+            ),
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS
+        )
+    return options
+
+
+# Async engine for routes that await their queries instead of holding a thread per call
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL),
+    **_async_engine_options(settings.DATABASE_URL)
+)
+pool_metrics.register("async", async_engine.sync_engine)
+
+# Objects stay loaded after commit: reloading them lazily would need IO outside an await
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+# Id of the user the current request is authenticated as, set by get_current_user
+request_user_id: ContextVar[Optional[str]] = ContextVar("request_user_id", default=None)
+
+
 def get_db():
     """Dependency generator that provides a database session and ensures it is closed."""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """Dependency generator that provides an async database session and ensures it is closed."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@contextmanager
+def unit_of_work(db):
+    """Commit everything done inside the block exactly once, or roll all of it back."""
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+@asynccontextmanager
+async def async_unit_of_work(db: AsyncSession):
+    """unit_of_work for an AsyncSession."""
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
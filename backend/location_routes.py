@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List
+from backend.config import settings
+from backend.core.read_replicas import get_read_db
+from backend.schemas import NearbyMaterialLocationResponse
+from backend.services.location_service import MaterialLocationService
+
+router = APIRouter(prefix="/api/v1/locations", tags=["Locations"])
+
+
+# GET /locations/nearby - Material locations near a point
+@router.get("/nearby", response_model=List[NearbyMaterialLocationResponse])
+def search_nearby_locations(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    material_type: str = Query(..., description="Material sold at the location, e.g. Sand"),
+    radius_km: float = Query(30, gt=0),
+    sort_by: str = Query("price", pattern="^(price|distance)$"),
+    limit: int = Query(20, ge=1),
+    include_out_of_stock: bool = False,
+    db: Session = Depends(get_read_db)
+):
+    """Find locations selling a material within radius_km (Public), cheapest or nearest first"""
+    service = MaterialLocationService(db)
+    return service.search_nearby(
+        latitude, longitude, material_type,
+        min(radius_km, settings.LOCATION_SEARCH_RADIUS_MAX_KM), sort_by,
+        min(limit, settings.LOCATION_SEARCH_LIMIT_MAX), include_out_of_stock
+    )
@@ -2,14 +2,32 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import structlog
 from backend.config import settings
-from backend.database import engine, Base
+from backend.database import engine, async_engine, Base, SessionLocal
 from backend.booking_routes import router as booking_router
 from backend.user_routes import router as user_router
 from backend.material_routes import router as material_router
 from backend.vehicle_type_routes import router as vehicle_type_router
 from backend.truck_routes import router as truck_router
+from backend.rating_routes import router as rating_router
+from backend.offer_routes import router as offer_router
+from backend.location_routes import router as location_router
+from backend.quote_routes import router as quote_router
+from backend.metrics_routes import router as metrics_router
+from backend.core.password_hashing import shutdown_hash_pool
+from backend.core.read_replicas import replica_health_loop, replica_router
+from backend.services.truck_pool import truck_pool, truck_pool_reconcile_loop
+from backend.services.booking_events import booking_events
+from backend.services.booking_scheduler import booking_scheduler
+from backend.services.dispatch_queue import dispatch_queue
+from backend.services.location_ingest import location_ingestor
+from backend.services.offer_service import offer_index_reload_loop, reload_offer_index
+from backend.services.status_history_writer import status_history_writer
+from backend.services.dispatch_service import (
+    batch_dispatch_loop, shutdown_solver_pool, assign_pending_booking, abandon_pending_booking, pending_booking_ids
+)
 
 # Import all models to ensure they are registered with SQLAlchemy
 from backend.models import *
@@ -49,11 +67,73 @@ async def lifespan(app: FastAPI):
             logger.info("Database tables created")
         except Exception as e:
             logger.error(f"Failed to create database tables: {e}")
+
+    # Load trucks into the in-memory pool used for matching
+    try:
+        with SessionLocal() as db:
+            pooled = truck_pool.load(db)
+        logger.info("Truck pool loaded", trucks=pooled)
+    except Exception as e:
+        logger.error(f"Failed to load truck pool: {e}")
+
+    # Push booking status changes to subscribed clients
+    booking_events.start()
+
+    # Write-behind of reported truck positions and GPS tracks
+    await location_ingestor.start(SessionLocal)
+
+    # Batched status history writes
+    if settings.HISTORY_WRITE_MODE == "buffered":
+        await status_history_writer.start(SessionLocal)
+
+    # Load available preloaded-material offers into the search index
+    try:
+        offers = await asyncio.to_thread(reload_offer_index)
+        logger.info("Offer index loaded", offers=offers)
+    except Exception as e:
+        logger.error(f"Failed to load offer index: {e}")
+
+    # Keep the truck pool and offer index in line with their tables, and periodically dispatch pending bookings in batches
+    background_tasks = [
+        asyncio.create_task(truck_pool_reconcile_loop()),
+        asyncio.create_task(offer_index_reload_loop())
+    ]
+    if settings.DISPATCH_MODE == "batch":
+        background_tasks.append(asyncio.create_task(batch_dispatch_loop()))
+    # Take read replicas out of rotation while they fail health checks
+    if replica_router.replicas:
+        background_tasks.append(asyncio.create_task(replica_health_loop()))
+
+    # Dispatch workers, fed by new bookings in queue mode and by the scheduler as future-dated
+    # bookings come due; bookings left pending by a previous run are queued or scheduled again
+    if settings.DISPATCH_MODE != "batch":
+        await dispatch_queue.start(assign_pending_booking, settings.DISPATCH_QUEUE_WORKERS, abandon_pending_booking)
+        await booking_scheduler.start(dispatch_queue.submit)
+        try:
+            due, scheduled = await asyncio.to_thread(pending_booking_ids)
+            for booking_id in due:
+                dispatch_queue.submit(booking_id)
+            for booking_id, booking_time in scheduled:
+                booking_scheduler.schedule(booking_id, booking_time)
+            logger.info("Pending bookings restored", queued=len(due), scheduled=len(scheduled))
+        except Exception as e:
+            logger.error(f"Failed to restore pending bookings: {e}")
     
     yield
     
     # Shutdown
     logger.info("Shutting down MudlineX application")
+    for task in background_tasks:
+        task.cancel()
+    booking_events.stop()
+    await booking_scheduler.stop()
+    await dispatch_queue.stop()
+    await status_history_writer.stop()
+    await location_ingestor.stop()
+    shutdown_solver_pool()
+    shutdown_hash_pool()
+    await async_engine.dispose()
+    await replica_router.dispose()
 
 
 # Create FastAPI application
@@ -137,9 +217,12 @@ app.include_router(booking_router)
 app.include_router(material_router)
 app.include_router(vehicle_type_router)
 app.include_router(truck_router)
-# app.include_router(locations.router, prefix="/api/v1/locations", tags=["Locations"])
+app.include_router(location_router)
+app.include_router(quote_router)
 # app.include_router(payments.router, prefix="/api/v1/payments", tags=["Payments"])
-# app.include_router(ratings.router, prefix="/api/v1/ratings", tags=["Ratings"])
+app.include_router(rating_router)
+app.include_router(offer_router)
+app.include_router(metrics_router)
 # app.include_router(notifications.router, prefix="/api/v1/notifications", tags=["Notifications"])
 
 
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+from backend.core.pool_metrics import pool_metrics
+from backend.core.security import get_current_active_user
+from backend.models.user import User, UserRole
+from backend.schemas import PoolMetricsResponse
+
+router = APIRouter(prefix="/api/v1/admin/metrics", tags=["Metrics"])
+
+
+# GET /admin/metrics/db-pools - Connection pool statistics of each database engine (Admin only)
+@router.get("/db-pools", response_model=List[PoolMetricsResponse])
+def get_db_pool_metrics(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Occupancy, connection lifecycle counters and checkout wait histogram of each engine's pool since start-up (Admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view database pool metrics")
+    return pool_metrics.snapshot()
@@ -1,13 +1,13 @@
 from .user import User
 from .profile import TruckOwnerProfile, CustomerProfile
-from .truck import Truck, PreloadedMaterial
+from .truck import Truck, PreloadedMaterial, TruckLocationPing
 from .location import MaterialLocation, LocationMaterial
-from .booking import Booking, BookingStatusHistory
+from .booking import Booking, BookingStatusHistory, TripTrackSegment
 from .payment import Payment
-from .rating import Rating
+from .rating import Rating, UserRatingAggregate
 from .notification import Notification
 from .material import Material, MaterialTypeModel, MaterialSource
-from .vehicle_type import VehicleType
+from .vehicle_type import VehicleType, FreightTariff
 
 __all__ = [
     "User",
@@ -15,15 +15,19 @@ __all__ = [
     "CustomerProfile",
     "Truck",
     "PreloadedMaterial",
+    "TruckLocationPing",
     "MaterialLocation",
     "LocationMaterial",
     "Booking",
     "BookingStatusHistory",
+    "TripTrackSegment",
     "Payment",
     "Rating",
+    "UserRatingAggregate",
     "Notification",
     "Material",
     "MaterialTypeModel",
     "MaterialSource",
-    "VehicleType"
+    "VehicleType",
+    "FreightTariff"
 ] 
\ No newline at end of file
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, Text, Integer, DECIMAL, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Text, Integer, DECIMAL, ForeignKey, Index, LargeBinary
+from sqlalchemy.dialects import mysql
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy_utils import UUIDType
@@ -34,6 +35,13 @@ class BookingState(str, enum.Enum):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # A customer's bookings, newest first, with and without a status filter
+        Index("ix_bookings_user_status_created", "user_id", "status", "created_at", "id"),
+        Index("ix_bookings_user_created", "user_id", "created_at", "id"),
+        # Pending bookings in arrival order for the dispatchers
+        Index("ix_bookings_status_created", "status", "created_at"),
+    )
 
     id = Column(UUIDType(binary=False), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUIDType(binary=False), ForeignKey("users.id"), nullable=False, index=True)
@@ -43,7 +51,7 @@ class Booking(Base):
     quantity = Column(DECIMAL(10, 2), nullable=False)
     status = Column(Enum(BookingStatus), default=BookingStatus.PENDING)
     assigned_truck_id = Column(UUIDType(binary=False), ForeignKey("trucks.id"), nullable=True, index=True)
-    booking_time = Column(DateTime(timezone=True), nullable=False)
+    booking_time = Column(DateTime(timezone=True), nullable=False, index=True)
     expected_delivery_time = Column(DateTime(timezone=True))
     actual_delivery_time = Column(DateTime(timezone=True))
     state = Column(Enum(BookingState), default=BookingState.PENDING)
@@ -61,6 +69,9 @@ class Booking(Base):
 
 class BookingStatusHistory(Base):
     __tablename__ = "booking_status_history"
+    __table_args__ = (
+        Index("ix_booking_status_history_booking_updated", "booking_id", "updated_at"),
+    )
 
     id = Column(UUIDType(binary=False), primary_key=True, default=uuid.uuid4)
     booking_id = Column(UUIDType(binary=False), ForeignKey("bookings.id"), nullable=False, index=True)
@@ -68,4 +79,22 @@ class BookingStatusHistory(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now())
     notes = Column(Text)
 
-    booking = relationship("Booking", backref="status_history") 
\ No newline at end of file
+    booking = relationship("Booking", backref="status_history")
+
+
+class TripTrackSegment(Base):
+    """GPS trace of a booking's trip, one delta-encoded blob per TRACK_SEGMENT_SECONDS window.
+
+    ``data`` holds the points as zigzag varint deltas (see backend/utils/track_codec.py),
+    with times relative to ``segment_start``; the last point is kept in its own columns
+    so new points can be appended without decoding the blob.
+    """
+    __tablename__ = "trip_track_segments"
+
+    booking_id = Column(UUIDType(binary=False), ForeignKey("bookings.id"), primary_key=True)
+    segment_start = Column(DateTime, primary_key=True)
+    point_count = Column(Integer, nullable=False, default=0)
+    last_offset_ms = Column(Integer, nullable=False)
+    last_latitude_e6 = Column(Integer, nullable=False)
+    last_longitude_e6 = Column(Integer, nullable=False)
+    data = Column(LargeBinary().with_variant(mysql.MEDIUMBLOB(), "mysql"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, Text, Integer, DECIMAL, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Text, Integer, DECIMAL, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy_utils import UUIDType
@@ -20,6 +20,10 @@ class AvailabilityStatus(str, enum.Enum):
 
 class MaterialLocation(Base):
     __tablename__ = "material_locations"
+    __table_args__ = (
+        # Bounding-box prefilter of nearby searches: a latitude range, longitude checked in the index
+        Index("ix_material_locations_lat_lon", "latitude", "longitude"),
+    )
 
     id = Column(UUIDType(binary=False), primary_key=True, default=uuid.uuid4)
     truck_owner_id = Column(UUIDType(binary=False), ForeignKey("users.id"), nullable=False, index=True)
@@ -49,6 +53,10 @@ class MaterialLocation(Base):
 
 class LocationMaterial(Base):
     __tablename__ = "location_materials"
+    __table_args__ = (
+        # Materials of the locations found by a nearby search
+        Index("ix_location_materials_location_type", "location_id", "material_type", "availability_status"),
+    )
 
     id = Column(UUIDType(binary=False), primary_key=True, default=uuid.uuid4)
     location_id = Column(UUIDType(binary=False), ForeignKey("material_locations.id"), nullable=False, index=True)
@@ -35,6 +35,8 @@ class MaterialSource(Base):
     city = Column(String(100))
     state = Column(String(100))
     pincode = Column(String(10))
+    latitude = Column(DECIMAL(10, 8))
+    longitude = Column(DECIMAL(11, 8))
     contact_person = Column(String(100))
     contact_number = Column(String(20))
     price_per_unit = Column(DECIMAL(10, 2))
@@ -21,4 +21,27 @@ class Rating(Base):
     # Relationships
     booking = relationship("Booking", back_populates="ratings")
     reviewer = relationship("User", foreign_keys=[reviewer_id], back_populates="ratings_given")
-    reviewee = relationship("User", foreign_keys=[reviewee_id], back_populates="ratings_received") 
\ No newline at end of file
+    reviewee = relationship("User", foreign_keys=[reviewee_id], back_populates="ratings_received") 
+
+
+class UserRatingAggregate(Base):
+    """Running totals of the ratings each user has received, updated with every rating insert"""
+    __tablename__ = "user_rating_aggregates"
+
+    user_id = Column(UUIDType(binary=False), ForeignKey("users.id"), primary_key=True)
+    rating_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    star_1 = Column(Integer, nullable=False, default=0)
+    star_2 = Column(Integer, nullable=False, default=0)
+    star_3 = Column(Integer, nullable=False, default=0)
+    star_4 = Column(Integer, nullable=False, default=0)
+    star_5 = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def average(self):
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+
+    @property
+    def histogram(self):
+        return {star: getattr(self, f"star_{star}") for star in range(1, 6)}
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, Text, Integer, DECIMAL, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Text, Integer, DECIMAL, ForeignKey, Index
+from sqlalchemy.dialects import mysql
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy_utils import UUIDType
@@ -21,6 +22,10 @@ class PreloadedMaterialStatus(str, enum.Enum):
 
 class Truck(Base):
     __tablename__ = "trucks"
+    __table_args__ = (
+        # Available trucks of a vehicle type
+        Index("ix_trucks_type_status_available", "vehicle_type_id", "status", "is_available"),
+    )
 
     id = Column(UUIDType(binary=False), primary_key=True, default=uuid.uuid4)
     vehicle_number = Column(String(20), unique=True, nullable=False, index=True)
@@ -43,6 +48,43 @@ class Truck(Base):
     truck_owner = relationship("User", back_populates="trucks")
     preloaded_materials = relationship("PreloadedMaterial", back_populates="truck")
     bookings = relationship("Booking", back_populates="assigned_truck")
+    owner_rating = relationship(
+        "UserRatingAggregate",
+        primaryjoin="Truck.truck_owner_id == foreign(UserRatingAggregate.user_id)",
+        viewonly=True,
+        uselist=False,
+        lazy="joined"
+    )
+
+    @property
+    def owner_rating_average(self):
+        return self.owner_rating.average if self.owner_rating else None
+
+    @property
+    def owner_rating_count(self):
+        return self.owner_rating.rating_count if self.owner_rating else 0
+
+
+class TruckLocationPing(Base):
+    """Raw GPS track of a truck, one row per reported position.
+
+    Kept narrow for a high insert rate: the key clusters each truck's pings
+    in time order and coordinates are stored as integer microdegrees.
+    """
+    __tablename__ = "truck_location_pings"
+
+    truck_id = Column(UUIDType(binary=False), ForeignKey("trucks.id"), primary_key=True)
+    recorded_at = Column(DateTime().with_variant(mysql.DATETIME(fsp=3), "mysql"), primary_key=True)
+    latitude_e6 = Column(Integer, nullable=False)
+    longitude_e6 = Column(Integer, nullable=False)
+
+    @property
+    def latitude(self) -> float:
+        return self.latitude_e6 / 1e6
+
+    @property
+    def longitude(self) -> float:
+        return self.longitude_e6 / 1e6
 
 
 class PreloadedMaterial(Base):
@@ -47,3 +47,19 @@ class User(Base):
         "Notification",
         back_populates="user"
     )
+    # users.id holds dashed UUID strings while UUIDType columns hold bare hex
+    rating_aggregate = relationship(
+        "UserRatingAggregate",
+        primaryjoin="func.replace(User.id, '-', '') == foreign(UserRatingAggregate.user_id)",
+        viewonly=True,
+        uselist=False,
+        lazy="joined"
+    )
+
+    @property
+    def rating_average(self):
+        return self.rating_aggregate.average if self.rating_aggregate else None
+
+    @property
+    def rating_count(self):
+        return self.rating_aggregate.rating_count if self.rating_aggregate else 0
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer, DECIMAL
+from sqlalchemy import Column, String, DateTime, Integer, DECIMAL, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy_utils import UUIDType
@@ -17,4 +17,21 @@ class VehicleType(Base):
 
     # Relationships
     trucks = relationship("Truck", back_populates="vehicle_type")
-    bookings = relationship("Booking", back_populates="vehicle_type") 
\ No newline at end of file
+    bookings = relationship("Booking", back_populates="vehicle_type")
+    tariff = relationship("FreightTariff", back_populates="vehicle_type", uselist=False, cascade="all, delete-orphan")
+
+
+class FreightTariff(Base):
+    """Freight charged per trip of a vehicle type: base_fare + rate_per_km * distance, at least minimum_fare"""
+    __tablename__ = "freight_tariffs"
+
+    id = Column(UUIDType(binary=False), primary_key=True, default=uuid.uuid4)
+    vehicle_type_id = Column(UUIDType(binary=False), ForeignKey("vehicle_types.id"), nullable=False, unique=True)
+    base_fare = Column(DECIMAL(10, 2), nullable=False, default=0)
+    rate_per_km = Column(DECIMAL(10, 2), nullable=False)
+    minimum_fare = Column(DECIMAL(10, 2), nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    vehicle_type = relationship("VehicleType", back_populates="tariff")
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from backend.database import get_db
+from backend.schemas import PreloadedMaterialResponse, PreloadedOfferCreate, OfferSearchResult
+from backend.core.security import get_current_active_user
+from backend.models.user import User, UserRole
+from backend.services.offer_service import OfferService
+
+router = APIRouter(prefix="/api/v1/offers", tags=["Preloaded Offers"])
+
+
+# GET /offers/search - Search available preloaded loads
+@router.get("/search", response_model=List[OfferSearchResult])
+def search_offers(
+    material_type: Optional[str] = None,
+    destination: Optional[str] = Query(None, description="Part of the destination name"),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0),
+    limit: int = Query(50, ge=1)
+):
+    """Search available preloaded loads (Public); nearest truck first when latitude/longitude are given, else cheapest first"""
+    return OfferService.search_offers(
+        material_type, destination, min_price, max_price, latitude, longitude, radius_km, limit
+    )
+
+
+# POST /offers - Offer a truck's load (Truck Owner only)
+@router.post("/", response_model=PreloadedMaterialResponse, status_code=status.HTTP_201_CREATED)
+def create_offer(
+    offer_data: PreloadedOfferCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Offer the load of one of your trucks (Truck Owner only)"""
+    if current_user.role != UserRole.TRUCK_OWNER:
+        raise HTTPException(status_code=403, detail="Only truck owners can create offers")
+    return OfferService(db).create_offer(current_user, offer_data)
+
+
+# POST /offers/:id/book - Book an offer (Customer only)
+@router.post("/{offer_id}/book", response_model=PreloadedMaterialResponse)
+def book_offer(
+    offer_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Book an available preloaded load (Customer only)"""
+    if current_user.role != UserRole.CUSTOMER:
+        raise HTTPException(status_code=403, detail="Only customers can book offers")
+    return OfferService(db).book_offer(offer_id)
+
+
+# DELETE /offers/:id - Withdraw an offer
+@router.delete("/{offer_id}", status_code=status.HTTP_204_NO_CONTENT)
+def withdraw_offer(
+    offer_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Withdraw an offer (its truck's owner or an admin)"""
+    OfferService(db).withdraw_offer(offer_id, current_user)
+    return None
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List
+from backend.config import settings
+from backend.database import get_db
+from backend.core.exceptions import ValidationException
+from backend.schemas import QuoteBatchRequest, QuoteResponse
+from backend.services.quote_service import QuoteService
+
+router = APIRouter(prefix="/api/v1/quotes", tags=["Quotes"])
+
+
+# POST /quotes/batch - Price many source / destination / vehicle type / quantity combinations
+@router.post("/batch", response_model=List[QuoteResponse])
+def quote_batch(
+    batch: QuoteBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """Material plus freight cost of up to QUOTE_BATCH_MAX combinations (Public), in request order"""
+    if len(batch.quotes) > settings.QUOTE_BATCH_MAX:
+        raise ValidationException(f"At most {settings.QUOTE_BATCH_MAX} quotes can be requested at once")
+    return QuoteService(db).quote_batch(batch.quotes)
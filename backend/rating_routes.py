@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from backend.database import get_db
+from backend.core.read_replicas import get_read_db
+from backend.schemas.rating import RatingCreate, RatingResponse, UserRatingSummary
+from backend.core.security import get_current_active_user
+from backend.models.user import User
+from backend.services.rating_service import RatingService
+
+router = APIRouter(prefix="/api/v1/ratings", tags=["Ratings"])
+
+
+# POST /ratings - Rate the other party of a completed booking
+@router.post("/", response_model=RatingResponse, status_code=status.HTTP_201_CREATED)
+def create_rating(
+    rating_data: RatingCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Rate the truck owner (as the customer) or the customer (as the truck owner) of a completed booking"""
+    service = RatingService(db)
+    return service.create_rating(current_user.id, rating_data)
+
+
+# GET /ratings/users/:id - Rating summary of a user
+@router.get("/users/{user_id}", response_model=UserRatingSummary)
+def get_user_rating_summary(
+    user_id: str,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a user's rating count, average and per-star histogram"""
+    service = RatingService(db)
+    return service.get_user_summary(user_id)
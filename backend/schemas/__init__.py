@@ -1,10 +1,18 @@
 from .booking import (
     BookingCreate, BookingResponse, BookingUpdate, BookingStatusUpdate,
     BookingWithDetailsResponse, BookingStatusHistoryResponse, TruckAssignmentRequest,
-    NearbyTruckSearch
+    NearbyTruckSearch, DispatchRunResponse, DispatchQueueStatsResponse, BookingDetailsBatchRequest, TrackPointResponse, TripTrackResponse
+)
+from .truck import (
+    TruckCreate, TruckResponse, TruckUpdate, LocationPing, LocationBatch, LocationBatchResponse,
+    PreloadedMaterialResponse, PreloadedOfferCreate, OfferSearchResult
 )
-from .truck import TruckCreate, TruckResponse, TruckUpdate
 from .user import UserCreate, UserResponse, UserUpdate, UserLogin
 from .material import MaterialCreate, MaterialResponse, MaterialUpdate
-from .vehicle_type import VehicleTypeCreate, VehicleTypeResponse, VehicleTypeUpdate
-
+from .vehicle_type import (
+    VehicleTypeCreate, VehicleTypeResponse, VehicleTypeUpdate, FreightTariffUpdate, FreightTariffResponse
+)
+from .rating import RatingCreate, RatingResponse, UserRatingSummary
+from .location import NearbyMaterialLocationResponse
+from .quote import QuoteRequest, QuoteBatchRequest, QuoteResponse
+from .metrics import PoolMetricsResponse
@@ -1,5 +1,6 @@
+import uuid
 from pydantic import BaseModel, validator, field_serializer
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 from backend.models.booking import BookingStatus, BookingState
@@ -92,6 +93,18 @@ class BookingWithDetailsResponse(BookingResponse):
         from_attributes = True
 
 
+class BookingDetailsBatchRequest(BaseModel):
+    booking_ids: List[str]
+
+    @validator('booking_ids', each_item=True)
+    def validate_booking_id(cls, v):
+        try:
+            uuid.UUID(v)
+        except ValueError:
+            raise ValueError(f'Invalid booking id {v}')
+        return v
+
+
 class BookingStatusHistoryResponse(BaseModel):
     id: str
     booking_id: str
@@ -111,10 +124,42 @@ class BookingStatusHistoryResponse(BaseModel):
         from_attributes = True
 
 
+class TrackPointResponse(BaseModel):
+    recorded_at: datetime
+    latitude: float
+    longitude: float
+
+
+class TripTrackResponse(BaseModel):
+    booking_id: str
+    points: List[TrackPointResponse]
+    segments_read: int
+
+
 class TruckAssignmentRequest(BaseModel):
     truck_id: Optional[str] = None  # If not provided, auto-assign best truck
 
 
+class DispatchRunResponse(BaseModel):
+    started_at: datetime
+    bookings_considered: int
+    trucks_considered: int
+    assigned: int
+    unassigned: int
+    # Bookings left to admins by this run after DISPATCH_BATCH_MAX_MISSES unassigned runs
+    aged_out: int = 0
+    total_empty_km: float
+    mean_empty_km: float
+    solve_ms: float
+    duration_ms: float
+
+
+class DispatchQueueStatsResponse(BaseModel):
+    running: bool
+    queued: int
+    gave_up: int
+
+
 class NearbyTruckSearch(BaseModel):
     latitude: Decimal
     longitude: Decimal
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+from backend.models.location import AvailabilityStatus
+
+
+class NearbyMaterialLocationResponse(BaseModel):
+    location_id: str
+    location_name: str
+    city: str
+    pincode: str
+    latitude: float
+    longitude: float
+    contact_number: Optional[str] = None
+    material_id: str
+    material_type: str
+    price_per_unit: Optional[float] = None
+    unit: Optional[str] = None
+    availability_status: AvailabilityStatus
+    distance_km: float
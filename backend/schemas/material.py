@@ -44,6 +44,8 @@ class MaterialSourceBase(BaseModel):
     city: Optional[str] = None
     state: Optional[str] = None
     pincode: Optional[str] = None
+    latitude: Optional[Decimal] = None
+    longitude: Optional[Decimal] = None
     contact_person: Optional[str] = None
     contact_number: Optional[str] = None
     price_per_unit: Optional[Decimal] = None
@@ -62,6 +64,8 @@ class MaterialSourceUpdate(BaseModel):
     city: Optional[str] = None
     state: Optional[str] = None
     pincode: Optional[str] = None
+    latitude: Optional[Decimal] = None
+    longitude: Optional[Decimal] = None
     contact_person: Optional[str] = None
     contact_number: Optional[str] = None
     price_per_unit: Optional[Decimal] = None
@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class CheckoutWaitBucket(BaseModel):
+    le_ms: Optional[float] = None  # None for the unbounded last bucket
+    count: int  # Checkouts that waited at most le_ms (cumulative)
+
+
+class CheckoutWaitHistogram(BaseModel):
+    count: int
+    sum_ms: float
+    max_ms: float
+    buckets: List[CheckoutWaitBucket]
+
+
+class PoolMetricsResponse(BaseModel):
+    name: str
+    pool_class: str
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checked_out: int
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    checkouts: int
+    checkout_timeouts: int
+    connections_created: int
+    connections_recycled: int
+    connections_invalidated: int
+    connections_closed: int
+    checkout_wait: CheckoutWaitHistogram
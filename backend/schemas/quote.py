@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
+from decimal import Decimal
+
+
+class QuoteRequest(BaseModel):
+    material_source_id: str
+    destination_latitude: float
+    destination_longitude: float
+    vehicle_type_id: str
+    quantity: Decimal
+
+    @validator('destination_latitude')
+    def validate_latitude(cls, v):
+        if not -90 <= v <= 90:
+            raise ValueError('Latitude must be between -90 and 90')
+        return v
+
+    @validator('destination_longitude')
+    def validate_longitude(cls, v):
+        if not -180 <= v <= 180:
+            raise ValueError('Longitude must be between -180 and 180')
+        return v
+
+    @validator('quantity')
+    def validate_quantity(cls, v):
+        if v <= 0:
+            raise ValueError('Quantity must be greater than 0')
+        return v
+
+
+class QuoteBatchRequest(BaseModel):
+    quotes: List[QuoteRequest] = Field(..., min_length=1)
+
+
+class QuoteResponse(BaseModel):
+    material_source_id: str
+    vehicle_type_id: str
+    quantity: Decimal
+    distance_km: Optional[float] = None
+    trips: Optional[int] = None
+    material_cost: Optional[Decimal] = None
+    freight_cost: Optional[Decimal] = None
+    total_cost: Optional[Decimal] = None
+    # Why the combination could not be priced; the costs are then empty
+    error: Optional[str] = None
@@ -0,0 +1,43 @@
+from pydantic import BaseModel, validator, field_serializer
+from typing import Dict, Optional
+from datetime import datetime
+
+
+class RatingCreate(BaseModel):
+    booking_id: str
+    rating: int
+    review: Optional[str] = None
+
+    @validator('rating')
+    def validate_rating(cls, v):
+        if v < 1 or v > 5:
+            raise ValueError('Rating must be between 1 and 5')
+        return v
+
+
+class RatingResponse(BaseModel):
+    id: str
+    booking_id: str
+    reviewer_id: str
+    reviewee_id: str
+    rating: int
+    review: Optional[str]
+    created_at: Optional[datetime] = None
+
+    @field_serializer("id", "booking_id", "reviewer_id", "reviewee_id")
+    def serialize_ids(self, v):
+        return str(v)
+
+    class Config:
+        from_attributes = True
+
+
+class UserRatingSummary(BaseModel):
+    user_id: str
+    rating_count: int
+    rating_average: Optional[float]
+    histogram: Dict[int, int]
+
+    @field_serializer("user_id")
+    def serialize_user_id(self, v):
+        return str(v)
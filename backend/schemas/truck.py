@@ -1,3 +1,4 @@
+import uuid
 from pydantic import BaseModel, validator, field_serializer
 from typing import Optional, List
 from datetime import datetime
@@ -75,6 +76,8 @@ class TruckResponse(TruckBase):
     id: str
     truck_owner_id: str
     status: TruckStatus
+    owner_rating_average: Optional[float] = None
+    owner_rating_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -90,6 +93,41 @@ class TruckResponse(TruckBase):
         from_attributes = True
 
 
+class LocationPing(BaseModel):
+    truck_id: str
+    latitude: float
+    longitude: float
+    recorded_at: datetime
+
+    @validator('truck_id')
+    def validate_truck_id(cls, v):
+        try:
+            return str(uuid.UUID(v))
+        except ValueError:
+            raise ValueError(f'Invalid truck id: {v}')
+
+    @validator('latitude')
+    def validate_latitude(cls, v):
+        if v < -90 or v > 90:
+            raise ValueError('Latitude must be between -90 and 90')
+        return v
+
+    @validator('longitude')
+    def validate_longitude(cls, v):
+        if v < -180 or v > 180:
+            raise ValueError('Longitude must be between -180 and 180')
+        return v
+
+
+class LocationBatch(BaseModel):
+    pings: List[LocationPing]
+
+
+class LocationBatchResponse(BaseModel):
+    accepted: int
+    trucks_moved: int
+
+
 class PreloadedMaterialBase(BaseModel):
     material_type: str
     quantity: Decimal
@@ -115,6 +153,10 @@ class PreloadedMaterialCreate(PreloadedMaterialBase):
     pass
 
 
+class PreloadedOfferCreate(PreloadedMaterialCreate):
+    truck_id: str
+
+
 class PreloadedMaterialUpdate(BaseModel):
     material_type: Optional[str] = None
     quantity: Optional[Decimal] = None
@@ -155,6 +197,10 @@ class PreloadedMaterialResponse(PreloadedMaterialBase):
         from_attributes = True
 
 
+class OfferSearchResult(PreloadedMaterialResponse):
+    distance_km: Optional[float] = None
+
+
 class TruckWithMaterialsResponse(TruckResponse):
     preloaded_materials: List[PreloadedMaterialResponse] = []
 
@@ -70,6 +70,8 @@ class UserResponse(BaseModel):
     profile_image_url: Optional[str]
     is_verified: bool
     is_active: bool
+    rating_average: Optional[float] = None
+    rating_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -40,4 +40,31 @@ class VehicleTypeResponse(VehicleTypeBase):
         return str(v)
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class FreightTariffBase(BaseModel):
+    base_fare: Decimal = Decimal(0)
+    rate_per_km: Decimal
+    minimum_fare: Decimal = Decimal(0)
+
+    @validator('base_fare', 'rate_per_km', 'minimum_fare')
+    def validate_non_negative(cls, v):
+        if v < 0:
+            raise ValueError('Fares and rates cannot be negative')
+        return v
+
+
+class FreightTariffUpdate(FreightTariffBase):
+    pass
+
+
+class FreightTariffResponse(FreightTariffBase):
+    vehicle_type_id: str
+    updated_at: Optional[datetime] = None
+
+    @validator('vehicle_type_id', pre=True)
+    def convert_vehicle_type_id(cls, v):
+        return str(v)
+
+    class Config:
+        from_attributes = True
@@ -1,26 +1,27 @@
 from datetime import timedelta
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from backend.core.security import get_password_hash, authenticate_user, create_access_token
+from backend.core.security import get_password_hash_async, authenticate_user, create_access_token
 from backend.core.exceptions import UserNotFoundException, ValidationException
 from backend.models.user import User, UserRole
 from backend.models.profile import TruckOwnerProfile
 from backend.models.profile import CustomerProfile
-from backend.schemas.user import UserCreate, UserLogin, TokenResponse, TruckOwnerProfileCreate, CustomerProfileCreate
+from backend.schemas.user import UserCreate, UserLogin, UserUpdate, TokenResponse, TruckOwnerProfileCreate, CustomerProfileCreate
 from backend.config import settings
 
 
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def register_user(self, user_data: dict) -> User:
+    async def register_user(self, user_data: dict) -> User:
         # Check if user already exists
-        existing_user = self.db.query(User).filter(
+        existing_user = (await self.db.execute(select(User).where(
             (User.email == user_data.get('email')) | 
             (User.phone == user_data.get('phone'))
-        ).first()
+        ))).scalars().first()
         
         if existing_user:
             raise ValidationException("User with this email or phone already exists")
@@ -40,16 +41,16 @@ class AuthService:
             )
             
             self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
+            await self.db.commit()
+            await self.db.refresh(user)
             return user
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValidationException(f"User registration failed: {str(e)}")
 
-    def login_user(self, login_data: UserLogin) -> TokenResponse:
+    async def login_user(self, login_data: UserLogin) -> TokenResponse:
         """Authenticate and login user"""
-        user = authenticate_user(self.db, login_data.email, login_data.password)
+        user = await authenticate_user(self.db, login_data.email, login_data.password)
         
         if not user:
             raise ValidationException("Invalid email or password")
@@ -60,7 +61,7 @@ class AuthService:
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": str(user.id), "role": user.role.value},
+            data={"sub": str(user.id), "role": user.role.value, "active": user.is_active},
             expires_delta=access_token_expires
         )
 
@@ -72,21 +73,38 @@ class AuthService:
             role=user.role
         )
 
-    def create_truck_owner_profile(self, user_id: str, profile_data: TruckOwnerProfileCreate) -> TruckOwnerProfile:
-        """Create truck owner profile"""
-        user = self.db.query(User).filter(User.id == user_id).first()
+    async def get_user(self, user_id: str) -> User:
+        user = await self.db.get(User, str(user_id))
         if not user:
             raise UserNotFoundException(user_id)
+        return user
+
+    async def update_user(self, user_id: str, user_update: UserUpdate) -> User:
+        """Update a user's own profile fields"""
+        user = await self.get_user(user_id)
+        for field, value in user_update.dict(exclude_unset=True).items():
+            setattr(user, field, value)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def deactivate_user(self, user_id: str) -> User:
+        """Deactivate a user account; it is rejected by authentication from the next request"""
+        user = await self.get_user(user_id)
+        user.is_active = False
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def create_truck_owner_profile(self, user_id: str, profile_data: TruckOwnerProfileCreate) -> TruckOwnerProfile:
+        """Create truck owner profile"""
+        user = await self.get_user(user_id)
 
         if user.role != UserRole.TRUCK_OWNER:
             raise ValidationException("User is not a truck owner")
 
         # Check if profile already exists
-        existing_profile = self.db.query(TruckOwnerProfile).filter(
-            TruckOwnerProfile.user_id == user_id
-        ).first()
-        
-        if existing_profile:
+        if await self.get_truck_owner_profile(user_id):
             raise ValidationException("Truck owner profile already exists")
 
         profile = TruckOwnerProfile(
@@ -95,25 +113,24 @@ class AuthService:
         )
 
         self.db.add(profile)
-        self.db.commit()
-        self.db.refresh(profile)
+        await self.db.commit()
+        await self.db.refresh(profile)
         return profile
 
-    def create_customer_profile(self, user_id: str, profile_data: CustomerProfileCreate) -> CustomerProfile:
+    async def get_truck_owner_profile(self, user_id: str) -> Optional[TruckOwnerProfile]:
+        return (await self.db.execute(
+            select(TruckOwnerProfile).where(TruckOwnerProfile.user_id == str(user_id))
+        )).scalar_one_or_none()
+
+    async def create_customer_profile(self, user_id: str, profile_data: CustomerProfileCreate) -> CustomerProfile:
         """Create customer profile"""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise UserNotFoundException(user_id)
+        user = await self.get_user(user_id)
 
         if user.role != UserRole.CUSTOMER:
             raise ValidationException("User is not a customer")
 
         # Check if profile already exists
-        existing_profile = self.db.query(CustomerProfile).filter(
-            CustomerProfile.user_id == user_id
-        ).first()
-        
-        if existing_profile:
+        if await self.get_customer_profile(user_id):
             raise ValidationException("Customer profile already exists")
 
         profile = CustomerProfile(
@@ -122,32 +139,33 @@ class AuthService:
         )
 
         self.db.add(profile)
-        self.db.commit()
-        self.db.refresh(profile)
+        await self.db.commit()
+        await self.db.refresh(profile)
         return profile
 
-    def verify_user(self, user_id: str) -> User:
+    async def get_customer_profile(self, user_id: str) -> Optional[CustomerProfile]:
+        return (await self.db.execute(
+            select(CustomerProfile).where(CustomerProfile.user_id == str(user_id))
+        )).scalar_one_or_none()
+
+    async def verify_user(self, user_id: str) -> User:
         """Verify user account"""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise UserNotFoundException(user_id)
+        user = await self.get_user(user_id)
 
         user.is_verified = True
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
         return user
 
-    def change_password(self, user_id: str, current_password: str, new_password: str) -> bool:
+    async def change_password(self, user_id: str, current_password: str, new_password: str) -> bool:
         """Change user password"""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise UserNotFoundException(user_id)
+        user = await self.get_user(user_id)
 
         # Verify current password
-        if not authenticate_user(self.db, user.email, current_password):
+        if not await authenticate_user(self.db, user.email, current_password):
             raise ValidationException("Current password is incorrect")
 
         # Update password
-        user.password_hash = get_password_hash(new_password)
-        self.db.commit()
-        return True 
\ No newline at end of file
+        user.password_hash = await get_password_hash_async(new_password)
+        await self.db.commit()
+        return True
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional, Set
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from backend.config import settings
+
+# Session.info key holding the events of the session's current transaction
+_PENDING_KEY = "booking_events"
+
+
+def _audience_key(user_id) -> Optional[str]:
+    """Users are keyed by their dashed UUID, whatever form the id came in"""
+    if user_id is None:
+        return None
+    return str(user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id)))
+
+
+class BookingEvent:
+    """One booking status transition, addressed to the booking's customer and truck owner"""
+
+    __slots__ = ("booking_id", "customer_id", "truck_owner_id", "status", "notes", "occurred_at")
+
+    def __init__(self, booking_id, customer_id, truck_owner_id, status, notes: Optional[str] = None):
+        self.booking_id = str(booking_id)
+        self.customer_id = _audience_key(customer_id)
+        self.truck_owner_id = _audience_key(truck_owner_id)
+        self.status = status.value if hasattr(status, "value") else status
+        self.notes = notes
+        self.occurred_at = datetime.utcnow()
+
+    def to_sse(self) -> str:
+        data = json.dumps({
+            "booking_id": self.booking_id,
+            "status": self.status,
+            "notes": self.notes,
+            "occurred_at": self.occurred_at.isoformat()
+        })
+        return f"event: status\ndata: {data}\n\n"
+
+
+class Subscription:
+    """Bounded queue of events for one connected client.
+
+    A client that stops reading loses its oldest events rather than growing
+    the queue; it can catch up from the status history endpoint.
+    """
+
+    __slots__ = ("key", "booking_id", "queue", "dropped")
+
+    def __init__(self, key: Optional[str], booking_id: Optional[str]):
+        self.key = key
+        self.booking_id = booking_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.BOOKING_EVENTS_QUEUE_SIZE)
+        self.dropped = 0
+
+    def offer(self, booking_event: BookingEvent) -> None:
+        if self.booking_id is not None and booking_event.booking_id != self.booking_id:
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(booking_event)
+
+
+class BookingEventBroker:
+    """In-process pub/sub of booking status transitions.
+
+    Subscribers are plain asyncio queues on the event loop, so an idle
+    connection costs one small object and a suspended coroutine, not a
+    thread. ``publish`` is safe to call from request threads; services call
+    ``publish_after_commit`` so that only committed transitions are sent.
+    Events live only in this process: with several workers each one
+    delivers the transitions committed through it.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._by_user: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._everything: Set[Subscription] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def __len__(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._by_user.values()) + len(self._everything)
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+
+    def stop(self) -> None:
+        self._loop = None
+
+    def subscribe(self, user_id=None, booking_id: Optional[str] = None) -> Subscription:
+        """Events of one user's bookings (as customer or truck owner), or of all bookings when user_id is None"""
+        subscription = Subscription(_audience_key(user_id), str(booking_id) if booking_id else None)
+        if subscription.key is None:
+            self._everything.add(subscription)
+        else:
+            self._by_user[subscription.key].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription.key is None:
+            self._everything.discard(subscription)
+            return
+        subscriptions = self._by_user.get(subscription.key)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._by_user[subscription.key]
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[str]:
+        """Server-Sent Events for a subscription, with keep-alive comments while idle; unsubscribes when closed"""
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    booking_event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.BOOKING_EVENTS_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield booking_event.to_sse()
+        finally:
+            self.unsubscribe(subscription)
+
+    def publish(self, booking_event: BookingEvent) -> bool:
+        """Deliver an event to its subscribers; returns False when the broker is not running"""
+        loop = self._loop
+        if loop is None:
+            return False
+        loop.call_soon_threadsafe(self._deliver, booking_event)
+        return True
+
+    def publish_after_commit(self, db: Session, booking_event: BookingEvent) -> None:
+        """Publish the event once ``db`` commits; it is dropped if the transaction rolls back"""
+        if self.running:
+            db.info.setdefault(_PENDING_KEY, []).append(booking_event)
+
+    def _deliver(self, booking_event: BookingEvent) -> None:
+        recipients = {booking_event.customer_id, booking_event.truck_owner_id}
+        for key in recipients:
+            for subscription in self._by_user.get(key, ()):
+                subscription.offer(booking_event)
+        for subscription in self._everything:
+            subscription.offer(booking_event)
+
+    def _after_commit(self, session: Session) -> None:
+        for booking_event in session.info.pop(_PENDING_KEY, ()):
+            self.publish(booking_event)
+
+    def _after_transaction_end(self, session: Session, transaction) -> None:
+        if transaction.parent is None:
+            session.info.pop(_PENDING_KEY, None)
+
+
+booking_events = BookingEventBroker()
+
+event.listen(Session, "after_commit", booking_events._after_commit)
+event.listen(Session, "after_transaction_end", booking_events._after_transaction_end)
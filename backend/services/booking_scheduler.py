@@ -0,0 +1,103 @@
+import asyncio
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+import structlog
+from backend.config import settings
+
+logger = structlog.get_logger()
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Normalise aware datetimes to naive UTC so they compare with database values"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def dispatch_cutoff() -> datetime:
+    """Bookings whose booking_time is after this are held by the scheduler instead of dispatched"""
+    return datetime.utcnow() + timedelta(minutes=settings.BOOKING_SCHEDULE_LEAD_MINUTES)
+
+
+def is_future_booking(booking_time: datetime) -> bool:
+    return to_utc_naive(booking_time) > dispatch_cutoff()
+
+
+class BookingScheduler:
+    """Holds future-dated bookings and releases each one shortly before its booking_time.
+
+    A min-heap keyed on release time is drained by a single asyncio task that
+    sleeps until the earliest entry is due, so nothing polls the bookings
+    table. The heap is rebuilt at startup from pending bookings, which makes
+    the bookings table the durable copy. Cancelled or already assigned
+    bookings are not removed from the heap; the dispatch handler skips them.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, str]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._release: Optional[Callable[[str], None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    async def start(self, release: Callable[[str], None]) -> None:
+        """Start releasing due bookings to ``release(booking_id)``, called on the event loop"""
+        self._release = release
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def schedule(self, booking_id, booking_time: datetime) -> bool:
+        """Hold a booking until shortly before booking_time; safe to call from request threads"""
+        if not self.running:
+            return False
+        release_at = to_utc_naive(booking_time) - timedelta(minutes=settings.BOOKING_SCHEDULE_LEAD_MINUTES)
+        self._loop.call_soon_threadsafe(self._push, release_at, str(booking_id))
+        return True
+
+    def _push(self, release_at: datetime, booking_id: str) -> None:
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (release_at, booking_id))
+        # Only an entry that is now the earliest changes how long the runner should sleep
+        if earliest is None or release_at < earliest:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = datetime.utcnow()
+            while self._heap and self._heap[0][0] <= now:
+                _, booking_id = heapq.heappop(self._heap)
+                try:
+                    self._release(booking_id)
+                except Exception as e:
+                    logger.error(f"Failed to release scheduled booking {booking_id}: {e}")
+
+
+booking_scheduler = BookingScheduler()
@@ -1,8 +1,13 @@
-from typing import List, Optional
+import uuid
+from typing import List, Optional, Tuple, Union
 from datetime import datetime
 from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy import inspect as sql_inspect
 from sqlalchemy import and_, or_, func as sql_func
+from backend.config import settings
+from backend.database import unit_of_work
 from backend.core.exceptions import (
     BookingNotFoundException, TruckNotFoundException, TruckNotAvailableException,
     InsufficientCapacityException, BookingNotAllowedException, MaterialNotFoundException,
@@ -10,14 +15,33 @@ from backend.core.exceptions import (
 )
 from backend.models.booking import Booking, BookingStatus, BookingState, BookingStatusHistory
 from backend.models.truck import Truck, TruckStatus
-from backend.models.material import Material, MaterialType
+from backend.models.material import Material, MaterialType, MaterialSource, MaterialTypeModel
 from backend.models.vehicle_type import VehicleType
 from backend.models.user import User, UserRole
 from backend.schemas.booking import (
     BookingCreate, BookingResponse, BookingUpdate, BookingStatusUpdate,
     BookingWithDetailsResponse, BookingStatusHistoryResponse, TruckAssignmentRequest
 )
+from backend.services.booking_events import booking_events, BookingEvent
+from backend.services.booking_scheduler import booking_scheduler, is_future_booking
+from backend.services.dispatch_queue import dispatch_queue
+from backend.services.status_history_writer import status_history_writer
+from backend.services.truck_pool import truck_pool, TruckRecord
+from backend.services.truck_scoring import truck_scorer
 from backend.utils.distance_calculator import DistanceCalculator
+from backend.utils.pagination import PageParams, keyset_page
+from backend.utils.uuid_to_str import dashed_uuid
+
+# Columns read for booking detail responses
+_DETAIL_COLUMNS = (
+    Booking.id, Booking.user_id, Booking.material_source_id, Booking.destination, Booking.vehicle_type_id,
+    Booking.quantity, Booking.status, Booking.state, Booking.assigned_truck_id, Booking.booking_time,
+    Booking.expected_delivery_time, Booking.actual_delivery_time, Booking.created_at, Booking.updated_at,
+    User.first_name, User.last_name,
+    MaterialTypeModel.type.label("material_type"), MaterialSource.source_name,
+    VehicleType.name.label("vehicle_type_name"),
+    Truck.vehicle_number, Truck.driver_name, Truck.driver_contact
+)
 
 
 class BookingService:
@@ -26,112 +50,254 @@ class BookingService:
 
     def create_booking(self, user_id: str, booking_data: BookingCreate) -> Booking:
         """Create a new material booking with automatic truck assignment"""
-        # Validate material exists
-        material = self.db.query(Material).filter(Material.id == booking_data.material_id).first()
-        if not material:
-            raise MaterialNotFoundException(booking_data.material_id)
+        # Validate material source exists
+        material_source = self.db.query(MaterialSource).filter(MaterialSource.id == booking_data.material_source_id).first()
+        if not material_source:
+            raise MaterialNotFoundException(booking_data.material_source_id)
 
         # Validate vehicle type exists
         vehicle_type = self.db.query(VehicleType).filter(VehicleType.id == booking_data.vehicle_type_id).first()
         if not vehicle_type:
             raise VehicleTypeNotFoundException(booking_data.vehicle_type_id)
 
-        # Create booking
-        booking = Booking(
-            user_id=user_id,
-            material_id=booking_data.material_id,
-            source=booking_data.source,
-            destination=booking_data.destination,
-            vehicle_type_id=booking_data.vehicle_type_id,
-            quantity=booking_data.quantity,
-            status=BookingStatus.PENDING,
-            state=BookingState.PENDING,
-            booking_time=booking_data.booking_time
-        )
-
-        self.db.add(booking)
-        self.db.commit()
-        self.db.refresh(booking)
+        # Bookings far in the future get their truck shortly before booking_time, not now
+        scheduled = is_future_booking(booking_data.booking_time)
+
+        # Insert the booking, its history and the truck assignment in one transaction
+        booking_id = uuid.uuid4()
+        assigned_truck_id = None
+        with unit_of_work(self.db):
+            booking = Booking(
+                id=booking_id,
+                user_id=user_id,
+                material_source=material_source,
+                destination=booking_data.destination,
+                vehicle_type=vehicle_type,
+                quantity=booking_data.quantity,
+                status=BookingStatus.PENDING,
+                state=BookingState.PENDING,
+                booking_time=booking_data.booking_time
+            )
+            self.db.add(booking)
+            self._add_status_history(booking, BookingStatus.PENDING, "Booking created")
 
-        # Auto-assign truck
-        self._auto_assign_truck(booking)
+            # Auto-assign truck, unless pending bookings are left to the dispatch queue or batch dispatcher
+            if settings.DISPATCH_MODE == "immediate" and not scheduled:
+                self.db.flush()
+                truck = self._auto_assign_truck(booking)
+                if truck:
+                    assigned_truck_id = truck.id
 
-        # Add status history
-        self._add_status_history(booking.id, BookingStatus.PENDING, "Booking created")
+        if assigned_truck_id:
+            truck_pool.mark_assigned(assigned_truck_id)
+        elif scheduled:
+            # The batch dispatcher picks due bookings up by itself
+            if settings.DISPATCH_MODE != "batch":
+                booking_scheduler.schedule(booking_id, booking_data.booking_time)
+        elif settings.DISPATCH_MODE == "queue":
+            dispatch_queue.submit(booking_id)
 
         return booking
 
-    def _auto_assign_truck(self, booking: Booking) -> Optional[Truck]:
-        """Auto-assign the best available truck based on criteria"""
-        # Find available trucks matching criteria
-        available_trucks = self.db.query(Truck).filter(
-            and_(
-                Truck.is_available == True,
-                Truck.vehicle_type_id == booking.vehicle_type_id,
-                Truck.status == TruckStatus.AVAILABLE
+    def try_assign_pending(self, booking_id: str) -> bool:
+        """Assign a truck to a pending booking if one is free.
+
+        Returns True when the booking needs no more dispatch work (it was
+        assigned now, or is no longer pending) and False when no truck was
+        available and assignment should be retried later.
+        """
+        booking = self.db.query(Booking).filter(Booking.id == booking_id).first()
+        if not booking or booking.status != BookingStatus.PENDING or booking.assigned_truck_id:
+            return True
+
+        try:
+            with unit_of_work(self.db):
+                truck = self._auto_assign_truck(booking)
+                truck_id = truck.id if truck else None
+        except BookingNotAllowedException:
+            # Assigned concurrently by someone else
+            return True
+
+        if truck_id is None:
+            return False
+        truck_pool.mark_assigned(truck_id)
+        return True
+
+    def record_dispatch_abandoned(self, booking_id: str, attempts: int) -> bool:
+        """Note in a still-unassigned pending booking's history that automatic dispatch gave up on it.
+
+        The booking stays pending, so an admin can assign a truck by hand;
+        returns False when there was nothing to record.
+        """
+        booking = self.db.query(Booking).filter(Booking.id == booking_id).first()
+        if not booking or booking.status != BookingStatus.PENDING or booking.assigned_truck_id:
+            return False
+        with unit_of_work(self.db):
+            self._add_status_history(
+                booking, BookingStatus.PENDING,
+                f"Automatic dispatch stopped after {attempts} attempts without a free truck; assign one manually"
             )
-        ).all()
+        return True
+
+    def _find_candidate_trucks(
+        self, booking: Booking
+    ) -> Tuple[List[Union[TruckRecord, Truck]], Optional[List[float]]]:
+        """Find available trucks for a booking, nearest to the material source first.
+
+        When the truck pool is loaded this is a pure memory lookup returning
+        pool records; otherwise it falls back to reading the trucks table.
+        Distances to the source are returned when the geo lookup found them.
+        """
+        source = booking.material_source
+        if truck_pool.loaded:
+            if source is not None and source.latitude is not None and source.longitude is not None:
+                nearest = truck_pool.nearest(
+                    booking.vehicle_type_id,
+                    source.latitude,
+                    source.longitude,
+                    k=settings.TRUCK_MATCH_CANDIDATES,
+                    radius_km=settings.TRUCK_MATCH_RADIUS_KM
+                )
+                if nearest:
+                    return [record for record, _ in nearest], [distance for _, distance in nearest]
+            available_trucks = truck_pool.available(booking.vehicle_type_id)
+        else:
+            available_trucks = self.db.query(Truck).filter(
+                and_(
+                    Truck.is_available == True,
+                    Truck.vehicle_type_id == booking.vehicle_type_id,
+                    Truck.status == TruckStatus.AVAILABLE
+                )
+            ).all()
 
-        if not available_trucks:
-            return None
+        # Without coordinates (or nothing in range), match on the source location name
+        if not available_trucks or source is None:
+            return available_trucks, None
 
         # Filter by location proximity (source location)
+        source_location = source.location.lower()
         nearby_trucks = []
         for truck in available_trucks:
-            # Simple location matching - can be enhanced with actual distance calculation
-            if truck.current_location.lower() in booking.source.lower() or booking.source.lower() in truck.current_location.lower():
+            truck_location = truck.current_location.lower()
+            if truck_location in source_location or source_location in truck_location:
                 nearby_trucks.append(truck)
 
         # If no nearby trucks, use all available trucks
-        if not nearby_trucks:
-            nearby_trucks = available_trucks
-
-        # Select best truck (least used, same owner preference, etc.)
-        best_truck = self._select_best_truck(nearby_trucks)
+        return nearby_trucks or available_trucks, None
 
-        if best_truck:
-            # Assign truck to booking
-            booking.assigned_truck_id = best_truck.id
-            booking.status = BookingStatus.TRUCK_ASSIGNED
-            booking.state = BookingState.ASSIGNED
-
-            # Mark truck as unavailable
-            best_truck.is_available = False
-            best_truck.status = TruckStatus.BOOKED
+    def _auto_assign_truck(self, booking: Booking) -> Optional[Union[TruckRecord, Truck]]:
+        """Auto-assign the best available truck based on criteria; the caller commits"""
+        candidate_trucks, distances = self._find_candidate_trucks(booking)
+        if not candidate_trucks:
+            return None
 
-            self.db.commit()
-            self.db.refresh(booking)
+        # Take the best scoring truck, moving on to the next one whenever a
+        # concurrent booking claims it first
+        for best_truck in self._rank_trucks(booking, candidate_trucks, distances):
+            if self.reserve_truck(booking, best_truck):
+                break
+        else:
+            return None
 
-            # Add status history
-            self._add_status_history(booking.id, BookingStatus.TRUCK_ASSIGNED, f"Truck {best_truck.vehicle_number} assigned")
+        # Add status history
+        self._add_status_history(
+            booking, BookingStatus.TRUCK_ASSIGNED, f"Truck {best_truck.vehicle_number} assigned", truck=best_truck
+        )
 
         return best_truck
 
-    def _select_best_truck(self, trucks: List[Truck]) -> Optional[Truck]:
-        """Select the best truck from available options"""
-        if not trucks:
-            return None
+    def reserve_truck(self, booking: Booking, truck: Union[TruckRecord, Truck]) -> bool:
+        """Atomically claim an available truck and attach it to a still-unassigned booking.
 
-        # For now, select the first available truck
-        # This can be enhanced with more sophisticated selection logic:
-        # - Least used truck
-        # - Same owner preference
-        # - Driver rating
-        # - Truck condition
-        return trucks[0]
-
-    def _add_status_history(self, booking_id: str, status: str, notes: Optional[str] = None):
-        """Add entry to booking status history"""
-        history = BookingStatusHistory(
-            booking_id=booking_id,
-            status=status,
-            notes=notes
+        Both writes are conditional UPDATEs, so of two concurrent transactions
+        racing for the same truck (or booking) exactly one matches the row;
+        the other sees zero affected rows and can move on without waiting on
+        a lock held across a read. The caller commits.
+        """
+        claimed = self.db.query(Truck).filter(
+            and_(
+                Truck.id == truck.id,
+                Truck.is_available == True,
+                Truck.status == TruckStatus.AVAILABLE
+            )
+        ).update(
+            {Truck.is_available: False, Truck.status: TruckStatus.BOOKED},
+            synchronize_session=False
         )
-        self.db.add(history)
-        self.db.commit()
+        if claimed != 1:
+            return False
 
-    def get_bookings(self, user_id: Optional[str] = None, status: Optional[BookingStatus] = None) -> List[Booking]:
-        """Get all bookings with optional filtering"""
+        attached = self.db.query(Booking).filter(
+            and_(
+                Booking.id == booking.id,
+                Booking.assigned_truck_id.is_(None),
+                Booking.status == BookingStatus.PENDING
+            )
+        ).update(
+            {
+                Booking.assigned_truck_id: truck.id,
+                Booking.status: BookingStatus.TRUCK_ASSIGNED,
+                Booking.state: BookingState.ASSIGNED
+            },
+            synchronize_session=False
+        )
+        if attached != 1:
+            # Someone else assigned this booking; release the truck claim
+            self.db.query(Truck).filter(Truck.id == truck.id).update(
+                {Truck.is_available: True, Truck.status: TruckStatus.AVAILABLE},
+                synchronize_session=False
+            )
+            raise BookingNotAllowedException("Booking has already been assigned a truck")
+
+        if isinstance(truck, Truck):
+            self.db.expire(truck, ["is_available", "status"])
+        self.db.expire(booking, ["assigned_truck_id", "status", "state"])
+        return True
+
+    def _release_truck(self, booking: Booking) -> Optional[str]:
+        """Make the booking's assigned truck available again and return its id; the caller commits"""
+        if not booking.assigned_truck_id:
+            return None
+        released = self.db.query(Truck).filter(Truck.id == booking.assigned_truck_id).update(
+            {Truck.is_available: True, Truck.status: TruckStatus.AVAILABLE},
+            synchronize_session=False
+        )
+        return str(booking.assigned_truck_id) if released else None
+
+    def _rank_trucks(
+        self, booking: Booking, trucks: List[Union[TruckRecord, Truck]], distances: Optional[List[float]] = None
+    ) -> List[Union[TruckRecord, Truck]]:
+        """Order candidate trucks best first: distance, idle time, least used, owner rating and owner preference"""
+        source = booking.material_source
+        origin = (source.latitude, source.longitude) if source is not None else None
+        return truck_scorer.rank(trucks, origin=origin, customer_id=booking.user_id, distances=distances)
+
+    def _add_status_history(
+        self, booking: Booking, status: str, notes: Optional[str] = None,
+        truck: Optional[Union[TruckRecord, Truck]] = None
+    ):
+        """Add entry to booking status history and notify subscribers; both happen when the caller commits"""
+        status_history_writer.add(self.db, booking.id, status, notes)
+        if booking_events.running:
+            booking_events.publish_after_commit(self.db, BookingEvent(
+                booking.id, booking.user_id, self.get_truck_owner_id(booking, truck), status, notes
+            ))
+
+    def get_truck_owner_id(self, booking: Booking, truck: Optional[Union[TruckRecord, Truck]] = None):
+        """Owner of the truck being assigned, or else of the booking's assigned truck"""
+        if truck is not None:
+            return truck.owner_id if isinstance(truck, TruckRecord) else truck.truck_owner_id
+        if not booking.assigned_truck_id:
+            return None
+        record = truck_pool.get(booking.assigned_truck_id)
+        if record is not None:
+            return record.owner_id
+        return self.db.query(Truck.truck_owner_id).filter(Truck.id == booking.assigned_truck_id).scalar()
+
+    def get_bookings(
+        self, user_id: Optional[str] = None, status: Optional[BookingStatus] = None, page: Optional[PageParams] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        """Get one page of bookings, newest first, with optional filtering, and the cursor of the next page"""
         query = self.db.query(Booking)
         
         if user_id:
@@ -140,7 +306,7 @@ class BookingService:
         if status:
             query = query.filter(Booking.status == status)
         
-        return query.order_by(Booking.created_at.desc()).all()
+        return keyset_page(query, Booking, page or PageParams(cursor=None, limit=None))
 
     def get_booking_details(self, booking_id: str) -> Booking:
         """Get detailed booking information"""
@@ -149,48 +315,64 @@ class BookingService:
             raise BookingNotFoundException(booking_id)
         return booking
 
+    def _details_query(self):
+        """Bookings joined with everything the details response shows, projecting only those columns"""
+        return self.db.query(*_DETAIL_COLUMNS).select_from(Booking).outerjoin(
+            # users.id holds dashed UUID strings while UUIDType columns hold bare hex
+            User, User.id == dashed_uuid(Booking.user_id)
+        ).outerjoin(
+            MaterialSource, MaterialSource.id == Booking.material_source_id
+        ).outerjoin(
+            MaterialTypeModel, MaterialTypeModel.id == MaterialSource.material_type_id
+        ).outerjoin(
+            VehicleType, VehicleType.id == Booking.vehicle_type_id
+        ).outerjoin(
+            Truck, Truck.id == Booking.assigned_truck_id
+        )
+
+    @staticmethod
+    def _details_from_row(row) -> BookingWithDetailsResponse:
+        return BookingWithDetailsResponse(
+            id=str(row.id),
+            user_id=str(row.user_id),
+            user_name=f"{row.first_name} {row.last_name}" if row.first_name is not None else "Unknown",
+            material_source_id=str(row.material_source_id),
+            material_type=row.material_type.value if row.material_type is not None else "Unknown",
+            material_source=row.source_name if row.source_name is not None else "Unknown",
+            destination=row.destination,
+            vehicle_type_id=str(row.vehicle_type_id),
+            vehicle_type_name=row.vehicle_type_name if row.vehicle_type_name is not None else "Unknown",
+            quantity=row.quantity,
+            status=row.status,
+            state=row.state,
+            assigned_truck_id=str(row.assigned_truck_id) if row.assigned_truck_id else None,
+            assigned_truck_number=row.vehicle_number,
+            driver_name=row.driver_name,
+            driver_contact=row.driver_contact,
+            booking_time=row.booking_time,
+            expected_delivery_time=row.expected_delivery_time,
+            actual_delivery_time=row.actual_delivery_time,
+            created_at=row.created_at,
+            updated_at=row.updated_at
+        )
+
     def get_booking_with_details(self, booking_id: str) -> BookingWithDetailsResponse:
-        """Get booking with all related details"""
-        booking = self.db.query(Booking).filter(Booking.id == booking_id).first()
-        if not booking:
+        """Get booking with all related details in a single query"""
+        row = self._details_query().filter(Booking.id == booking_id).first()
+        if not row:
             raise BookingNotFoundException(booking_id)
-
-        # Get related data
-        user = self.db.query(User).filter(User.id == booking.user_id).first()
-        material = self.db.query(Material).filter(Material.id == booking.material_id).first()
-        vehicle_type = self.db.query(VehicleType).filter(VehicleType.id == booking.vehicle_type_id).first()
-        
-        truck = None
-        if booking.assigned_truck_id:
-            truck = self.db.query(Truck).filter(Truck.id == booking.assigned_truck_id).first()
-
-        # Create response with details
-        response_data = {
-            "id": booking.id,
-            "user_id": booking.user_id,
-            "user_name": f"{user.first_name} {user.last_name}" if user else "Unknown",
-            "material_id": booking.material_id,
-            "material_type": material.type.value if material else "Unknown",
-            "material_source": material.source if material else "Unknown",
-            "source": booking.source,
-            "destination": booking.destination,
-            "vehicle_type_id": booking.vehicle_type_id,
-            "vehicle_type_name": vehicle_type.name if vehicle_type else "Unknown",
-            "quantity": booking.quantity,
-            "status": booking.status,
-            "state": booking.state,
-            "assigned_truck_id": booking.assigned_truck_id,
-            "assigned_truck_number": truck.vehicle_number if truck else None,
-            "driver_name": truck.driver_name if truck else None,
-            "driver_contact": truck.driver_contact if truck else None,
-            "booking_time": booking.booking_time,
-            "expected_delivery_time": booking.expected_delivery_time,
-            "actual_delivery_time": booking.actual_delivery_time,
-            "created_at": booking.created_at,
-            "updated_at": booking.updated_at
-        }
-
-        return BookingWithDetailsResponse(**response_data)
+        return self._details_from_row(row)
+
+    def get_bookings_with_details(
+        self, booking_ids: List[str], user_id: Optional[str] = None
+    ) -> List[BookingWithDetailsResponse]:
+        """Get details of many bookings in a single query, in the order requested; unknown ids are skipped"""
+        requested = [str(uuid.UUID(str(booking_id))) for booking_id in booking_ids]
+        query = self._details_query().filter(Booking.id.in_(requested))
+        if user_id:
+            query = query.filter(Booking.user_id == user_id)
+        details = {str(row.id): self._details_from_row(row) for row in query}
+        return [details[booking_id] for booking_id in requested if booking_id in details]
 
     def assign_truck(self, booking_id: str, assignment_data: TruckAssignmentRequest) -> Booking:
         """Assign truck to booking (manual or auto-assign)"""
@@ -199,54 +381,62 @@ class BookingService:
         if booking.status != BookingStatus.PENDING:
             raise BookingNotAllowedException("Can only assign truck to pending bookings")
 
-        if assignment_data.truck_id:
-            # Manual assignment
-            truck = self.db.query(Truck).filter(
-                and_(
-                    Truck.id == assignment_data.truck_id,
-                    Truck.is_available == True,
-                    Truck.vehicle_type_id == booking.vehicle_type_id
+        with unit_of_work(self.db):
+            if assignment_data.truck_id:
+                # Manual assignment
+                truck = self.db.query(Truck).filter(
+                    and_(
+                        Truck.id == assignment_data.truck_id,
+                        Truck.is_available == True,
+                        Truck.vehicle_type_id == booking.vehicle_type_id
+                    )
+                ).first()
+
+                if not truck or not self.reserve_truck(booking, truck):
+                    raise TruckNotAvailableException(assignment_data.truck_id)
+
+                self._add_status_history(
+                    booking, BookingStatus.TRUCK_ASSIGNED, f"Truck {truck.vehicle_number} assigned", truck=truck
                 )
-            ).first()
-            
-            if not truck:
-                raise TruckNotAvailableException(assignment_data.truck_id)
-        else:
-            # Auto-assignment
-            truck = self._auto_assign_truck(booking)
-            if not truck:
-                raise BookingNotAllowedException("No suitable trucks available for assignment")
-
+            else:
+                # Auto-assignment
+                truck = self._auto_assign_truck(booking)
+                if not truck:
+                    raise BookingNotAllowedException("No suitable trucks available for assignment")
+            truck_id = truck.id
+
+        truck_pool.mark_assigned(truck_id)
         return booking
 
     def update_booking_status(self, booking_id: str, status_update: BookingStatusUpdate) -> Booking:
         """Update booking status and state"""
         booking = self.get_booking_details(booking_id)
-        
-        # Update status and state
-        booking.status = status_update.status
-        if status_update.state:
-            booking.state = status_update.state
-        
-        if status_update.expected_delivery_time:
-            booking.expected_delivery_time = status_update.expected_delivery_time
-        
-        if status_update.actual_delivery_time:
-            booking.actual_delivery_time = status_update.actual_delivery_time
 
-        # Handle truck availability based on status
-        if status_update.status in [BookingStatus.COMPLETED, BookingStatus.CANCELLED]:
-            if booking.assigned_truck_id:
-                truck = self.db.query(Truck).filter(Truck.id == booking.assigned_truck_id).first()
-                if truck:
-                    truck.is_available = True
-                    truck.status = TruckStatus.AVAILABLE
+        freed_truck_id = None
+        customer_id = str(booking.user_id)
+        with unit_of_work(self.db):
+            # Update status and state
+            booking.status = status_update.status
+            if status_update.state:
+                booking.state = status_update.state
 
-        self.db.commit()
-        self.db.refresh(booking)
+            if status_update.expected_delivery_time:
+                booking.expected_delivery_time = status_update.expected_delivery_time
 
-        # Add status history
-        self._add_status_history(booking_id, status_update.status.value, status_update.notes)
+            if status_update.actual_delivery_time:
+                booking.actual_delivery_time = status_update.actual_delivery_time
+
+            # Handle truck availability based on status
+            if status_update.status in [BookingStatus.COMPLETED, BookingStatus.CANCELLED]:
+                freed_truck_id = self._release_truck(booking)
+
+            # Add status history
+            self._add_status_history(booking, status_update.status, status_update.notes)
+
+        if freed_truck_id:
+            truck_pool.mark_available(freed_truck_id)
+            if status_update.status == BookingStatus.COMPLETED:
+                truck_pool.record_completed_trip(freed_truck_id, customer_id)
 
         return booking
 
@@ -272,27 +462,86 @@ class BookingService:
         """Cancel a booking"""
         booking = self.get_booking_details(booking_id)
         
-        if booking.user_id != user_id:
+        if str(booking.user_id) != str(user_id):
             raise BookingNotAllowedException("Only the booking owner can cancel the booking")
         
         if booking.status in [BookingStatus.COMPLETED, BookingStatus.CANCELLED]:
             raise BookingNotAllowedException("Cannot cancel completed or already cancelled booking")
 
-        # Update booking status
-        booking.status = BookingStatus.CANCELLED
-        booking.state = BookingState.PENDING
+        with unit_of_work(self.db):
+            # Update booking status
+            booking.status = BookingStatus.CANCELLED
+            booking.state = BookingState.PENDING
 
-        # Free up truck if assigned
-        if booking.assigned_truck_id:
-            truck = self.db.query(Truck).filter(Truck.id == booking.assigned_truck_id).first()
-            if truck:
-                truck.is_available = True
-                truck.status = TruckStatus.AVAILABLE
+            # Free up truck if assigned
+            freed_truck_id = self._release_truck(booking)
 
-        self.db.commit()
-        self.db.refresh(booking)
+            # Add status history
+            self._add_status_history(booking, BookingStatus.CANCELLED, "Booking cancelled by user")
 
-        # Add status history
-        self._add_status_history(booking_id, BookingStatus.CANCELLED, "Booking cancelled by user")
+        if freed_truck_id:
+            truck_pool.mark_available(freed_truck_id)
+
+        return booking
+
+
+def _load_columns(session: Session, result):
+    """Load the column attributes a commit left unloaded on returned rows, while IO is still allowed"""
+    rows = result[0] if isinstance(result, tuple) else result
+    for row in rows if isinstance(rows, list) else [rows]:
+        if isinstance(row, Booking):
+            state = sql_inspect(row)
+            unloaded = state.unloaded & set(state.mapper.column_attrs.keys())
+            if unloaded:
+                session.refresh(row, attribute_names=list(unloaded))
+    return result
+
+
+class AsyncBookingService:
+    """BookingService for async routes.
+
+    The booking rules stay in BookingService, which the dispatch workers also
+    run on sync sessions. Each call here runs them on the AsyncSession's
+    connection through run_sync, so their queries go through the async driver
+    and no thread is held while they wait on the database.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _run(self, method, *args):
+        return await self.db.run_sync(lambda session: _load_columns(session, method(BookingService(session), *args)))
+
+    async def create_booking(self, user_id: str, booking_data: BookingCreate) -> Booking:
+        return await self._run(BookingService.create_booking, user_id, booking_data)
+
+    async def get_bookings(
+        self, user_id: Optional[str] = None, status: Optional[BookingStatus] = None, page: Optional[PageParams] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        return await self._run(BookingService.get_bookings, user_id, status, page)
+
+    async def get_booking_details(self, booking_id: str) -> Booking:
+        return await self._run(BookingService.get_booking_details, booking_id)
+
+    async def get_booking_with_details(self, booking_id: str) -> BookingWithDetailsResponse:
+        return await self._run(BookingService.get_booking_with_details, booking_id)
+
+    async def get_bookings_with_details(
+        self, booking_ids: List[str], user_id: Optional[str] = None
+    ) -> List[BookingWithDetailsResponse]:
+        return await self._run(BookingService.get_bookings_with_details, booking_ids, user_id)
+
+    async def get_booking_status_history(self, booking_id: str) -> List[BookingStatusHistoryResponse]:
+        return await self._run(BookingService.get_booking_status_history, booking_id)
+
+    async def get_truck_owner_id(self, booking: Booking):
+        return await self._run(BookingService.get_truck_owner_id, booking)
+
+    async def assign_truck(self, booking_id: str, assignment_data: TruckAssignmentRequest) -> Booking:
+        return await self._run(BookingService.assign_truck, booking_id, assignment_data)
+
+    async def update_booking_status(self, booking_id: str, status_update: BookingStatusUpdate) -> Booking:
+        return await self._run(BookingService.update_booking_status, booking_id, status_update)
 
-        return booking 
\ No newline at end of file
+    async def cancel_booking(self, booking_id: str, user_id: str) -> Booking:
+        return await self._run(BookingService.cancel_booking, booking_id, user_id)
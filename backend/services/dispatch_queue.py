@@ -0,0 +1,102 @@
+import asyncio
+import random
+from typing import Callable, List, Optional, Set
+import structlog
+from backend.config import settings
+
+logger = structlog.get_logger()
+
+
+class DispatchQueue:
+    """Queue of booking ids waiting for truck assignment, drained by asyncio workers.
+
+    ``submit`` is safe to call from request threads. Each worker runs the
+    blocking ``handler(booking_id)`` in a thread; the handler returns True
+    when the booking needs no further work and False when it should be
+    retried later (e.g. no truck available yet). Retries back off
+    exponentially with jitter. After DISPATCH_MAX_ATTEMPTS the booking is
+    dropped from the queue, counted in ``gave_up``, and handed to the blocking
+    ``on_give_up(booking_id, attempts)`` so it can be recorded. The queue
+    itself is not durable: on startup the caller re-submits every booking
+    that is still pending in the database.
+    """
+
+    def __init__(self):
+        self.handler: Optional[Callable[[str], bool]] = None
+        self.on_give_up: Optional[Callable[[str, int], None]] = None
+        self.gave_up = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._queued: Set[str] = set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    async def start(
+        self, handler: Callable[[str], bool], workers: int, on_give_up: Optional[Callable[[str, int], None]] = None
+    ) -> None:
+        self.handler = handler
+        self.on_give_up = on_give_up
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(workers)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, booking_id, attempt: int = 0) -> bool:
+        """Queue a booking for assignment; returns False when the queue is not running"""
+        if not self.running:
+            return False
+        self._loop.call_soon_threadsafe(self._put, str(booking_id), attempt)
+        return True
+
+    def _put(self, booking_id: str, attempt: int) -> None:
+        if booking_id in self._queued:
+            return
+        self._queued.add(booking_id)
+        self._queue.put_nowait((booking_id, attempt))
+
+    def _retry_delay(self, attempt: int) -> float:
+        delay = min(settings.DISPATCH_RETRY_MAX_SECONDS, settings.DISPATCH_RETRY_BASE_SECONDS * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _worker(self) -> None:
+        while True:
+            booking_id, attempt = await self._queue.get()
+            self._queued.discard(booking_id)
+            try:
+                done = await asyncio.to_thread(self.handler, booking_id)
+            except Exception as e:
+                logger.error(f"Dispatch of booking {booking_id} failed: {e}")
+                done = False
+            finally:
+                self._queue.task_done()
+
+            if done:
+                continue
+            if attempt + 1 >= settings.DISPATCH_MAX_ATTEMPTS:
+                await self._give_up(booking_id, attempt + 1)
+                continue
+            self._loop.call_later(self._retry_delay(attempt), self._put, booking_id, attempt + 1)
+
+    async def _give_up(self, booking_id: str, attempts: int) -> None:
+        self.gave_up += 1
+        logger.warning("Giving up on booking dispatch", booking_id=booking_id, attempts=attempts, gave_up=self.gave_up)
+        if self.on_give_up is None:
+            return
+        try:
+            await asyncio.to_thread(self.on_give_up, booking_id, attempts)
+        except Exception as e:
+            logger.error(f"Recording the abandoned dispatch of booking {booking_id} failed: {e}")
+
+
+dispatch_queue = DispatchQueue()
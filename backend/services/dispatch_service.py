@@ -0,0 +1,287 @@
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple, Union
+import numpy as np
+import structlog
+from scipy.optimize import linear_sum_assignment
+from sqlalchemy.orm import Session, joinedload
+from backend.config import settings
+from backend.core.exceptions import BookingNotAllowedException
+from backend.database import SessionLocal
+from backend.models.booking import Booking, BookingStatus
+from backend.models.material import MaterialSource
+from backend.models.truck import Truck, TruckStatus
+from backend.models.vehicle_type import VehicleType
+from backend.schemas.booking import DispatchRunResponse
+from backend.services.booking_scheduler import dispatch_cutoff, to_utc_naive
+from backend.services.booking_service import BookingService
+from backend.services.truck_pool import truck_pool, TruckRecord
+from backend.utils.distance_calculator import DistanceCalculator
+
+logger = structlog.get_logger()
+
+# Cost given to booking/truck pairs that must never be matched
+INFEASIBLE_COST = 1e9
+
+_solver_pool: Optional[ProcessPoolExecutor] = None
+last_run: Optional[DispatchRunResponse] = None
+
+# Consecutive batch runs each considered booking went unassigned, and the bookings
+# that reached DISPATCH_BATCH_MAX_MISSES and are no longer considered. Like the
+# dispatch queue, this is not durable: a restart gives every booking a fresh start.
+_missed_runs: Dict[str, int] = {}
+_aged_out: Set[str] = set()
+_misses_lock = threading.Lock()
+
+
+def solve_assignment(cost: np.ndarray) -> Tuple[List[int], List[int]]:
+    """Min-cost assignment of rows (bookings) to columns (trucks), skipping infeasible pairs"""
+    rows, cols = linear_sum_assignment(cost)
+    feasible = cost[rows, cols] < INFEASIBLE_COST
+    return rows[feasible].tolist(), cols[feasible].tolist()
+
+
+def _get_solver_pool() -> ProcessPoolExecutor:
+    global _solver_pool
+    if _solver_pool is None:
+        _solver_pool = ProcessPoolExecutor(max_workers=settings.DISPATCH_SOLVER_WORKERS)
+    return _solver_pool
+
+
+def shutdown_solver_pool() -> None:
+    global _solver_pool
+    if _solver_pool is not None:
+        _solver_pool.shutdown(wait=False, cancel_futures=True)
+        _solver_pool = None
+
+
+class DispatchService:
+    """Assigns many pending bookings at once by solving a min-cost assignment problem"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _pending_bookings(self, vehicle_type_ids: Set[uuid.UUID], aged_out: Set[str]) -> List[Booking]:
+        """The oldest pending bookings some available truck could serve.
+
+        Bookings without source coordinates, too large for their vehicle type,
+        of a type with no available truck, or aged out are filtered here rather
+        than after the limit, so they never take the place of feasible ones.
+        """
+        query = self.db.query(Booking).join(
+            MaterialSource, Booking.material_source_id == MaterialSource.id
+        ).join(
+            VehicleType, Booking.vehicle_type_id == VehicleType.id
+        ).options(
+            joinedload(Booking.material_source)
+        ).filter(
+            Booking.status == BookingStatus.PENDING,
+            Booking.assigned_truck_id.is_(None),
+            Booking.booking_time <= dispatch_cutoff(),
+            Booking.vehicle_type_id.in_(vehicle_type_ids),
+            Booking.quantity <= VehicleType.capacity_ton,
+            MaterialSource.latitude.isnot(None),
+            MaterialSource.longitude.isnot(None)
+        )
+        if aged_out:
+            query = query.filter(Booking.id.notin_([uuid.UUID(booking_id) for booking_id in aged_out]))
+        return query.order_by(Booking.created_at).limit(settings.DISPATCH_BATCH_MAX_BOOKINGS).all()
+
+    def _still_pending(self, booking_ids: Set[str]) -> Set[str]:
+        """The given bookings that are still pending without a truck"""
+        if not booking_ids:
+            return set()
+        return {
+            str(booking_id) for (booking_id,) in self.db.query(Booking.id).filter(
+                Booking.id.in_([uuid.UUID(booking_id) for booking_id in booking_ids]),
+                Booking.status == BookingStatus.PENDING,
+                Booking.assigned_truck_id.is_(None)
+            )
+        }
+
+    def _available_trucks(self) -> List[Union[TruckRecord, Truck]]:
+        """Available trucks with coordinates, from the truck pool when it is loaded"""
+        if truck_pool.loaded:
+            return [
+                record for record in truck_pool.available()
+                if record.latitude is not None and record.longitude is not None
+            ]
+        return self.db.query(Truck).filter(
+            Truck.is_available == True,
+            Truck.status == TruckStatus.AVAILABLE,
+            Truck.latitude.isnot(None),
+            Truck.longitude.isnot(None)
+        ).all()
+
+    def build_cost_matrix(
+        self, bookings: List[Booking], trucks: List[Union[TruckRecord, Truck]], capacities: Dict[str, float]
+    ) -> np.ndarray:
+        """Bookings x trucks cost in empty kilometres, INFEASIBLE_COST where a truck cannot serve a booking"""
+        cost = DistanceCalculator.distance_matrix(
+            [b.material_source.latitude for b in bookings],
+            [b.material_source.longitude for b in bookings],
+            [t.latitude for t in trucks],
+            [t.longitude for t in trucks]
+        )
+
+        booking_types = np.array([str(b.vehicle_type_id) for b in bookings])
+        truck_types = np.array([str(t.vehicle_type_id) for t in trucks])
+        quantities = np.array([float(b.quantity) for b in bookings])
+        truck_capacities = np.array([capacities.get(str(t.vehicle_type_id), 0.0) for t in trucks])
+
+        infeasible = booking_types[:, np.newaxis] != truck_types[np.newaxis, :]
+        infeasible |= quantities[:, np.newaxis] > truck_capacities[np.newaxis, :]
+        infeasible |= cost > settings.DISPATCH_MAX_DISTANCE_KM
+        cost[infeasible] = INFEASIBLE_COST
+        return cost
+
+    def run_batch(self) -> DispatchRunResponse:
+        """Assign all pending bookings in one pass and commit the result in a single transaction.
+
+        Bookings that go unassigned for DISPATCH_BATCH_MAX_MISSES consecutive
+        runs (e.g. no truck within DISPATCH_MAX_DISTANCE_KM) stop being
+        considered; they stay pending with a status history note for admins.
+        """
+        global _aged_out
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+
+        with _misses_lock:
+            aged_out = self._still_pending(_aged_out)
+            _aged_out = aged_out
+        trucks = self._available_trucks()
+        vehicle_type_ids = {uuid.UUID(str(t.vehicle_type_id)) for t in trucks}
+        bookings = self._pending_bookings(vehicle_type_ids, aged_out) if trucks else []
+        booking_types = {str(b.vehicle_type_id) for b in bookings}
+        trucks = [t for t in trucks if str(t.vehicle_type_id) in booking_types]
+
+        assigned: List[Tuple[str, str, float]] = []
+        solve_ms = 0.0
+        if bookings and trucks:
+            capacities = {
+                str(vt_id): float(capacity)
+                for vt_id, capacity in self.db.query(VehicleType.id, VehicleType.capacity_ton).filter(
+                    VehicleType.id.in_({b.vehicle_type_id for b in bookings})
+                )
+            }
+            cost = self.build_cost_matrix(bookings, trucks, capacities)
+
+            solve_start = time.perf_counter()
+            rows, cols = _get_solver_pool().submit(solve_assignment, cost).result()
+            solve_ms = (time.perf_counter() - solve_start) * 1000
+
+            booking_service = BookingService(self.db)
+            for row, col in zip(rows, cols):
+                booking, truck = bookings[row], trucks[col]
+                try:
+                    if not booking_service.reserve_truck(booking, truck):
+                        continue
+                except BookingNotAllowedException:
+                    continue
+                booking_service._add_status_history(
+                    booking, BookingStatus.TRUCK_ASSIGNED,
+                    f"Truck {truck.vehicle_number} assigned by batch dispatch", truck=truck
+                )
+                assigned.append((str(booking.id), str(truck.id), float(cost[row, col])))
+
+            try:
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+
+            for _, truck_id, _ in assigned:
+                truck_pool.mark_assigned(truck_id)
+
+        aged = self._count_misses(bookings, {booking_id for booking_id, _, _ in assigned})
+        total_distance = sum(distance for _, _, distance in assigned)
+        return DispatchRunResponse(
+            started_at=started_at,
+            bookings_considered=len(bookings),
+            trucks_considered=len(trucks),
+            assigned=len(assigned),
+            unassigned=len(bookings) - len(assigned),
+            aged_out=len(aged),
+            total_empty_km=round(total_distance, 3),
+            mean_empty_km=round(total_distance / len(assigned), 3) if assigned else 0.0,
+            solve_ms=round(solve_ms, 3),
+            duration_ms=round((time.perf_counter() - start) * 1000, 3)
+        )
+
+    def _count_misses(self, bookings: List[Booking], assigned_ids: Set[str]) -> List[str]:
+        """Count another miss for every unassigned booking; returns the ones that just aged out"""
+        global _missed_runs
+        missed = {}
+        aged = []
+        with _misses_lock:
+            for booking in bookings:
+                booking_id = str(booking.id)
+                if booking_id in assigned_ids:
+                    continue
+                misses = _missed_runs.get(booking_id, 0) + 1
+                if misses >= settings.DISPATCH_BATCH_MAX_MISSES:
+                    _aged_out.add(booking_id)
+                    aged.append(booking_id)
+                else:
+                    missed[booking_id] = misses
+            # Bookings not considered this run start counting again when they are
+            _missed_runs = missed
+
+        booking_service = BookingService(self.db)
+        for booking_id in aged:
+            logger.warning("Batch dispatch gave up on booking", booking_id=booking_id)
+            booking_service.record_dispatch_abandoned(booking_id, settings.DISPATCH_BATCH_MAX_MISSES)
+        return aged
+
+
+def assign_pending_booking(booking_id: str) -> bool:
+    """Dispatch queue handler: try to assign one pending booking with its own session"""
+    with SessionLocal() as db:
+        return BookingService(db).try_assign_pending(booking_id)
+
+
+def abandon_pending_booking(booking_id: str, attempts: int) -> None:
+    """Dispatch queue give-up hook: record the abandoned dispatch with its own session"""
+    with SessionLocal() as db:
+        BookingService(db).record_dispatch_abandoned(booking_id, attempts)
+
+
+def pending_booking_ids() -> Tuple[List[str], List[Tuple[str, datetime]]]:
+    """Bookings still waiting for a truck: ids due for dispatch (oldest first) and future-dated (id, booking_time) pairs"""
+    cutoff = dispatch_cutoff()
+    due, scheduled = [], []
+    with SessionLocal() as db:
+        rows = db.query(Booking.id, Booking.booking_time).filter(
+            Booking.status == BookingStatus.PENDING,
+            Booking.assigned_truck_id.is_(None)
+        ).order_by(Booking.created_at).all()
+    for booking_id, booking_time in rows:
+        if to_utc_naive(booking_time) > cutoff:
+            scheduled.append((str(booking_id), booking_time))
+        else:
+            due.append(str(booking_id))
+    return due, scheduled
+
+
+def run_dispatch_once() -> DispatchRunResponse:
+    """Run one batch dispatch with its own session and record its statistics"""
+    global last_run
+    with SessionLocal() as db:
+        last_run = DispatchService(db).run_batch()
+    return last_run
+
+
+async def batch_dispatch_loop() -> None:
+    """Collect pending bookings for one window at a time and dispatch them together"""
+    while True:
+        await asyncio.sleep(settings.DISPATCH_BATCH_WINDOW_SECONDS)
+        try:
+            stats = await asyncio.to_thread(run_dispatch_once)
+            if stats.bookings_considered:
+                logger.info("Batch dispatch completed", **stats.model_dump(mode="json"))
+        except Exception as e:
+            logger.error(f"Batch dispatch failed: {e}")
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import structlog
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.models.truck import Truck, TruckLocationPing
+from backend.services.booking_scheduler import to_utc_naive
+from backend.services.track_store import track_store
+from backend.services.truck_pool import truck_pool
+
+logger = structlog.get_logger()
+
+_trucks = Truck.__table__
+_pings = TruckLocationPing.__table__
+
+# Coalesced position write: one executemany UPDATE for every truck that moved
+_UPDATE_POSITION = update(_trucks).where(_trucks.c.id == bindparam("truck_id")).values(
+    latitude=bindparam("latitude"), longitude=bindparam("longitude")
+)
+
+# Re-sent pings (client retries) hit the primary key and are skipped
+_INSERT_PINGS = insert(_pings).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+
+
+class LocationIngestor:
+    """Accepts GPS pings in batches and writes them behind, in bulk.
+
+    The newest position of each truck is applied to the truck pool right
+    away, so matching sees it immediately. Database writes are deferred to a
+    background task that runs every TRUCK_LOCATION_FLUSH_SECONDS: each truck
+    row is updated once with its latest position however many pings arrived,
+    and the raw pings are appended to truck_location_pings with multi-row
+    inserts and to the trip tracks of the bookings their trucks are on.
+    Pings still buffered when the process dies are lost; stop() writes them
+    out on a clean shutdown.
+
+    When a flush fails, each truck is written on its own and the rows of
+    trucks that still fail are dropped. Only when no truck can be written
+    does the batch go back into the buffer, which keeps at most
+    TRUCK_LOCATION_BUFFER_MAX pings by dropping the oldest. Dropped pings
+    are counted in ``dropped``.
+    """
+
+    def __init__(self):
+        # truck id -> (recorded_at, latitude, longitude) of the newest ping seen
+        self._latest: Dict[str, Tuple[datetime, float, float]] = {}
+        # Trucks whose latest position has not been written to their row yet
+        self._dirty: Dict[str, Tuple[float, float]] = {}
+        self._pings: List[dict] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._session_factory: Optional[Callable[[], Session]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def __len__(self) -> int:
+        return len(self._pings)
+
+    def latest(self, truck_id) -> Optional[Tuple[datetime, float, float]]:
+        return self._latest.get(str(truck_id))
+
+    def ingest(self, pings) -> int:
+        """Buffer pings (objects with truck_id, latitude, longitude, recorded_at); returns how many moved a truck.
+
+        Pings may arrive out of order; an older ping than the truck's newest
+        known one is kept in the track but does not move the truck.
+        """
+        rows = []
+        newest: Dict[str, Tuple[datetime, float, float]] = {}
+        for ping in pings:
+            truck_id = str(ping.truck_id)
+            recorded_at = to_utc_naive(ping.recorded_at)
+            latitude, longitude = float(ping.latitude), float(ping.longitude)
+            rows.append({
+                "truck_id": truck_id,
+                "recorded_at": recorded_at,
+                "latitude_e6": round(latitude * 1e6),
+                "longitude_e6": round(longitude * 1e6)
+            })
+            current = newest.get(truck_id)
+            if current is None or recorded_at > current[0]:
+                newest[truck_id] = (recorded_at, latitude, longitude)
+
+        moved = []
+        with self._lock:
+            self._pings.extend(rows)
+            self._trim_locked()
+            for truck_id, position in newest.items():
+                current = self._latest.get(truck_id)
+                if current is not None and current[0] >= position[0]:
+                    continue
+                self._latest[truck_id] = position
+                self._dirty[truck_id] = (position[1], position[2])
+                moved.append((truck_id, position[1], position[2]))
+
+        for truck_id, latitude, longitude in moved:
+            truck_pool.move(truck_id, latitude, longitude)
+        return len(moved)
+
+    def _trim_locked(self) -> None:
+        overflow = len(self._pings) - settings.TRUCK_LOCATION_BUFFER_MAX
+        if overflow > 0:
+            del self._pings[:overflow]
+            self.dropped += overflow
+
+    def flush(self, db: Optional[Session] = None) -> Tuple[int, int]:
+        """Write buffered positions and pings; returns (trucks updated, pings written)"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            pings, self._pings = self._pings, []
+        if not dirty and not pings:
+            return 0, 0
+
+        session = db if db is not None else self._session_factory()
+        try:
+            try:
+                self._write(session, dirty, pings)
+            except Exception as e:
+                session.rollback()
+                return self._write_per_truck(session, dirty, pings, e)
+        finally:
+            if db is None:
+                session.close()
+        return len(dirty), len(pings)
+
+    @staticmethod
+    def _write(session: Session, dirty: Dict[str, Tuple[float, float]], pings: List[dict]) -> None:
+        if dirty:
+            session.execute(_UPDATE_POSITION, [
+                {"truck_id": truck_id, "latitude": latitude, "longitude": longitude}
+                for truck_id, (latitude, longitude) in dirty.items()
+            ])
+        chunk = settings.TRUCK_LOCATION_INSERT_CHUNK
+        for start in range(0, len(pings), chunk):
+            session.execute(_INSERT_PINGS, pings[start:start + chunk])
+        track_store.record_pings(session, pings)
+        session.commit()
+
+    def _write_per_truck(
+        self, session: Session, dirty: Dict[str, Tuple[float, float]], pings: List[dict], error: Exception
+    ) -> Tuple[int, int]:
+        """Retry a failed batch one truck at a time, dropping the rows of trucks that fail again"""
+        by_truck: Dict[str, List[dict]] = defaultdict(list)
+        for ping in pings:
+            by_truck[ping["truck_id"]].append(ping)
+        trucks_written, pings_written, failed = 0, 0, []
+        for truck_id in dirty.keys() | by_truck.keys():
+            position = dirty.get(truck_id)
+            truck_pings = by_truck.get(truck_id, [])
+            try:
+                self._write(session, {truck_id: position} if position else {}, truck_pings)
+            except Exception:
+                session.rollback()
+                failed.append(truck_id)
+                continue
+            trucks_written += position is not None
+            pings_written += len(truck_pings)
+
+        if failed and not trucks_written and not pings_written:
+            # Nothing could be written, so the database rather than the rows is at fault:
+            # put the batch back for the next flush; newer positions reported meanwhile win
+            with self._lock:
+                for truck_id, position in dirty.items():
+                    self._dirty.setdefault(truck_id, position)
+                self._pings[:0] = pings
+                self._trim_locked()
+            raise error
+        if failed:
+            dropped = sum(len(by_truck.get(truck_id, [])) for truck_id in failed)
+            with self._lock:
+                self.dropped += dropped
+            logger.warning(
+                "Dropped truck locations that could not be written",
+                trucks=len(failed), pings=dropped, total_dropped=self.dropped, error=str(error)
+            )
+        return trucks_written, pings_written
+
+    async def start(self, session_factory: Callable[[], Session]) -> None:
+        self._session_factory = session_factory
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await asyncio.to_thread(self.flush)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.TRUCK_LOCATION_FLUSH_SECONDS)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Failed to write truck locations: {e}", buffered=len(self), total_dropped=self.dropped)
+
+
+location_ingestor = LocationIngestor()
@@ -0,0 +1,83 @@
+from typing import List
+import numpy as np
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+from backend.models.location import AvailabilityStatus, LocationMaterial, LocationStatus, MaterialLocation
+from backend.schemas.location import NearbyMaterialLocationResponse
+from backend.utils.distance_calculator import DistanceCalculator
+from backend.utils.geo_index import bounding_box
+
+# Availability statuses a nearby search returns unless out-of-stock offers are asked for
+IN_STOCK = (AvailabilityStatus.AVAILABLE, AvailabilityStatus.LIMITED)
+
+
+class MaterialLocationService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search_nearby(
+        self, latitude: float, longitude: float, material_type: str, radius_km: float,
+        sort_by: str = "price", limit: int = 20, include_out_of_stock: bool = False
+    ) -> List[NearbyMaterialLocationResponse]:
+        """Active locations within radius_km selling a material, cheapest or nearest first.
+
+        The database only returns rows inside the radius' bounding box (served
+        by the latitude/longitude index); exact distances and the top-k
+        ranking are computed on that candidate set with numpy.
+        """
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        statuses = list(AvailabilityStatus) if include_out_of_stock else list(IN_STOCK)
+        rows = self.db.query(
+            MaterialLocation.id, MaterialLocation.location_name, MaterialLocation.city, MaterialLocation.pincode,
+            MaterialLocation.latitude, MaterialLocation.longitude, MaterialLocation.contact_number,
+            LocationMaterial.id, LocationMaterial.material_type, LocationMaterial.price_per_unit,
+            LocationMaterial.unit, LocationMaterial.availability_status
+        ).join(
+            LocationMaterial, LocationMaterial.location_id == MaterialLocation.id
+        ).filter(
+            and_(
+                MaterialLocation.latitude.between(min_lat, max_lat),
+                MaterialLocation.longitude.between(min_lon, max_lon),
+                MaterialLocation.status == LocationStatus.ACTIVE,
+                LocationMaterial.material_type == material_type,
+                LocationMaterial.availability_status.in_(statuses)
+            )
+        ).all()
+        if not rows:
+            return []
+
+        distances = DistanceCalculator.distances_from(
+            latitude, longitude,
+            np.array([row[4] for row in rows], dtype=np.float64),
+            np.array([row[5] for row in rows], dtype=np.float64)
+        )
+        inside = np.flatnonzero(distances <= radius_km)
+        if not len(inside):
+            return []
+
+        # Unpriced offers rank last when sorting by price
+        prices = np.array([row[9] if row[9] is not None else np.inf for row in rows], dtype=np.float64)[inside]
+        if sort_by == "distance":
+            order = np.lexsort((prices, distances[inside]))
+        else:
+            order = np.lexsort((distances[inside], prices))
+        top = inside[order[:limit]]
+
+        return [
+            NearbyMaterialLocationResponse(
+                location_id=str(rows[i][0]),
+                location_name=rows[i][1],
+                city=rows[i][2],
+                pincode=rows[i][3],
+                latitude=float(rows[i][4]),
+                longitude=float(rows[i][5]),
+                contact_number=rows[i][6],
+                material_id=str(rows[i][7]),
+                material_type=rows[i][8],
+                price_per_unit=float(rows[i][9]) if rows[i][9] is not None else None,
+                unit=rows[i][10],
+                availability_status=rows[i][11],
+                distance_km=round(float(distances[i]), 3)
+            )
+            for i in top.tolist()
+        ]
@@ -0,0 +1,143 @@
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from backend.models.truck import PreloadedMaterial, PreloadedMaterialStatus, Truck
+from backend.services.truck_pool import truck_pool
+from backend.utils.distance_calculator import DistanceCalculator
+
+
+class OfferRecord:
+    """In-memory copy of an available preloaded-material offer, as much as search results need"""
+
+    __slots__ = (
+        "id", "truck_id", "material_type", "quantity", "unit", "destination", "destination_key",
+        "price", "description", "created_at", "latitude", "longitude"
+    )
+
+    def __init__(self, offer: PreloadedMaterial, latitude=None, longitude=None):
+        self.id = str(offer.id)
+        self.truck_id = str(offer.truck_id)
+        self.material_type = offer.material_type
+        self.quantity = offer.quantity
+        self.unit = offer.unit
+        self.destination = offer.destination
+        self.destination_key = (offer.destination or "").lower()
+        self.price = offer.price
+        self.description = offer.description
+        self.created_at = offer.created_at
+        self.latitude = float(latitude) if latitude is not None else None
+        self.longitude = float(longitude) if longitude is not None else None
+
+    def position(self) -> Tuple[Optional[float], Optional[float]]:
+        """Current position of the offer's truck, live from the truck pool when it knows the truck"""
+        truck = truck_pool.get(self.truck_id)
+        if truck is not None and truck.latitude is not None:
+            return truck.latitude, truck.longitude
+        return self.latitude, self.longitude
+
+
+class OfferIndex:
+    """Available preloaded-material offers held in memory and partitioned by material type.
+
+    Loaded at startup and kept current write-through by the offer service as
+    offers are created, booked or withdrawn, and reloaded periodically to pick
+    up changes made by other workers. Searches never touch the database;
+    proximity uses the trucks' live positions from the truck pool.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self._by_material: Dict[str, Dict[str, OfferRecord]] = {}
+        self._material_of: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._material_of)
+
+    def load(self, db: Session) -> int:
+        """Rebuild the index from the available offers in the database"""
+        rows = db.query(PreloadedMaterial, Truck.latitude, Truck.longitude).join(
+            Truck, Truck.id == PreloadedMaterial.truck_id
+        ).filter(PreloadedMaterial.status == PreloadedMaterialStatus.AVAILABLE).all()
+        by_material: Dict[str, Dict[str, OfferRecord]] = {}
+        material_of: Dict[str, str] = {}
+        for offer, latitude, longitude in rows:
+            record = OfferRecord(offer, latitude, longitude)
+            key = record.material_type.lower()
+            by_material.setdefault(key, {})[record.id] = record
+            material_of[record.id] = key
+        with self._lock:
+            self._by_material = by_material
+            self._material_of = material_of
+            self.loaded = True
+        return len(material_of)
+
+    def upsert(self, offer: PreloadedMaterial, latitude=None, longitude=None) -> None:
+        """Write-through from a committed offer; offers that are no longer available are dropped"""
+        if offer.status != PreloadedMaterialStatus.AVAILABLE:
+            self.remove(offer.id)
+            return
+        record = OfferRecord(offer, latitude, longitude)
+        key = record.material_type.lower()
+        with self._lock:
+            self._remove_locked(record.id)
+            self._by_material.setdefault(key, {})[record.id] = record
+            self._material_of[record.id] = key
+
+    def remove(self, offer_id) -> None:
+        with self._lock:
+            self._remove_locked(str(offer_id))
+
+    def _remove_locked(self, offer_id: str) -> None:
+        key = self._material_of.pop(offer_id, None)
+        if key is not None:
+            partition = self._by_material[key]
+            partition.pop(offer_id, None)
+            if not partition:
+                del self._by_material[key]
+
+    def search(
+        self, material_type: Optional[str] = None, destination: Optional[str] = None,
+        min_price: Optional[float] = None, max_price: Optional[float] = None,
+        latitude: Optional[float] = None, longitude: Optional[float] = None, radius_km: Optional[float] = None,
+        limit: int = 50
+    ) -> List[Tuple[OfferRecord, Optional[float]]]:
+        """Matching offers with their truck's distance from (latitude, longitude).
+
+        Results are nearest first when a location is given, cheapest first otherwise.
+        """
+        with self._lock:
+            if material_type is not None:
+                records = list(self._by_material.get(material_type.lower(), {}).values())
+            else:
+                records = [record for partition in self._by_material.values() for record in partition.values()]
+
+        destination_key = destination.lower() if destination else None
+        records = [
+            record for record in records
+            if (destination_key is None or destination_key in record.destination_key)
+            and (min_price is None or record.price >= min_price)
+            and (max_price is None or record.price <= max_price)
+        ]
+        if not records:
+            return []
+
+        if latitude is None or longitude is None:
+            records.sort(key=lambda record: (record.price, record.id))
+            return [(record, None) for record in records[:limit]]
+
+        positions = np.array([record.position() for record in records], dtype=np.float64)
+        distances = DistanceCalculator.distances_from(latitude, longitude, positions[:, 0], positions[:, 1])
+        # Offers whose truck has no known position cannot be ranked by distance
+        distances[np.isnan(distances)] = np.inf
+        order = np.argsort(distances, kind="stable")
+        if radius_km is not None:
+            order = order[distances[order] <= radius_km]
+        else:
+            order = order[np.isfinite(distances[order])]
+        return [(records[i], float(distances[i])) for i in order[:limit].tolist()]
+
+
+offer_index = OfferIndex()
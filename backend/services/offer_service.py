@@ -0,0 +1,117 @@
+import asyncio
+from typing import List, Optional
+import structlog
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.database import SessionLocal, unit_of_work
+from backend.core.exceptions import (
+    OfferNotFoundException, OfferNotAvailableException, TruckNotFoundException, UnauthorizedAccessException
+)
+from backend.models.truck import PreloadedMaterial, PreloadedMaterialStatus, Truck
+from backend.models.user import User, UserRole
+from backend.schemas.truck import OfferSearchResult, PreloadedOfferCreate
+from backend.services.offer_index import offer_index
+
+logger = structlog.get_logger()
+
+
+class OfferService:
+    """Preloaded-material offers: trucks already carrying a load, offered to customers along their route"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_offer(self, owner: User, offer_data: PreloadedOfferCreate) -> PreloadedMaterial:
+        """Offer a load carried by one of the owner's trucks"""
+        truck = self.db.query(Truck).filter(Truck.id == offer_data.truck_id).first()
+        if not truck:
+            raise TruckNotFoundException(offer_data.truck_id)
+        if str(truck.truck_owner_id) != str(owner.id):
+            raise UnauthorizedAccessException("Only the truck's owner can offer its load")
+
+        with unit_of_work(self.db):
+            offer = PreloadedMaterial(
+                truck_id=truck.id,
+                status=PreloadedMaterialStatus.AVAILABLE,
+                **offer_data.model_dump(exclude={"truck_id"})
+            )
+            self.db.add(offer)
+
+        self.db.refresh(offer)
+        offer_index.upsert(offer, truck.latitude, truck.longitude)
+        return offer
+
+    def book_offer(self, offer_id: str) -> PreloadedMaterial:
+        """Take an available offer; of two customers booking at once exactly one succeeds"""
+        with unit_of_work(self.db):
+            claimed = self.db.query(PreloadedMaterial).filter(
+                and_(
+                    PreloadedMaterial.id == offer_id,
+                    PreloadedMaterial.status == PreloadedMaterialStatus.AVAILABLE
+                )
+            ).update({PreloadedMaterial.status: PreloadedMaterialStatus.BOOKED}, synchronize_session=False)
+
+        offer = self.db.query(PreloadedMaterial).filter(PreloadedMaterial.id == offer_id).first()
+        if not offer:
+            raise OfferNotFoundException(offer_id)
+        offer_index.remove(offer.id)
+        if not claimed:
+            raise OfferNotAvailableException(offer_id)
+        return offer
+
+    def withdraw_offer(self, offer_id: str, user: User) -> None:
+        """Remove an offer (its truck's owner or an admin)"""
+        offer = self.db.query(PreloadedMaterial).filter(PreloadedMaterial.id == offer_id).first()
+        if not offer:
+            raise OfferNotFoundException(offer_id)
+        if user.role != UserRole.ADMIN and str(offer.truck.truck_owner_id) != str(user.id):
+            raise UnauthorizedAccessException("Only the truck's owner can withdraw its offer")
+
+        with unit_of_work(self.db):
+            self.db.delete(offer)
+        offer_index.remove(offer_id)
+
+    @staticmethod
+    def search_offers(
+        material_type: Optional[str] = None, destination: Optional[str] = None,
+        min_price: Optional[float] = None, max_price: Optional[float] = None,
+        latitude: Optional[float] = None, longitude: Optional[float] = None, radius_km: Optional[float] = None,
+        limit: int = 50
+    ) -> List[OfferSearchResult]:
+        """Search available offers in the in-memory index"""
+        matches = offer_index.search(
+            material_type, destination, min_price, max_price, latitude, longitude, radius_km,
+            min(limit, settings.OFFER_SEARCH_LIMIT_MAX)
+        )
+        return [
+            OfferSearchResult(
+                id=record.id,
+                truck_id=record.truck_id,
+                material_type=record.material_type,
+                quantity=record.quantity,
+                unit=record.unit,
+                destination=record.destination,
+                price=record.price,
+                description=record.description,
+                status=PreloadedMaterialStatus.AVAILABLE,
+                created_at=record.created_at,
+                distance_km=round(distance, 3) if distance is not None else None
+            )
+            for record, distance in matches
+        ]
+
+
+def reload_offer_index() -> int:
+    with SessionLocal() as db:
+        return offer_index.load(db)
+
+
+async def offer_index_reload_loop() -> None:
+    """Periodically rebuild the offer index to pick up changes made by other workers"""
+    while True:
+        await asyncio.sleep(settings.OFFER_INDEX_RELOAD_SECONDS)
+        try:
+            await asyncio.to_thread(reload_offer_index)
+        except Exception as e:
+            logger.error(f"Offer index reload failed: {e}")
@@ -0,0 +1,180 @@
+import threading
+import time
+import uuid
+from decimal import Decimal
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.models.material import MaterialSource
+from backend.models.vehicle_type import FreightTariff, VehicleType
+from backend.schemas.quote import QuoteRequest, QuoteResponse
+from backend.utils.distance_calculator import DistanceCalculator
+
+
+def _key(value) -> Optional[str]:
+    """Canonical dashed form of an id, whichever form it was given in"""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(f"{value:.2f}")
+
+
+class PricingTables:
+    """Snapshot of every source's price and position and every vehicle type's tariff, as arrays.
+
+    A missing price, position or tariff is NaN, so one lookup per quote
+    gathers all its inputs and the arithmetic runs over whole columns.
+    """
+
+    def __init__(self, sources, vehicle_types):
+        self.source_index: Dict[str, int] = {}
+        self.source_lat = np.full(len(sources), np.nan)
+        self.source_lon = np.full(len(sources), np.nan)
+        self.source_price = np.full(len(sources), np.nan)
+        for i, (source_id, latitude, longitude, price) in enumerate(sources):
+            self.source_index[str(source_id)] = i
+            if latitude is not None and longitude is not None:
+                self.source_lat[i] = latitude
+                self.source_lon[i] = longitude
+            if price is not None:
+                self.source_price[i] = price
+
+        self.vehicle_index: Dict[str, int] = {}
+        self.capacity = np.full(len(vehicle_types), np.nan)
+        self.base_fare = np.full(len(vehicle_types), np.nan)
+        self.rate_per_km = np.full(len(vehicle_types), np.nan)
+        self.minimum_fare = np.full(len(vehicle_types), np.nan)
+        for i, (vehicle_type_id, capacity, base_fare, rate_per_km, minimum_fare) in enumerate(vehicle_types):
+            self.vehicle_index[str(vehicle_type_id)] = i
+            self.capacity[i] = capacity
+            if rate_per_km is not None:
+                self.base_fare[i] = base_fare
+                self.rate_per_km[i] = rate_per_km
+                self.minimum_fare[i] = minimum_fare
+        self.loaded_at = time.monotonic()
+
+
+class PricingCache:
+    """Pricing tables shared by all requests of the process.
+
+    Rebuilt from the database when older than QUOTE_TABLES_TTL_SECONDS, and
+    invalidated right away when a price or tariff is changed through this
+    process; other workers pick the change up within the TTL.
+    """
+
+    def __init__(self):
+        self._tables: Optional[PricingTables] = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> PricingTables:
+        tables = self._tables
+        if tables is not None and time.monotonic() - tables.loaded_at < settings.QUOTE_TABLES_TTL_SECONDS:
+            return tables
+        with self._lock:
+            # Another request may have rebuilt the tables while this one waited
+            tables = self._tables
+            if tables is None or time.monotonic() - tables.loaded_at >= settings.QUOTE_TABLES_TTL_SECONDS:
+                tables = self._tables = self.load(db)
+            return tables
+
+    @staticmethod
+    def load(db: Session) -> PricingTables:
+        sources = db.query(
+            MaterialSource.id, MaterialSource.latitude, MaterialSource.longitude, MaterialSource.price_per_unit
+        ).all()
+        vehicle_types = db.query(
+            VehicleType.id, VehicleType.capacity_ton,
+            FreightTariff.base_fare, FreightTariff.rate_per_km, FreightTariff.minimum_fare
+        ).outerjoin(FreightTariff, FreightTariff.vehicle_type_id == VehicleType.id).all()
+        return PricingTables(sources, vehicle_types)
+
+    def invalidate(self) -> None:
+        self._tables = None
+
+
+pricing_cache = PricingCache()
+
+
+class QuoteService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def quote_batch(self, requests: List[QuoteRequest]) -> List[QuoteResponse]:
+        """Price each (source, destination, vehicle type, quantity) combination, in request order.
+
+        Material cost is quantity * the source's price per unit. Freight is
+        charged per trip, ceil(quantity / vehicle capacity) trips each costing
+        base_fare + rate_per_km * road distance, and at least minimum_fare.
+        Road distance is estimated as QUOTE_ROAD_DISTANCE_FACTOR times the
+        great-circle distance. Combinations that cannot be priced come back
+        with an error instead of failing the batch.
+        """
+        tables = pricing_cache.get(self.db)
+        n = len(requests)
+        source_idx = np.fromiter(
+            (tables.source_index.get(_key(r.material_source_id), -1) for r in requests), dtype=np.intp, count=n
+        )
+        vehicle_idx = np.fromiter(
+            (tables.vehicle_index.get(_key(r.vehicle_type_id), -1) for r in requests), dtype=np.intp, count=n
+        )
+        dest_lat = np.fromiter((r.destination_latitude for r in requests), dtype=np.float64, count=n)
+        dest_lon = np.fromiter((r.destination_longitude for r in requests), dtype=np.float64, count=n)
+        quantity = np.fromiter((r.quantity for r in requests), dtype=np.float64, count=n)
+
+        known_source = source_idx >= 0
+        known_vehicle = vehicle_idx >= 0
+
+        def gather(column, idx, known):
+            # Unknown ids read row 0 and are masked to NaN; an empty table has nothing to read
+            if not len(column):
+                return np.full(n, np.nan)
+            return np.where(known, column[np.where(known, idx, 0)], np.nan)
+
+        price = gather(tables.source_price, source_idx, known_source)
+        source_lat = gather(tables.source_lat, source_idx, known_source)
+        source_lon = gather(tables.source_lon, source_idx, known_source)
+        capacity = gather(tables.capacity, vehicle_idx, known_vehicle)
+        base_fare = gather(tables.base_fare, vehicle_idx, known_vehicle)
+        rate_per_km = gather(tables.rate_per_km, vehicle_idx, known_vehicle)
+        minimum_fare = gather(tables.minimum_fare, vehicle_idx, known_vehicle)
+
+        with np.errstate(invalid="ignore"):
+            distance = DistanceCalculator.pairwise_distances(
+                source_lat, source_lon, dest_lat, dest_lon
+            ) * settings.QUOTE_ROAD_DISTANCE_FACTOR
+            trips = np.ceil(quantity / capacity)
+            freight = trips * np.maximum(minimum_fare, base_fare + rate_per_km * distance)
+            material = quantity * price
+        material = np.round(material, 2)
+        freight = np.round(freight, 2)
+
+        results = []
+        for i, request in enumerate(requests):
+            result = QuoteResponse(
+                material_source_id=request.material_source_id,
+                vehicle_type_id=request.vehicle_type_id,
+                quantity=request.quantity
+            )
+            if not known_source[i]:
+                result.error = "Material source not found"
+            elif np.isnan(source_lat[i]):
+                result.error = "Material source has no coordinates"
+            elif np.isnan(price[i]):
+                result.error = "Material source has no price"
+            elif not known_vehicle[i]:
+                result.error = "Vehicle type not found"
+            elif np.isnan(rate_per_km[i]):
+                result.error = "No freight tariff for vehicle type"
+            else:
+                result.distance_km = round(float(distance[i]), 3)
+                result.trips = int(trips[i])
+                result.material_cost = _money(material[i])
+                result.freight_cost = _money(freight[i])
+                result.total_cost = _money(material[i] + freight[i])
+            results.append(result)
+        return results
@@ -0,0 +1,98 @@
+import uuid
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from backend.database import unit_of_work
+from backend.core.exceptions import BookingNotFoundException, RatingNotAllowedException
+from backend.models.booking import Booking, BookingStatus
+from backend.models.rating import Rating, UserRatingAggregate
+from backend.models.truck import Truck
+from backend.schemas.rating import RatingCreate, UserRatingSummary
+from backend.services.truck_pool import truck_pool
+
+
+class RatingService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_rating(self, reviewer_id: str, rating_data: RatingCreate) -> Rating:
+        """Rate the other party of a completed booking and fold it into their rating aggregate"""
+        booking = self.db.query(Booking).filter(Booking.id == rating_data.booking_id).first()
+        if not booking:
+            raise BookingNotFoundException(rating_data.booking_id)
+        if booking.status != BookingStatus.COMPLETED:
+            raise RatingNotAllowedException("Only completed bookings can be rated")
+
+        reviewee_id = self._reviewee_for(booking, reviewer_id)
+        already_rated = self.db.query(Rating.id).filter(
+            Rating.booking_id == booking.id,
+            Rating.reviewer_id == reviewer_id
+        ).first()
+        if already_rated:
+            raise RatingNotAllowedException("You have already rated this booking")
+
+        # The rating and the aggregate change commit or roll back together
+        with unit_of_work(self.db):
+            rating = Rating(
+                id=uuid.uuid4(),
+                booking_id=booking.id,
+                reviewer_id=reviewer_id,
+                reviewee_id=reviewee_id,
+                rating=rating_data.rating,
+                review=rating_data.review
+            )
+            self.db.add(rating)
+            self._add_to_aggregate(reviewee_id, rating_data.rating)
+
+        truck_pool.record_owner_rating(reviewee_id, rating_data.rating)
+        return rating
+
+    def _reviewee_for(self, booking: Booking, reviewer_id: str):
+        """The customer rates the truck owner and the truck owner rates the customer"""
+        owner_id = None
+        if booking.assigned_truck_id:
+            owner_id = self.db.query(Truck.truck_owner_id).filter(Truck.id == booking.assigned_truck_id).scalar()
+
+        if str(booking.user_id) == str(reviewer_id):
+            if owner_id is None:
+                raise RatingNotAllowedException("Booking has no truck owner to rate")
+            return owner_id
+        if owner_id is not None and str(owner_id) == str(reviewer_id):
+            return booking.user_id
+        raise RatingNotAllowedException("Only the customer and the truck owner of a booking can rate it")
+
+    def _add_to_aggregate(self, user_id, stars: int) -> None:
+        """Increment the user's rating totals in place; the caller commits"""
+        star_column = getattr(UserRatingAggregate, f"star_{stars}")
+        increment = {
+            UserRatingAggregate.rating_count: UserRatingAggregate.rating_count + 1,
+            UserRatingAggregate.rating_sum: UserRatingAggregate.rating_sum + stars,
+            star_column: star_column + 1
+        }
+        query = self.db.query(UserRatingAggregate).filter(UserRatingAggregate.user_id == user_id)
+        if query.update(increment, synchronize_session=False):
+            return
+
+        # First rating for this user
+        try:
+            with self.db.begin_nested():
+                self.db.add(UserRatingAggregate(
+                    user_id=user_id, rating_count=1, rating_sum=stars, **{f"star_{stars}": 1}
+                ))
+        except IntegrityError:
+            # A concurrent first rating created the row
+            query.update(increment, synchronize_session=False)
+
+    def get_user_summary(self, user_id: str) -> UserRatingSummary:
+        """Rating count, average and histogram for a user, read from their aggregate row"""
+        aggregate: Optional[UserRatingAggregate] = self.db.get(UserRatingAggregate, user_id)
+        if aggregate is None:
+            return UserRatingSummary(
+                user_id=user_id, rating_count=0, rating_average=None, histogram={star: 0 for star in range(1, 6)}
+            )
+        return UserRatingSummary(
+            user_id=user_id,
+            rating_count=aggregate.rating_count,
+            rating_average=aggregate.average,
+            histogram=aggregate.histogram
+        )
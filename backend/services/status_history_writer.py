@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, List, Optional
+import structlog
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.models.booking import BookingStatusHistory
+
+logger = structlog.get_logger()
+
+# Session.info key holding the history rows added in the session's current transaction
+_PENDING_KEY = "booking_status_history"
+
+
+class StatusHistoryWriter:
+    """Collects BookingStatusHistory rows and writes them with multi-row inserts.
+
+    Rows added to a session are held until that session commits. In the
+    ``transactional`` HISTORY_WRITE_MODE they are inserted with one
+    executemany statement just before the commit, so history is exactly as
+    durable as the status change it records. In ``buffered`` mode the rows
+    of committed transactions are handed to a background task that inserts
+    them every HISTORY_FLUSH_INTERVAL_SECONDS, or as soon as
+    HISTORY_BATCH_SIZE rows are waiting; up to one interval of history can
+    be lost if the process dies. While flushes keep failing the buffer holds
+    at most HISTORY_BUFFER_MAX rows, dropping the oldest, which are counted
+    in ``dropped``. Rows of rolled back transactions are dropped in both
+    modes, and buffered mode falls back to transactional writes while the
+    background task is not running.
+    """
+
+    def __init__(self):
+        self._buffer: List[dict] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._session_factory: Optional[Callable[[], Session]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_now: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def buffering(self) -> bool:
+        return settings.HISTORY_WRITE_MODE == "buffered" and self.running
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def add(self, db: Session, booking_id, status, notes: Optional[str] = None) -> None:
+        """Record a status change; it is written when ``db`` commits"""
+        db.info.setdefault(_PENDING_KEY, []).append({
+            "id": uuid.uuid4(),
+            "booking_id": booking_id,
+            "status": status.value if hasattr(status, "value") else status,
+            "notes": notes,
+            # Taken now rather than at insert time so buffered rows keep their order
+            "updated_at": datetime.utcnow()
+        })
+
+    @staticmethod
+    def write(db: Session, rows: List[dict]) -> None:
+        """Insert rows with a single executemany statement (multi-row INSERT on MySQL)"""
+        if rows:
+            db.execute(insert(BookingStatusHistory.__table__), rows)
+
+    async def start(self, session_factory: Callable[[], Session]) -> None:
+        self._session_factory = session_factory
+        self._loop = asyncio.get_running_loop()
+        self._flush_now = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    def flush(self) -> int:
+        """Write all buffered rows, HISTORY_BATCH_SIZE per transaction; returns the number written"""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return 0
+
+        batch_size = settings.HISTORY_BATCH_SIZE
+        written = 0
+        try:
+            with self._session_factory() as db:
+                for start in range(0, len(rows), batch_size):
+                    self.write(db, rows[start:start + batch_size])
+                    db.commit()
+                    written = start + batch_size
+        except Exception:
+            # Keep the unwritten rows, ahead of anything buffered meanwhile, for the next flush
+            with self._lock:
+                self._buffer[:0] = rows[written:]
+                self._trim_locked()
+            raise
+        return len(rows)
+
+    def _trim_locked(self) -> None:
+        overflow = len(self._buffer) - settings.HISTORY_BUFFER_MAX
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.dropped += overflow
+            logger.warning("Dropped buffered booking status history", rows=overflow, total_dropped=self.dropped)
+
+    def _enqueue(self, rows: List[dict]) -> None:
+        with self._lock:
+            self._buffer.extend(rows)
+            self._trim_locked()
+            full = len(self._buffer) >= settings.HISTORY_BATCH_SIZE
+        if full and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._flush_now.set)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=settings.HISTORY_FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Failed to write booking status history: {e}", buffered=len(self), total_dropped=self.dropped)
+
+    def _before_commit(self, session: Session) -> None:
+        rows = session.info.get(_PENDING_KEY)
+        if not rows or self.buffering:
+            return
+        del session.info[_PENDING_KEY]
+        # The bookings the rows refer to must be inserted first
+        session.flush()
+        self.write(session, rows)
+
+    def _after_commit(self, session: Session) -> None:
+        rows = session.info.pop(_PENDING_KEY, None)
+        if rows:
+            self._enqueue(rows)
+
+    def _after_transaction_end(self, session: Session, transaction) -> None:
+        # Whatever is still pending when the outermost transaction ends was rolled back
+        if transaction.parent is None:
+            session.info.pop(_PENDING_KEY, None)
+
+
+status_history_writer = StatusHistoryWriter()
+
+event.listen(Session, "before_commit", status_history_writer._before_commit)
+event.listen(Session, "after_commit", status_history_writer._after_commit)
+event.listen(Session, "after_transaction_end", status_history_writer._after_transaction_end)
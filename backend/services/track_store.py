@@ -0,0 +1,139 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.models.booking import Booking, BookingStatus, TripTrackSegment
+from backend.services.booking_scheduler import to_utc_naive
+from backend.utils.track_codec import decode_points, encode_points
+
+# Bookings whose truck's pings belong to the trip
+TRIP_STATUSES = (BookingStatus.TRUCK_ASSIGNED, BookingStatus.LOADING, BookingStatus.IN_TRANSIT)
+
+_EPOCH = datetime(1970, 1, 1)
+
+# (recorded_at, latitude and longitude in microdegrees)
+TrackFix = Tuple[datetime, int, int]
+
+
+def segment_start(recorded_at: datetime) -> datetime:
+    """Start of the TRACK_SEGMENT_SECONDS window holding a point"""
+    seconds = int((recorded_at - _EPOCH).total_seconds())
+    return _EPOCH + timedelta(seconds=seconds - seconds % settings.TRACK_SEGMENT_SECONDS)
+
+
+def _offset_ms(recorded_at: datetime, start: datetime) -> int:
+    return round((recorded_at - start).total_seconds() * 1000)
+
+
+class TrackStore:
+    """Trip tracks of bookings, stored as delta-encoded blobs in fixed time segments.
+
+    Appending encodes only the new points against the segment's stored last
+    point, so a segment is append-only in time order: points not newer than
+    its last stored point (re-sent or very late pings) are dropped. Reading a
+    time range loads and decodes just the segments that overlap it.
+    """
+
+    def append(self, db: Session, booking_id, fixes: List[TrackFix]) -> int:
+        """Add points to a booking's track; the caller commits"""
+        by_segment: Dict[datetime, List[TrackFix]] = defaultdict(list)
+        for fix in fixes:
+            by_segment[segment_start(fix[0])].append(fix)
+        if not by_segment:
+            return 0
+
+        # Locked so two writers appending to one segment cannot both extend the same last point
+        existing = {
+            segment.segment_start: segment
+            for segment in db.query(TripTrackSegment).filter(
+                TripTrackSegment.booking_id == booking_id,
+                TripTrackSegment.segment_start.in_(list(by_segment))
+            ).with_for_update()
+        }
+        appended = 0
+        for start, segment_fixes in by_segment.items():
+            # One point per timestamp, in time order
+            by_offset = {}
+            for recorded_at, lat, lon in segment_fixes:
+                offset_ms = _offset_ms(recorded_at, start)
+                by_offset[offset_ms] = (offset_ms, lat, lon)
+            points = sorted(by_offset.values())
+            segment = existing.get(start)
+            if segment is None:
+                segment = TripTrackSegment(booking_id=booking_id, segment_start=start, point_count=0, data=b"")
+                db.add(segment)
+                previous = (0, 0, 0)
+            else:
+                previous = (segment.last_offset_ms, segment.last_latitude_e6, segment.last_longitude_e6)
+                points = [point for point in points if point[0] > previous[0]]
+                if not points:
+                    continue
+            segment.data = segment.data + encode_points(points, previous)
+            segment.point_count += len(points)
+            segment.last_offset_ms, segment.last_latitude_e6, segment.last_longitude_e6 = points[-1]
+            appended += len(points)
+        return appended
+
+    def record_pings(self, db: Session, pings: List[dict]) -> int:
+        """Add truck_location_pings rows to the tracks of the bookings their trucks are on; the caller commits"""
+        truck_ids = {ping["truck_id"] for ping in pings}
+        if not truck_ids:
+            return 0
+        trips = {
+            str(truck_id): booking_id
+            for booking_id, truck_id in db.query(Booking.id, Booking.assigned_truck_id).filter(
+                Booking.assigned_truck_id.in_(truck_ids),
+                Booking.status.in_(TRIP_STATUSES)
+            )
+        }
+        by_booking: Dict[str, List[TrackFix]] = defaultdict(list)
+        for ping in pings:
+            booking_id = trips.get(ping["truck_id"])
+            if booking_id is not None:
+                by_booking[booking_id].append((ping["recorded_at"], ping["latitude_e6"], ping["longitude_e6"]))
+        return sum(self.append(db, booking_id, fixes) for booking_id, fixes in by_booking.items())
+
+    def polyline(
+        self, db: Session, booking_id, start: Optional[datetime] = None, end: Optional[datetime] = None,
+        resolution_seconds: float = 0
+    ) -> Tuple[List[Tuple[datetime, float, float]], int]:
+        """Track points between start and end, at most one per ``resolution_seconds``, and the segments decoded.
+
+        The first point of every resolution interval is kept, plus the last point of the track.
+        """
+        query = db.query(TripTrackSegment.segment_start, TripTrackSegment.data).filter(
+            TripTrackSegment.booking_id == booking_id
+        )
+        if start is not None:
+            start = to_utc_naive(start)
+            query = query.filter(TripTrackSegment.segment_start >= segment_start(start))
+        if end is not None:
+            end = to_utc_naive(end)
+            query = query.filter(TripTrackSegment.segment_start <= end)
+        segments = query.order_by(TripTrackSegment.segment_start).all()
+
+        resolution_ms = int(resolution_seconds * 1000)
+        points = []
+        last_bucket = None
+        last_point = None
+        for seg_start, data in segments:
+            base_ms = round((seg_start - _EPOCH).total_seconds() * 1000)
+            for offset_ms, lat, lon in decode_points(data):
+                recorded_at = seg_start + timedelta(milliseconds=offset_ms)
+                if (start is not None and recorded_at < start) or (end is not None and recorded_at > end):
+                    continue
+                point = (recorded_at, lat / 1e6, lon / 1e6)
+                last_point = point
+                if resolution_ms:
+                    bucket = (base_ms + offset_ms) // resolution_ms
+                    if bucket == last_bucket:
+                        continue
+                    last_bucket = bucket
+                points.append(point)
+        if last_point is not None and points[-1] is not last_point:
+            points.append(last_point)
+        return points, len(segments)
+
+
+track_store = TrackStore()
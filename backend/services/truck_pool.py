@@ -0,0 +1,370 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple, Union
+import structlog
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models.booking import Booking, BookingStatus
+from backend.models.rating import UserRatingAggregate
+from backend.models.truck import Truck, TruckStatus
+from backend.services.booking_scheduler import to_utc_naive
+from backend.utils.geo_index import GeoGridIndex
+
+logger = structlog.get_logger()
+
+
+def _timestamp(value: datetime) -> float:
+    """POSIX timestamp of a database datetime, treating naive values as UTC"""
+    return to_utc_naive(value).replace(tzinfo=timezone.utc).timestamp()
+
+
+class TruckRecord:
+    """Compact in-memory view of one truck, as much as matching needs"""
+
+    __slots__ = (
+        "id", "vehicle_type_id", "owner_id", "vehicle_number", "current_location",
+        "latitude", "longitude", "available", "last_assigned_ts", "completed_trips", "owner_rating",
+        "touched_at", "moved_at"
+    )
+
+    def __init__(self, id, vehicle_type_id, owner_id, vehicle_number, current_location,
+                 latitude, longitude, available, last_assigned_ts=None, completed_trips=0,
+                 owner_rating=None):
+        self.id = id
+        self.vehicle_type_id = vehicle_type_id
+        self.owner_id = owner_id
+        self.vehicle_number = vehicle_number
+        self.current_location = current_location
+        self.latitude = latitude
+        self.longitude = longitude
+        self.available = available
+        # POSIX timestamp of the truck's latest booking, None if it never had one
+        self.last_assigned_ts = last_assigned_ts
+        self.completed_trips = completed_trips
+        # Average rating received by the owner, None while unrated
+        self.owner_rating = owner_rating
+        # time.monotonic() of the last write-through change of availability or the row,
+        # and of the last GPS move; 0 for records read from the database
+        self.touched_at = 0.0
+        self.moved_at = 0.0
+
+    def key(self) -> tuple:
+        """Fields compared when reconciling against the database"""
+        return (self.vehicle_type_id, self.owner_id, self.current_location,
+                self.latitude, self.longitude, self.available)
+
+
+class _Partition:
+    """Available trucks of one vehicle type"""
+
+    __slots__ = ("records", "geo")
+
+    def __init__(self, cell_size_deg: float):
+        self.records: Dict[str, TruckRecord] = {}
+        self.geo = GeoGridIndex(cell_size_deg)
+
+
+class TruckPool:
+    """In-process pool of trucks, with the available ones partitioned by vehicle type.
+
+    The pool is loaded at startup, updated write-through by the truck routes
+    and the booking service, and periodically reconciled with the trucks table
+    to correct drift (e.g. writes made by other workers). It only proposes
+    candidates: assignment still claims the truck with a conditional UPDATE.
+
+    It also keeps the statistics used to score candidates (completed trips,
+    last assignment, owner rating, owners each customer has completed trips
+    with). They are aggregated from the bookings once, on load, and then
+    only updated as bookings are assigned and complete and ratings arrive,
+    so neither scoring nor reconcile runs those aggregates.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.1):
+        self.cell_size_deg = cell_size_deg
+        self.loaded = False
+        self._records: Dict[str, TruckRecord] = {}
+        self._partitions: Dict[str, _Partition] = {}
+        self._owner_ratings: Dict[str, Tuple[int, int]] = {}
+        self._customer_owners: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def _record_from_row(truck_id, vehicle_type_id, owner_id, vehicle_number, current_location,
+                         latitude, longitude, is_available, status, last_assigned_ts=None) -> TruckRecord:
+        return TruckRecord(
+            id=str(truck_id),
+            vehicle_type_id=str(vehicle_type_id),
+            owner_id=str(owner_id),
+            vehicle_number=vehicle_number,
+            current_location=current_location,
+            latitude=float(latitude) if latitude is not None else None,
+            longitude=float(longitude) if longitude is not None else None,
+            available=bool(is_available) and status == TruckStatus.AVAILABLE,
+            last_assigned_ts=last_assigned_ts
+        )
+
+    def _fetch_trucks(self, db: Session) -> Dict[str, TruckRecord]:
+        rows = db.query(
+            Truck.id, Truck.vehicle_type_id, Truck.truck_owner_id, Truck.vehicle_number,
+            Truck.current_location, Truck.latitude, Truck.longitude, Truck.is_available, Truck.status
+        ).all()
+        return {record.id: record for record in (self._record_from_row(*row) for row in rows)}
+
+    def _fetch(self, db: Session) -> Dict[str, TruckRecord]:
+        """Truck rows together with their booking statistics"""
+        last_assigned = dict(
+            (str(truck_id), assigned_at) for truck_id, assigned_at in db.query(
+                Booking.assigned_truck_id, func.max(Booking.created_at)
+            ).filter(Booking.assigned_truck_id.isnot(None)).group_by(Booking.assigned_truck_id)
+        )
+        completed_trips = dict(
+            (str(truck_id), trips) for truck_id, trips in db.query(
+                Booking.assigned_truck_id, func.count(Booking.id)
+            ).filter(
+                Booking.assigned_truck_id.isnot(None),
+                Booking.status == BookingStatus.COMPLETED
+            ).group_by(Booking.assigned_truck_id)
+        )
+        records = self._fetch_trucks(db)
+        for record in records.values():
+            assigned_at = last_assigned.get(record.id)
+            record.last_assigned_ts = _timestamp(assigned_at) if assigned_at is not None else None
+            record.completed_trips = completed_trips.get(record.id, 0)
+        return records
+
+    def _fetch_owner_stats(self, db: Session) -> Tuple[Dict[str, Tuple[int, int]], Dict[str, Set[str]]]:
+        owner_ratings = {
+            str(user_id): (count, total)
+            for user_id, count, total in db.query(
+                UserRatingAggregate.user_id, UserRatingAggregate.rating_count, UserRatingAggregate.rating_sum
+            ).filter(UserRatingAggregate.rating_count > 0)
+        }
+        customer_owners: Dict[str, Set[str]] = {}
+        for user_id, owner_id in db.query(Booking.user_id, Truck.truck_owner_id).join(
+            Truck, Truck.id == Booking.assigned_truck_id
+        ).filter(Booking.status == BookingStatus.COMPLETED).distinct():
+            customer_owners.setdefault(str(user_id), set()).add(str(owner_id))
+        return owner_ratings, customer_owners
+
+    def _index_locked(self, record: TruckRecord) -> None:
+        partition = self._partitions.get(record.vehicle_type_id)
+        if partition is None:
+            partition = self._partitions[record.vehicle_type_id] = _Partition(self.cell_size_deg)
+        partition.records[record.id] = record
+        if record.latitude is not None and record.longitude is not None:
+            partition.geo.upsert(record.id, record.latitude, record.longitude)
+
+    def _unindex_locked(self, record: TruckRecord) -> None:
+        partition = self._partitions.get(record.vehicle_type_id)
+        if partition is not None:
+            partition.records.pop(record.id, None)
+            partition.geo.remove(record.id)
+
+    def _owner_average_locked(self, owner_id: str) -> Optional[float]:
+        count, total = self._owner_ratings.get(owner_id, (0, 0))
+        return total / count if count else None
+
+    def _put_locked(self, record: TruckRecord) -> None:
+        record.owner_rating = self._owner_average_locked(record.owner_id)
+        previous = self._records.get(record.id)
+        if previous is not None:
+            self._unindex_locked(previous)
+            # Statistics are kept up to date by the pool itself, not re-read with the row
+            if record.last_assigned_ts is None:
+                record.last_assigned_ts = previous.last_assigned_ts
+            record.completed_trips = previous.completed_trips
+        self._records[record.id] = record
+        if record.available:
+            self._index_locked(record)
+
+    def load(self, db: Session) -> int:
+        """Rebuild the pool from the trucks table"""
+        records = self._fetch(db)
+        owner_ratings, customer_owners = self._fetch_owner_stats(db)
+        with self._lock:
+            self._records = {}
+            self._partitions = {}
+            self._owner_ratings = owner_ratings
+            self._customer_owners = customer_owners
+            for record in records.values():
+                self._put_locked(record)
+            self.loaded = True
+        return len(records)
+
+    def reconcile(self, db: Session) -> int:
+        """Re-read the trucks table and fix any records that drifted; returns the number fixed.
+
+        Only truck rows are read. Records changed through the pool after the
+        read started are skipped, as the snapshot may predate their writes.
+        Positions from GPS moves in the last TRUCK_POOL_RECONCILE_KEEP_MOVED_SECONDS
+        are kept, since they are written behind, but every other field is
+        still taken from the row.
+        """
+        started = time.monotonic()
+        records = self._fetch_trucks(db)
+        moved_since = started - settings.TRUCK_POOL_RECONCILE_KEEP_MOVED_SECONDS
+        drift = 0
+        with self._lock:
+            for truck_id in list(self._records):
+                if truck_id not in records and self._records[truck_id].touched_at < started:
+                    self._unindex_locked(self._records.pop(truck_id))
+                    drift += 1
+            for truck_id, record in records.items():
+                current = self._records.get(truck_id)
+                if current is not None:
+                    if current.touched_at >= started:
+                        continue
+                    if current.moved_at >= moved_since:
+                        record.latitude, record.longitude = current.latitude, current.longitude
+                        record.moved_at = current.moved_at
+                if current is None or current.key() != record.key():
+                    self._put_locked(record)
+                    drift += 1
+            self.loaded = True
+        return drift
+
+    def upsert(self, truck: Truck) -> None:
+        """Write-through from a freshly loaded or committed Truck row"""
+        record = self._record_from_row(
+            truck.id, truck.vehicle_type_id, truck.truck_owner_id, truck.vehicle_number,
+            truck.current_location, truck.latitude, truck.longitude, truck.is_available, truck.status
+        )
+        record.touched_at = time.monotonic()
+        with self._lock:
+            self._put_locked(record)
+
+    def remove(self, truck_id) -> None:
+        with self._lock:
+            record = self._records.pop(str(truck_id), None)
+            if record is not None:
+                self._unindex_locked(record)
+
+    def move(self, truck_id, latitude: float, longitude: float) -> bool:
+        """Update a truck's position from a GPS report; returns False for trucks not in the pool"""
+        with self._lock:
+            record = self._records.get(str(truck_id))
+            if record is None:
+                return False
+            record.latitude = latitude
+            record.longitude = longitude
+            record.moved_at = time.monotonic()
+            if record.available:
+                partition = self._partitions.get(record.vehicle_type_id)
+                if partition is not None:
+                    partition.geo.upsert(record.id, latitude, longitude)
+            return True
+
+    def mark_assigned(self, truck_id, assigned_at: Optional[datetime] = None) -> None:
+        """Take a truck out of the available pool after it was claimed for a booking"""
+        with self._lock:
+            record = self._records.get(str(truck_id))
+            if record is None:
+                return
+            self._unindex_locked(record)
+            record.available = False
+            record.touched_at = time.monotonic()
+            record.last_assigned_ts = _timestamp(assigned_at) if assigned_at is not None else time.time()
+
+    def mark_available(self, truck_id) -> None:
+        """Return a truck to the available pool after its booking ended"""
+        with self._lock:
+            record = self._records.get(str(truck_id))
+            if record is None or record.available:
+                return
+            record.available = True
+            record.touched_at = time.monotonic()
+            self._index_locked(record)
+
+    def record_completed_trip(self, truck_id, customer_id) -> None:
+        """Count a completed booking towards the truck's trips and the customer's known owners"""
+        with self._lock:
+            record = self._records.get(str(truck_id))
+            if record is None:
+                return
+            record.completed_trips += 1
+            self._customer_owners.setdefault(str(customer_id), set()).add(record.owner_id)
+
+    def record_owner_rating(self, owner_id, rating: int) -> None:
+        """Fold a new rating into the owner's running average"""
+        owner_id = str(owner_id)
+        with self._lock:
+            count, total = self._owner_ratings.get(owner_id, (0, 0))
+            count, total = count + 1, total + int(rating)
+            self._owner_ratings[owner_id] = (count, total)
+            # Ratings are rare next to bookings, so copying the average onto the
+            # owner's records with a scan keeps scoring free of lookups
+            for record in self._records.values():
+                if record.owner_id == owner_id:
+                    record.owner_rating = total / count
+
+    def owner_rating(self, owner_id) -> Optional[float]:
+        """Average rating received by a truck owner, None when unrated"""
+        return self._owner_average_locked(str(owner_id))
+
+    def customer_owners(self, customer_id) -> Set[str]:
+        """Owners whose trucks completed earlier bookings for this customer"""
+        return self._customer_owners.get(str(customer_id), set())
+
+    def as_record(self, truck: Union[TruckRecord, Truck]) -> TruckRecord:
+        """The pool's record for a candidate truck, or a detached one for trucks the pool does not hold"""
+        if isinstance(truck, TruckRecord):
+            return truck
+        record = self._records.get(str(truck.id))
+        if record is None:
+            record = self._record_from_row(
+                truck.id, truck.vehicle_type_id, truck.truck_owner_id, truck.vehicle_number,
+                truck.current_location, truck.latitude, truck.longitude, truck.is_available, truck.status
+            )
+            record.owner_rating = self.owner_rating(record.owner_id)
+        return record
+
+    def get(self, truck_id) -> Optional[TruckRecord]:
+        return self._records.get(str(truck_id))
+
+    def available(self, vehicle_type_id=None) -> List[TruckRecord]:
+        """All available trucks of a vehicle type, or of every type when it is None"""
+        with self._lock:
+            if vehicle_type_id is None:
+                return [record for partition in self._partitions.values() for record in partition.records.values()]
+            partition = self._partitions.get(str(vehicle_type_id))
+            return list(partition.records.values()) if partition else []
+
+    def nearest(
+        self, vehicle_type_id, lat, lon, k: int = 10, radius_km: float = 50.0
+    ) -> List[Tuple[TruckRecord, float]]:
+        """Return up to ``k`` ``(record, distance_km)`` pairs of the given vehicle type, closest first"""
+        with self._lock:
+            partition = self._partitions.get(str(vehicle_type_id))
+            if partition is None:
+                return []
+            return [
+                (partition.records[truck_id], distance)
+                for truck_id, distance in partition.geo.nearest(lat, lon, k=k, radius_km=radius_km)
+            ]
+
+
+truck_pool = TruckPool(settings.TRUCK_INDEX_CELL_DEG)
+
+
+def reconcile_truck_pool() -> int:
+    with SessionLocal() as db:
+        return truck_pool.reconcile(db)
+
+
+async def truck_pool_reconcile_loop() -> None:
+    """Periodically correct drift between the pool and the trucks table"""
+    while True:
+        await asyncio.sleep(settings.TRUCK_POOL_RECONCILE_SECONDS)
+        try:
+            drift = await asyncio.to_thread(reconcile_truck_pool)
+            if drift:
+                logger.info("Truck pool reconciled", drifted_trucks=drift)
+        except Exception as e:
+            logger.error(f"Truck pool reconcile failed: {e}")
@@ -0,0 +1,164 @@
+import time
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from backend.config import settings
+from backend.services.truck_pool import truck_pool, TruckPool, TruckRecord
+from backend.utils.distance_calculator import DistanceCalculator
+
+# Idle time after which a truck counts as fully rested
+IDLE_SATURATION_HOURS = 24.0
+
+# Signal value used when a candidate has no data for a signal
+NEUTRAL = 0.5
+
+
+class CandidateFeatures:
+    """Per-candidate inputs to the scoring signals, one float64 array per feature"""
+
+    __slots__ = ("distance_km", "idle_hours", "completed_trips", "owner_rating", "preferred_owner")
+
+    def __init__(self, distance_km, idle_hours, completed_trips, owner_rating, preferred_owner):
+        self.distance_km = distance_km
+        self.idle_hours = idle_hours
+        self.completed_trips = completed_trips
+        self.owner_rating = owner_rating
+        self.preferred_owner = preferred_owner
+
+    def __len__(self) -> int:
+        return len(self.distance_km)
+
+
+_owner_id = attrgetter("owner_id")
+
+
+def _column(records: List[TruckRecord], name: str) -> np.ndarray:
+    """One attribute of every record as float64, None becoming NaN"""
+    return np.array(list(map(attrgetter(name), records)), dtype=np.float64)
+
+
+# A signal maps the features of all candidates to one score in [0, 1] each, higher is better
+ScoringSignal = Callable[[CandidateFeatures], np.ndarray]
+
+
+def distance_signal(features: CandidateFeatures) -> np.ndarray:
+    """Closer to the material source is better; unknown distances are neutral"""
+    score = 1.0 - features.distance_km / settings.TRUCK_MATCH_RADIUS_KM
+    np.clip(score, 0.0, 1.0, out=score)
+    score[np.isnan(features.distance_km)] = NEUTRAL
+    return score
+
+
+def idle_time_signal(features: CandidateFeatures) -> np.ndarray:
+    """Trucks that have waited longer since their last booking go first; never-booked trucks count as rested"""
+    return np.minimum(features.idle_hours / IDLE_SATURATION_HOURS, 1.0)
+
+
+def least_used_signal(features: CandidateFeatures) -> np.ndarray:
+    """Spread work across the fleet by preferring trucks with fewer completed trips"""
+    return 1.0 / (1.0 + features.completed_trips)
+
+
+def owner_rating_signal(features: CandidateFeatures) -> np.ndarray:
+    """Average 1-5 star rating of the truck owner; unrated owners are neutral"""
+    score = (features.owner_rating - 1.0) / 4.0
+    score[np.isnan(features.owner_rating)] = NEUTRAL
+    return score
+
+
+def preferred_owner_signal(features: CandidateFeatures) -> np.ndarray:
+    """Owners who already completed trips for this customer"""
+    return features.preferred_owner
+
+
+DEFAULT_SIGNALS: Dict[str, ScoringSignal] = {
+    "distance": distance_signal,
+    "idle_time": idle_time_signal,
+    "least_used": least_used_signal,
+    "owner_rating": owner_rating_signal,
+    "preferred_owner": preferred_owner_signal,
+}
+
+
+class TruckScorer:
+    """Ranks candidate trucks by a weighted sum of scoring signals.
+
+    Features come from the candidates themselves and the truck pool's
+    precomputed statistics, and every signal is evaluated over all
+    candidates at once with numpy. Signals can be added with ``register``
+    and re-weighted through ``TRUCK_SCORE_WEIGHTS``; a signal without a
+    weight is ignored.
+    """
+
+    def __init__(self, weights: Dict[str, float], pool: TruckPool = truck_pool):
+        self.weights = dict(weights)
+        self.pool = pool
+        self.signals: Dict[str, ScoringSignal] = dict(DEFAULT_SIGNALS)
+
+    def register(self, name: str, signal: ScoringSignal, weight: float) -> None:
+        self.signals[name] = signal
+        self.weights[name] = weight
+
+    def features(
+        self, candidates: Sequence, origin: Optional[Tuple[float, float]] = None, customer_id=None,
+        distances: Optional[Sequence[float]] = None
+    ) -> CandidateFeatures:
+        """Build the feature arrays for candidates (pool records or Truck rows).
+
+        ``distances`` from a geo lookup are used as is; otherwise they are
+        computed from ``origin``.
+        """
+        as_record = self.pool.as_record
+        records = [truck if type(truck) is TruckRecord else as_record(truck) for truck in candidates]
+        count = len(records)
+
+        if distances is not None:
+            distance_km = np.array(distances, dtype=np.float64)
+        elif origin is not None and origin[0] is not None and origin[1] is not None:
+            distance_km = DistanceCalculator.distances_from(
+                origin[0], origin[1], _column(records, "latitude"), _column(records, "longitude")
+            )
+        else:
+            distance_km = np.full(count, np.nan)
+
+        # Never-booked trucks count as rested
+        idle_hours = (time.time() - _column(records, "last_assigned_ts")) / 3600.0
+        idle_hours[np.isnan(idle_hours)] = IDLE_SATURATION_HOURS
+        np.maximum(idle_hours, 0.0, out=idle_hours)
+
+        preferred = self.pool.customer_owners(customer_id) if customer_id is not None else None
+        if preferred:
+            preferred_owner = np.fromiter(map(preferred.__contains__, map(_owner_id, records)), np.float64, count)
+        else:
+            preferred_owner = np.zeros(count)
+
+        return CandidateFeatures(
+            distance_km=distance_km,
+            idle_hours=idle_hours,
+            completed_trips=_column(records, "completed_trips"),
+            owner_rating=_column(records, "owner_rating"),
+            preferred_owner=preferred_owner
+        )
+
+    def scores(self, features: CandidateFeatures) -> np.ndarray:
+        total = np.zeros(len(features))
+        for name, weight in self.weights.items():
+            signal = self.signals.get(name)
+            if signal is not None and weight:
+                total += weight * signal(features)
+        return total
+
+    def rank(
+        self, candidates: Sequence, origin: Optional[Tuple[float, float]] = None, customer_id=None,
+        distances: Optional[Sequence[float]] = None
+    ) -> List:
+        """Candidates ordered best first"""
+        if len(candidates) <= 1:
+            return list(candidates)
+        scores = self.scores(self.features(candidates, origin, customer_id, distances))
+        # Stable sort keeps the incoming (nearest first) order between equal scores
+        order = np.argsort(-scores, kind="stable")
+        return [candidates[i] for i in order.tolist()]
+
+
+truck_scorer = TruckScorer(settings.TRUCK_SCORE_WEIGHTS)
@@ -1,72 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from backend.database import get_db
-from backend.schemas import TruckCreate, TruckResponse, TruckUpdate
+from backend.database import get_async_db
+from backend.schemas import TruckCreate, TruckResponse, TruckUpdate, LocationBatch, LocationBatchResponse
+from backend.config import settings
+from backend.core.exceptions import TruckNotFoundException, ValidationException
+from backend.core.read_replicas import get_async_read_db
 from backend.core.security import get_current_active_user
 from backend.models.user import User, UserRole
 from backend.models.truck import Truck, TruckStatus
-from backend.services.booking_service import BookingService
+from backend.services.location_ingest import location_ingestor
+from backend.services.truck_pool import truck_pool
+from backend.utils.pagination import PageParams, keyset_page_async, set_next_cursor
 
 router = APIRouter(prefix="/api/v1/trucks", tags=["Trucks"])
 
 # GET /trucks - List all trucks (Admin only)
 @router.get("/", response_model=List[TruckResponse])
-def get_trucks(
+async def get_trucks(
+    response: Response,
     status: Optional[TruckStatus] = None,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all trucks (Admin only)"""
+    """Get trucks newest first (Admin only); the next page's cursor is in X-Next-Cursor"""
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Only admins can view all trucks")
     
-    query = db.query(Truck)
+    statement = select(Truck)
     if status:
-        query = query.filter(Truck.status == status)
+        statement = statement.where(Truck.status == status)
     
-    trucks = query.all()
+    trucks, next_cursor = await keyset_page_async(db, statement, Truck, page)
+    set_next_cursor(response, next_cursor)
     return trucks
 
+# POST /trucks/locations - Report GPS positions in bulk
+@router.post("/locations", response_model=LocationBatchResponse, status_code=status.HTTP_202_ACCEPTED)
+async def report_locations(
+    batch: LocationBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Accept up to TRUCK_LOCATION_BATCH_MAX GPS pings of the current owner's trucks (any truck for admins).
+
+    Positions are visible to truck matching immediately and written to the database within TRUCK_LOCATION_FLUSH_SECONDS.
+    """
+    if len(batch.pings) > settings.TRUCK_LOCATION_BATCH_MAX:
+        raise ValidationException(f"At most {settings.TRUCK_LOCATION_BATCH_MAX} pings can be reported at once")
+
+    owners = await _truck_owners(db, {ping.truck_id for ping in batch.pings})
+    for truck_id, owner_id in owners.items():
+        if owner_id is None:
+            raise TruckNotFoundException(truck_id)
+        if current_user.role != UserRole.ADMIN and owner_id != str(current_user.id):
+            raise HTTPException(status_code=403, detail="Not authorized to report locations of this truck")
+
+    moved = location_ingestor.ingest(batch.pings)
+    return LocationBatchResponse(accepted=len(batch.pings), trucks_moved=moved)
+
+async def _truck_owners(db: AsyncSession, truck_ids) -> dict:
+    """Owner id of each truck (None for unknown trucks), from the truck pool where possible"""
+    owners = {}
+    for truck_id in truck_ids:
+        record = truck_pool.get(truck_id)
+        owners[truck_id] = record.owner_id if record is not None else None
+    missing = [truck_id for truck_id, owner_id in owners.items() if owner_id is None]
+    if missing:
+        rows = await db.execute(select(Truck.id, Truck.truck_owner_id).where(Truck.id.in_(missing)))
+        for truck_id, owner_id in rows:
+            owners[str(truck_id)] = str(owner_id)
+    return owners
+
 # GET /trucks/:id - Get truck details
 @router.get("/{truck_id}", response_model=TruckResponse)
-def get_truck(
+async def get_truck(
     truck_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get truck details"""
-    truck = db.query(Truck).filter(Truck.id == truck_id).first()
+    truck = await db.get(Truck, truck_id)
     if not truck:
         raise HTTPException(status_code=404, detail="Truck not found")
     
     # Check if user is authorized to view this truck
-    if truck.truck_owner_id != current_user.id and current_user.role != UserRole.ADMIN:
+    if str(truck.truck_owner_id) != str(current_user.id) and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized to view this truck")
     
     return truck
 
 # GET /truck-owners/:id/trucks - List all trucks under an owner
 @router.get("/owner/{truck_owner_id}", response_model=List[TruckResponse])
-def get_truck_owner_trucks(
+async def get_truck_owner_trucks(
     truck_owner_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all trucks under a truck owner"""
     # Check if user is authorized to view these trucks
-    if truck_owner_id != current_user.id and current_user.role != UserRole.ADMIN:
+    if truck_owner_id != str(current_user.id) and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized to view these trucks")
     
-    service = BookingService(db)
-    trucks = service.get_truck_owner_trucks(truck_owner_id)
-    return trucks
+    result = await db.execute(select(Truck).where(Truck.truck_owner_id == truck_owner_id))
+    return result.scalars().all()
 
 # POST /trucks - Create new truck (Truck Owner only)
 @router.post("/", response_model=TruckResponse, status_code=status.HTTP_201_CREATED)
-def create_truck(
+async def create_truck(
     truck_data: TruckCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Create a new truck (Truck Owner only)"""
@@ -79,50 +124,53 @@ def create_truck(
     
     truck = Truck(**truck_data_dict)
     db.add(truck)
-    db.commit()
-    db.refresh(truck)
+    await db.commit()
+    await db.refresh(truck)
+    truck_pool.upsert(truck)
     return truck
 
 # PUT /trucks/:id - Update truck
 @router.put("/{truck_id}", response_model=TruckResponse)
-def update_truck(
+async def update_truck(
     truck_id: str,
     truck_data: TruckUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update truck"""
-    truck = db.query(Truck).filter(Truck.id == truck_id).first()
+    truck = await db.get(Truck, truck_id)
     if not truck:
         raise HTTPException(status_code=404, detail="Truck not found")
     
     # Check if user is authorized to update this truck
-    if truck.truck_owner_id != current_user.id and current_user.role != UserRole.ADMIN:
+    if str(truck.truck_owner_id) != str(current_user.id) and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized to update this truck")
     
     for field, value in truck_data.dict(exclude_unset=True).items():
         setattr(truck, field, value)
     
-    db.commit()
-    db.refresh(truck)
+    await db.commit()
+    await db.refresh(truck)
+    truck_pool.upsert(truck)
     return truck
 
 # DELETE /trucks/:id - Delete truck
 @router.delete("/{truck_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_truck(
+async def delete_truck(
     truck_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Delete truck"""
-    truck = db.query(Truck).filter(Truck.id == truck_id).first()
+    truck = await db.get(Truck, truck_id)
     if not truck:
         raise HTTPException(status_code=404, detail="Truck not found")
     
     # Check if user is authorized to delete this truck
-    if truck.truck_owner_id != current_user.id and current_user.role != UserRole.ADMIN:
+    if str(truck.truck_owner_id) != str(current_user.id) and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized to delete this truck")
     
-    db.delete(truck)
-    db.commit()
+    await db.delete(truck)
+    await db.commit()
+    truck_pool.remove(truck_id)
     return None 
\ No newline at end of file
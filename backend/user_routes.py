@@ -1,27 +1,28 @@
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import ValidationError
 from typing import List, Optional
 
-from backend.database import get_db
+from backend.database import get_async_db, request_user_id
 from backend.services.auth_service import AuthService
 from backend.models.user import User, UserRole, TruckOwnerProfile, CustomerProfile
 from backend.schemas.user import (
     UserCreate, UserResponse, UserLogin, TokenResponse, UserUpdate,
     TruckOwnerProfileCreate, TruckOwnerProfileResponse, CustomerProfileCreate, CustomerProfileResponse
 )
-from backend.core.security import get_current_active_user, get_password_hash
+from backend.core.read_replicas import get_async_read_db
+from backend.core.security import get_current_active_user, get_password_hash_async
 from backend.core.exceptions import UserNotFoundException, ValidationException
 
 router = APIRouter(prefix="/api/v1/users", tags=["Users"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(
+async def register_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         print(f"Received registration data: {user_data}")  # Debug log
@@ -39,34 +40,36 @@ def register_user(
         print(f"Password extracted: {password}")  # Debug log
         
         # Add required fields
-        user_dict['password_hash'] = get_password_hash(password)
+        user_dict['password_hash'] = await get_password_hash_async(password)
         user_dict['id'] = str(uuid.uuid4())  # Generate new UUID
         
         print(f"Final user dict: {user_dict}")  # Debug log
         
+        # The new user's first reads go to the primary, like after any of their own writes
+        request_user_id.set(user_dict['id'])
+        
         # Create the user using the service
         service = AuthService(db)
-        user = service.register_user(user_dict)
-        db.commit()
+        user = await service.register_user(user_dict)
         
         # Convert user to response model
         return UserResponse.from_orm(user)
     except ValidationError as e:
-        db.rollback()
+        await db.rollback()
         print(f"Validation error: {str(e)}")  # Debug log
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         print(f"Database error: {str(e)}")  # Debug log
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error: {str(e)}"
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Unexpected error: {str(e)}")  # Debug log
         import traceback
         traceback.print_exc()  # Print full traceback
@@ -77,82 +80,95 @@ def register_user(
 
 
 @router.post("/login", response_model=TokenResponse)
-def login_for_access_token(
+async def login_for_access_token(
     login_data: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     service = AuthService(db)
-    token = service.login_user(login_data)
+    token = await service.login_user(login_data)
     return token
 
 
 @router.get("/me", response_model=UserResponse)
-def read_users_me(
+async def read_users_me(
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    return current_user
+    return await AuthService(db).get_user(current_user.id)
 
 
 @router.patch("/me", response_model=UserResponse)
-def update_users_me(
+async def update_users_me(
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     service = AuthService(db)
-    updated_user = service.update_user(current_user.id, user_update)
+    updated_user = await service.update_user(current_user.id, user_update)
     return updated_user
 
 
 @router.post("/me/truck_owner_profile", response_model=TruckOwnerProfileResponse, status_code=status.HTTP_201_CREATED)
-def create_my_truck_owner_profile(
+async def create_my_truck_owner_profile(
     profile_data: TruckOwnerProfileCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     if current_user.role != UserRole.TRUCK_OWNER:
         raise HTTPException(status_code=403, detail="Only truck owners can create this profile")
     service = AuthService(db)
-    profile = service.create_truck_owner_profile(current_user.id, profile_data)
+    profile = await service.create_truck_owner_profile(current_user.id, profile_data)
     return profile
 
 
 @router.post("/me/customer_profile", response_model=CustomerProfileResponse, status_code=status.HTTP_201_CREATED)
-def create_my_customer_profile(
+async def create_my_customer_profile(
     profile_data: CustomerProfileCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     if current_user.role != UserRole.CUSTOMER:
         raise HTTPException(status_code=403, detail="Only customers can create this profile")
     service = AuthService(db)
-    profile = service.create_customer_profile(current_user.id, profile_data)
+    profile = await service.create_customer_profile(current_user.id, profile_data)
     return profile
 
 
 @router.get("/me/truck_owner_profile", response_model=TruckOwnerProfileResponse)
-def get_my_truck_owner_profile(
-    db: Session = Depends(get_db),
+async def get_my_truck_owner_profile(
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     if current_user.role != UserRole.TRUCK_OWNER:
         raise HTTPException(status_code=403, detail="Only truck owners have this profile")
     service = AuthService(db)
-    profile = service.get_truck_owner_profile(current_user.id)
+    profile = await service.get_truck_owner_profile(current_user.id)
     if not profile:
         raise UserNotFoundException("Truck owner profile not found")
     return profile
 
 
 @router.get("/me/customer_profile", response_model=CustomerProfileResponse)
-def get_my_customer_profile(
-    db: Session = Depends(get_db),
+async def get_my_customer_profile(
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     if current_user.role != UserRole.CUSTOMER:
         raise HTTPException(status_code=403, detail="Only customers have this profile")
     service = AuthService(db)
-    profile = service.get_customer_profile(current_user.id)
+    profile = await service.get_customer_profile(current_user.id)
     if not profile:
         raise UserNotFoundException("Customer profile not found")
-    return profile 
\ No newline at end of file
+    return profile
+
+
+@router.post("/{user_id}/deactivate", response_model=UserResponse)
+async def deactivate_user(
+    user_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Deactivate a user account (Admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can deactivate users")
+    return await AuthService(db).deactivate_user(user_id)
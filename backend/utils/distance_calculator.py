@@ -1,7 +1,51 @@
+import math
+import numpy as np
+
+# Mean Earth radius used for all great-circle distances
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _as_radians(values) -> np.ndarray:
+    """Contiguous float64 array of the given degrees, in radians"""
+    return np.radians(np.ascontiguousarray(values, dtype=np.float64))
+
+
+def _haversine(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distances in kilometres between points given in radians, broadcast like numpy operands"""
+    a = np.sin((lat2 - lat1) * 0.5) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) * 0.5) ** 2
+    # Rounding can push a slightly above 1 for antipodal points
+    a = np.minimum(a, 1.0)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
 class DistanceCalculator:
     @staticmethod
     def haversine_distance(lat1, lon1, lat2, lon2):
-        """Placeholder for Haversine distance calculation."""
-        # This is a placeholder. You'll need to implement the actual Haversine formula here.
-        # For now, it returns a dummy distance.
-        return 0.0 # Return 0 for testing purposes or implement actual formula 
\ No newline at end of file
+        """Great-circle distance in kilometres between two lat/long points."""
+        return float(_haversine(*map(math.radians, (float(lat1), float(lon1), float(lat2), float(lon2)))))
+
+    @staticmethod
+    def distances_from(lat, lon, lats, lons) -> np.ndarray:
+        """Distances in kilometres from one origin to each of N points.
+
+        ``lats`` and ``lons`` are array-likes of length N; the result is a
+        float64 array of length N.
+        """
+        return _haversine(math.radians(float(lat)), math.radians(float(lon)), _as_radians(lats), _as_radians(lons))
+
+    @staticmethod
+    def distance_matrix(lats1, lons1, lats2, lons2) -> np.ndarray:
+        """M x N matrix of distances in kilometres between two point sets.
+
+        Row ``i`` holds the distances from point ``i`` of the first set to every
+        point of the second set.
+        """
+        return _haversine(
+            _as_radians(lats1)[:, np.newaxis], _as_radians(lons1)[:, np.newaxis],
+            _as_radians(lats2)[np.newaxis, :], _as_radians(lons2)[np.newaxis, :]
+        )
+
+    @staticmethod
+    def pairwise_distances(lats1, lons1, lats2, lons2) -> np.ndarray:
+        """Element-wise distances in kilometres between two equal-length point arrays"""
+        return _haversine(_as_radians(lats1), _as_radians(lons1), _as_radians(lats2), _as_radians(lons2))
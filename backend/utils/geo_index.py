@@ -0,0 +1,125 @@
+import math
+import numpy as np
+from typing import Dict, Hashable, List, Optional, Tuple
+from backend.utils.distance_calculator import DistanceCalculator, EARTH_RADIUS_KM
+
+# Length of one degree of latitude in kilometres
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) of a box containing every point within ``radius_km``"""
+    delta_lat = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(min(89.9, abs(lat) + delta_lat)))
+    delta_lon = min(180.0, radius_km / (KM_PER_DEGREE * cos_lat))
+    return lat - delta_lat, lat + delta_lat, lon - delta_lon, lon + delta_lon
+
+
+class GeoGridIndex:
+    """Uniform lat/long grid of keyed points for radius and k-nearest lookups.
+
+    Points are bucketed into square cells of ``cell_size_deg`` degrees. A query
+    walks rings of cells outwards from the query cell and stops as soon as no
+    unvisited cell can hold a point closer than the current k-th result.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.1):
+        self.cell_size_deg = cell_size_deg
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, Tuple[float, float]]] = {}
+        self._positions: Dict[Hashable, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_size_deg), math.floor(lon / self.cell_size_deg))
+
+    def upsert(self, key: Hashable, lat: float, lon: float) -> None:
+        """Insert a point or move an existing one"""
+        lat, lon = float(lat), float(lon)
+        self.remove(key)
+        self._cells.setdefault(self._cell(lat, lon), {})[key] = (lat, lon)
+        self._positions[key] = (lat, lon)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a point if present"""
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        cell_key = self._cell(*position)
+        cell = self._cells.get(cell_key)
+        if cell is not None:
+            cell.pop(key, None)
+            if not cell:
+                del self._cells[cell_key]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._positions.clear()
+
+    def _ring(self, center: Tuple[int, int], r: int):
+        """Yield the cells at Chebyshev distance ``r`` from ``center``"""
+        cy, cx = center
+        if r == 0:
+            yield center
+            return
+        for dx in range(-r, r + 1):
+            yield (cy - r, cx + dx)
+            yield (cy + r, cx + dx)
+        for dy in range(-r + 1, r):
+            yield (cy + dy, cx - r)
+            yield (cy + dy, cx + r)
+
+    def _min_cell_km(self, lat: float, r: int) -> float:
+        """Smallest cell side (in km) anywhere within ``r`` rings of ``lat``"""
+        worst_lat = min(89.9, abs(lat) + (r + 1) * self.cell_size_deg)
+        return self.cell_size_deg * KM_PER_DEGREE * math.cos(math.radians(worst_lat))
+
+    def nearest(
+        self, lat: float, lon: float, k: int = 1, radius_km: float = 50.0
+    ) -> List[Tuple[Hashable, float]]:
+        """Return up to ``k`` ``(key, distance_km)`` pairs within ``radius_km``, closest first"""
+        if not self._positions or k <= 0:
+            return []
+
+        lat, lon = float(lat), float(lon)
+        center = self._cell(lat, lon)
+        found: List[Tuple[float, Hashable]] = []
+        r = 0
+        while True:
+            keys: List[Hashable] = []
+            lats: List[float] = []
+            lons: List[float] = []
+            for cell_key in self._ring(center, r):
+                cell = self._cells.get(cell_key)
+                if not cell:
+                    continue
+                for key, (plat, plon) in cell.items():
+                    keys.append(key)
+                    lats.append(plat)
+                    lons.append(plon)
+
+            if keys:
+                distances = DistanceCalculator.distances_from(lat, lon, lats, lons)
+                for position in np.flatnonzero(distances <= radius_km):
+                    found.append((float(distances[position]), keys[position]))
+
+            # Every point beyond ring r is at least r cell-widths away
+            lower_bound = r * self._min_cell_km(lat, r)
+            if lower_bound > radius_km:
+                break
+            if len(found) >= k:
+                found.sort(key=lambda item: item[0])
+                del found[k:]
+                if found[-1][0] <= lower_bound:
+                    break
+            r += 1
+
+        found.sort(key=lambda item: item[0])
+        return [(key, distance) for distance, key in found[:k]]
+
+    def position(self, key: Hashable) -> Optional[Tuple[float, float]]:
+        return self._positions.get(key)
@@ -0,0 +1,77 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import Query, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.config import settings
+from backend.core.exceptions import ValidationException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """Opaque token for the position just after a row in (created_at, id) order"""
+    raw = json.dumps([created_at.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(uuid.UUID(row_id))
+    except (ValueError, TypeError, AttributeError):
+        raise ValidationException("Invalid pagination cursor")
+
+
+class PageParams:
+    """``cursor`` and ``limit`` query parameters of a keyset-paginated list endpoint"""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Value of the X-Next-Cursor header of the previous page"),
+        limit: Optional[int] = Query(None, ge=1, description="Page size, capped at PAGE_SIZE_MAX")
+    ):
+        self.cursor = cursor
+        self.limit = min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX)
+
+
+def _keyset_window(query, model, page: PageParams):
+    """``query`` (a Query or a select) narrowed to the rows of one page plus one, newest first"""
+    if page.cursor:
+        created_at, row_id = decode_cursor(page.cursor)
+        query = query.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        ))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(page.limit + 1)
+
+
+def _page_of(rows: List, page: PageParams) -> Tuple[List, Optional[str]]:
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[:page.limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def keyset_page(query, model, page: PageParams) -> Tuple[List, Optional[str]]:
+    """One page of ``query`` in newest-first (created_at, id) order, plus the cursor of the next page.
+
+    Each page is a range scan starting after the previous page's last row, so
+    its cost does not grow with how deep the client has paged.
+    """
+    return _page_of(_keyset_window(query, model, page).all(), page)
+
+
+async def keyset_page_async(db: AsyncSession, statement, model, page: PageParams) -> Tuple[List, Optional[str]]:
+    """keyset_page for a select() run on an AsyncSession"""
+    result = await db.execute(_keyset_window(statement, model, page))
+    return _page_of(list(result.unique().scalars().all()), page)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -1,4 +1,6 @@
 import uuid
+from sqlalchemy import String, func, literal
+
 
 def uuid_to_str(obj):
     if isinstance(obj, dict):
@@ -22,4 +24,13 @@ def uuid_to_str(obj):
             else:
                 result[key] = uuid_to_str(value)
         return result
-    return obj 
\ No newline at end of file
+    return obj 
+
+
+def dashed_uuid(column):
+    """SQL expression turning a bare-hex UUIDType column into the dashed form stored in users.id"""
+    parts = [func.substr(column, start, length, type_=String) for start, length in ((1, 8), (9, 4), (13, 4), (17, 4), (21, 12))]
+    expression = parts[0]
+    for part in parts[1:]:
+        expression = expression + literal("-") + part
+    return expression
@@ -1,28 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from backend.database import get_db
-from backend.schemas import VehicleTypeCreate, VehicleTypeResponse, VehicleTypeUpdate
+from backend.core.read_replicas import get_read_db
+from backend.schemas import (
+    VehicleTypeCreate, VehicleTypeResponse, VehicleTypeUpdate, FreightTariffUpdate, FreightTariffResponse
+)
 from backend.core.security import get_current_active_user
 from backend.models.user import User, UserRole
-from backend.models.vehicle_type import VehicleType
+from backend.models.vehicle_type import VehicleType, FreightTariff
+from backend.services.quote_service import pricing_cache
+from backend.utils.pagination import PageParams, keyset_page, set_next_cursor
 
 router = APIRouter(prefix="/api/v1/vehicle-types", tags=["Vehicle Types"])
 
 # GET /vehicle-types - List all vehicle types (Public)
 @router.get("/", response_model=List[VehicleTypeResponse])
 def get_vehicle_types(
-    db: Session = Depends(get_db)
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db)
 ):
-    """Get all vehicle types (Public)"""
-    vehicle_types = db.query(VehicleType).all()
+    """Get vehicle types newest first (Public); the next page's cursor is in X-Next-Cursor"""
+    vehicle_types, next_cursor = keyset_page(db.query(VehicleType), VehicleType, page)
+    set_next_cursor(response, next_cursor)
     return vehicle_types
 
 # GET /vehicle-types/:id - Get vehicle type details (Public)
 @router.get("/{vehicle_type_id}", response_model=VehicleTypeResponse)
 def get_vehicle_type(
     vehicle_type_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get vehicle type details (Public)"""
     vehicle_type = db.query(VehicleType).filter(VehicleType.id == vehicle_type_id).first()
@@ -67,6 +75,7 @@ def update_vehicle_type(
         setattr(vehicle_type, field, value)
     
     db.commit()
+    pricing_cache.invalidate()
     db.refresh(vehicle_type)
     return vehicle_type
 
@@ -87,4 +96,45 @@ def delete_vehicle_type(
     
     db.delete(vehicle_type)
     db.commit()
-    return None 
\ No newline at end of file
+    pricing_cache.invalidate()
+    return None
+
+# GET /vehicle-types/:id/tariff - Get freight tariff (Public)
+@router.get("/{vehicle_type_id}/tariff", response_model=FreightTariffResponse)
+def get_freight_tariff(
+    vehicle_type_id: str,
+    db: Session = Depends(get_read_db)
+):
+    """Get the freight tariff of a vehicle type (Public)"""
+    tariff = db.query(FreightTariff).filter(FreightTariff.vehicle_type_id == vehicle_type_id).first()
+    if not tariff:
+        raise HTTPException(status_code=404, detail="Freight tariff not found")
+    return tariff
+
+# PUT /vehicle-types/:id/tariff - Set freight tariff (Admin only)
+@router.put("/{vehicle_type_id}/tariff", response_model=FreightTariffResponse)
+def set_freight_tariff(
+    vehicle_type_id: str,
+    tariff_data: FreightTariffUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create or replace the freight tariff of a vehicle type (Admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can set freight tariffs")
+    
+    vehicle_type = db.query(VehicleType).filter(VehicleType.id == vehicle_type_id).first()
+    if not vehicle_type:
+        raise HTTPException(status_code=404, detail="Vehicle type not found")
+    
+    tariff = vehicle_type.tariff
+    if tariff is None:
+        tariff = FreightTariff(vehicle_type_id=vehicle_type.id)
+        db.add(tariff)
+    for field, value in tariff_data.model_dump().items():
+        setattr(tariff, field, value)
+    
+    db.commit()
+    pricing_cache.invalidate()
+    db.refresh(tariff)
+    return tariff 
\ No newline at end of file
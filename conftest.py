@@ -0,0 +1,174 @@
+"""
+Shared pytest fixtures: a throwaway SQLite database with the full schema and seed helpers
+"""
+import asyncio
+import sys
+import os
+import uuid
+from datetime import datetime
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base
+from backend.models import *
+from backend.models.material import MaterialType
+from backend.models.truck import TruckStatus
+from backend.models.user_role import UserRole
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """File-backed SQLite engine so several threads can use their own connections"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'mudline.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(sqlite_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def run_async():
+    """Run coroutines to completion on one event loop kept for the whole test"""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+@pytest.fixture
+def async_engine(sqlite_engine, run_async):
+    """aiosqlite engine on the same database file, for the async routes' services"""
+    engine = create_async_engine(sqlite_engine.url.set(drivername="sqlite+aiosqlite"), connect_args={"timeout": 30})
+    yield engine
+    # Disposed on the loop its connections were opened on
+    run_async(engine.dispose())
+
+
+@pytest.fixture
+def async_session_factory(async_engine):
+    """Sessions configured like AsyncSessionLocal; run them with run_async"""
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+class QueryCounter:
+    """Counts statements and commits issued on an engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+        self.commits = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _on_commit(self, conn):
+        self.commits += 1
+
+    @property
+    def queries(self):
+        return len(self.statements)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        event.listen(self.engine, "commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        event.remove(self.engine, "commit", self._on_commit)
+
+
+def make_user(db, role=UserRole.CUSTOMER):
+    user = User(
+        id=str(uuid.uuid4()),
+        email=f"{uuid.uuid4().hex[:8]}@example.com",
+        phone="9999999999",
+        first_name="Test",
+        last_name="User",
+        password_hash="x",
+        role=role
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def make_vehicle_type(db, capacity_ton=30):
+    vehicle_type = VehicleType(name=f"{capacity_ton} TON", capacity_ton=Decimal(capacity_ton))
+    db.add(vehicle_type)
+    db.commit()
+    return vehicle_type
+
+
+def make_material_source(db, latitude=None, longitude=None, location="Dumka", price_per_unit=1200):
+    material_type = db.query(MaterialTypeModel).filter(MaterialTypeModel.type == MaterialType.SAND).first()
+    if material_type is None:
+        material_type = MaterialTypeModel(type=MaterialType.SAND)
+        db.add(material_type)
+        db.flush()
+    source = MaterialSource(
+        material_type_id=material_type.id,
+        source_name=f"{location} Quarry",
+        location=location,
+        city=location,
+        latitude=latitude,
+        longitude=longitude,
+        price_per_unit=Decimal(price_per_unit)
+    )
+    db.add(source)
+    db.commit()
+    return source
+
+
+def make_truck(db, vehicle_type, owner, latitude=None, longitude=None, location="Dumka"):
+    truck = Truck(
+        vehicle_number=f"JH{uuid.uuid4().hex[:8].upper()}",
+        vehicle_type_id=vehicle_type.id,
+        truck_owner_id=owner.id,
+        driver_name="Driver",
+        driver_contact="9999999999",
+        current_location=location,
+        latitude=latitude,
+        longitude=longitude,
+        is_available=True,
+        status=TruckStatus.AVAILABLE
+    )
+    db.add(truck)
+    db.commit()
+    return truck
+
+
+def make_booking(db, user, source, vehicle_type, quantity=10, booking_time=None):
+    booking = Booking(
+        user_id=user.id,
+        material_source_id=source.id,
+        destination="Patna",
+        vehicle_type_id=vehicle_type.id,
+        quantity=Decimal(quantity),
+        booking_time=booking_time or datetime.utcnow()
+    )
+    db.add(booking)
+    db.commit()
+    return booking
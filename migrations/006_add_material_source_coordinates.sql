@@ -0,0 +1,18 @@
+-- Migration 006: Add coordinates to material_sources
+-- Truck matching looks up the nearest available trucks around the material source,
+-- so each source needs a latitude/longitude pair
+
+ALTER TABLE material_sources ADD COLUMN latitude DECIMAL(10, 8) AFTER pincode;
+ALTER TABLE material_sources ADD COLUMN longitude DECIMAL(11, 8) AFTER latitude;
+
+-- Backfill approximate coordinates for the seeded sources
+UPDATE material_sources SET latitude = 24.26720000, longitude = 87.24880000 WHERE location = 'Dumka';
+UPDATE material_sources SET latitude = 24.16500000, longitude = 87.78500000 WHERE location = 'Rampurhat';
+UPDATE material_sources SET latitude = 24.48200000, longitude = 86.69500000 WHERE location = 'Devipur';
+UPDATE material_sources SET latitude = 24.63370000, longitude = 87.84970000 WHERE location = 'Pakur';
+UPDATE material_sources SET latitude = 25.22500000, longitude = 87.24000000 WHERE location = 'Mirza Chawki';
+UPDATE material_sources SET latitude = 24.80700000, longitude = 85.01300000 WHERE location = 'Tapowan Hill';
+UPDATE material_sources SET latitude = 24.88670000, longitude = 85.54350000 WHERE location = 'Nawada';
+UPDATE material_sources SET latitude = 24.91900000, longitude = 86.22400000 WHERE location = 'Jamui';
+UPDATE material_sources SET latitude = 25.17200000, longitude = 86.09400000 WHERE location = 'Lakhisarai';
+UPDATE material_sources SET latitude = 25.59400000, longitude = 85.13760000 WHERE location = 'Sone';
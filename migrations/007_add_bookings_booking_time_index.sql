@@ -0,0 +1,5 @@
+-- Migration 007: Index bookings.booking_time
+-- The booking scheduler reloads pending future-dated bookings at startup and the
+-- dispatchers only pick up bookings that are due, both by booking_time
+
+CREATE INDEX ix_bookings_booking_time ON bookings (booking_time);
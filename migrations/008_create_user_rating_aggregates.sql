@@ -0,0 +1,30 @@
+-- Migration 008: Create user_rating_aggregates
+-- Running rating totals per reviewed user (count, sum and a per-star histogram), updated
+-- in the same transaction as each rating insert so averages never scan the ratings table.
+-- user_id uses the same 32 character hex form as ratings.reviewee_id
+
+CREATE TABLE user_rating_aggregates (
+    user_id CHAR(32) PRIMARY KEY,
+    rating_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    star_1 INT NOT NULL DEFAULT 0,
+    star_2 INT NOT NULL DEFAULT 0,
+    star_3 INT NOT NULL DEFAULT 0,
+    star_4 INT NOT NULL DEFAULT 0,
+    star_5 INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Backfill from existing ratings
+INSERT INTO user_rating_aggregates (user_id, rating_count, rating_sum, star_1, star_2, star_3, star_4, star_5)
+SELECT
+    reviewee_id,
+    COUNT(*),
+    SUM(rating),
+    SUM(rating = 1),
+    SUM(rating = 2),
+    SUM(rating = 3),
+    SUM(rating = 4),
+    SUM(rating = 5)
+FROM ratings
+GROUP BY reviewee_id;
@@ -0,0 +1,16 @@
+-- Migration 009: Composite indexes for the hot access paths
+-- Each of these queries was served by a single-column index at best, leaving the rest
+-- of the filter and the ORDER BY to a row scan or a filesort
+
+-- Available trucks of a vehicle type (truck matching)
+CREATE INDEX ix_trucks_type_status_available ON trucks (vehicle_type_id, status, is_available);
+
+-- A customer's bookings newest first, with and without a status filter (keyset pagination on created_at, id)
+CREATE INDEX ix_bookings_user_status_created ON bookings (user_id, status, created_at, id);
+CREATE INDEX ix_bookings_user_created ON bookings (user_id, created_at, id);
+
+-- Pending bookings in arrival order (dispatch queue recovery and batch dispatch)
+CREATE INDEX ix_bookings_status_created ON bookings (status, created_at);
+
+-- Status history of a booking, newest first
+CREATE INDEX ix_booking_status_history_booking_updated ON booking_status_history (booking_id, updated_at);
@@ -0,0 +1,13 @@
+-- Migration 010: Create truck_location_pings
+-- Raw GPS track of each truck, appended in batches by the location ingestion pipeline.
+-- The primary key clusters each truck's pings in time order; coordinates are integer
+-- microdegrees to keep rows small. truck_id uses the same 32 character hex form as trucks.id
+
+CREATE TABLE truck_location_pings (
+    truck_id CHAR(32) NOT NULL,
+    recorded_at DATETIME(3) NOT NULL,
+    latitude_e6 INT NOT NULL,
+    longitude_e6 INT NOT NULL,
+    PRIMARY KEY (truck_id, recorded_at),
+    FOREIGN KEY (truck_id) REFERENCES trucks(id)
+);
@@ -0,0 +1,15 @@
+-- Migration 011: Create trip_track_segments
+-- GPS trace of each booking's trip, stored as one delta-encoded varint blob per fixed
+-- time window (TRACK_SEGMENT_SECONDS). booking_id uses the same 32 character hex form as bookings.id
+
+CREATE TABLE trip_track_segments (
+    booking_id CHAR(32) NOT NULL,
+    segment_start DATETIME NOT NULL,
+    point_count INT NOT NULL DEFAULT 0,
+    last_offset_ms INT NOT NULL,
+    last_latitude_e6 INT NOT NULL,
+    last_longitude_e6 INT NOT NULL,
+    data MEDIUMBLOB NOT NULL,
+    PRIMARY KEY (booking_id, segment_start),
+    FOREIGN KEY (booking_id) REFERENCES bookings(id)
+);
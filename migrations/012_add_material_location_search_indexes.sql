@@ -0,0 +1,6 @@
+-- Migration 012: Indexes for the nearby material location search
+-- The search filters material_locations on a latitude/longitude bounding box, then joins
+-- location_materials on location_id for the material type and availability
+
+CREATE INDEX ix_material_locations_lat_lon ON material_locations (latitude, longitude);
+CREATE INDEX ix_location_materials_location_type ON location_materials (location_id, material_type, availability_status);
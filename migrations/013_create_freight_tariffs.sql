@@ -0,0 +1,15 @@
+-- Migration 013: Create freight_tariffs
+-- Per-trip freight rates of each vehicle type, used by the quote engine together with
+-- material_sources.price_per_unit. vehicle_type_id uses the same 32 character hex form as vehicle_types.id
+
+CREATE TABLE freight_tariffs (
+    id CHAR(32) NOT NULL PRIMARY KEY,
+    vehicle_type_id CHAR(32) NOT NULL,
+    base_fare DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    rate_per_km DECIMAL(10, 2) NOT NULL,
+    minimum_fare DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_freight_tariffs_vehicle_type (vehicle_type_id),
+    FOREIGN KEY (vehicle_type_id) REFERENCES vehicle_types(id)
+);
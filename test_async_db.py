@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for the async database path used by the routes
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from backend.core.auth_cache import AuthenticatedUser
+from backend.database import async_database_url
+from backend.models.booking import BookingStatus
+from backend.models.user_role import UserRole
+from backend.schemas.booking import BookingCreate
+from backend.schemas.user import UserCreate, UserResponse, UserUpdate
+from backend import user_routes
+from backend.services.booking_service import AsyncBookingService
+from backend.truck_routes import get_truck_owner_trucks
+from backend.material_routes import get_material_sources
+from backend.utils.pagination import PageParams
+from fastapi import Response
+from conftest import make_user, make_vehicle_type, make_material_source, make_truck
+
+
+def test_async_database_url():
+    assert async_database_url("mysql+pymysql://u:p@db/mudline") == "mysql+aiomysql://u:p@db/mudline"
+    assert async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert async_database_url("mysql+aiomysql://u:p@db/mudline") == "mysql+aiomysql://u:p@db/mudline"
+
+
+def test_booking_service_runs_on_async_session(db, async_session_factory, run_async):
+    customer = make_user(db)
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db)
+    customer_id = str(customer.id)
+    booking_data = BookingCreate(
+        material_source_id=str(source.id),
+        destination="Patna",
+        vehicle_type_id=str(vehicle_type.id),
+        quantity=Decimal("10"),
+        booking_time=datetime.utcnow()
+    )
+
+    async def scenario():
+        async with async_session_factory() as session:
+            service = AsyncBookingService(session)
+            created = await service.create_booking(customer_id, booking_data)
+            bookings, next_cursor = await service.get_bookings(customer_id, None, PageParams(cursor=None, limit=10))
+            details = await service.get_booking_with_details(str(created.id))
+        return created, bookings, next_cursor, details
+
+    created, bookings, next_cursor, details = run_async(scenario())
+
+    # Rows stay readable after their session is gone
+    assert created.status == BookingStatus.PENDING
+    assert [b.id for b in bookings] == [created.id]
+    assert bookings[0].destination == "Patna"
+    assert next_cursor is None
+    assert details.id == str(created.id)
+    assert details.vehicle_type_name
+
+
+def test_truck_and_material_routes_query_asynchronously(db, async_session_factory, run_async):
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db)
+    truck = make_truck(db, vehicle_type, owner)
+    base = datetime(2024, 1, 1)
+    for minutes, location in enumerate(("Dumka", "Pakur", "Deoghar")):
+        source = make_material_source(db, location=location)
+        source.created_at = base + timedelta(minutes=minutes)
+    db.commit()
+    current_user = AuthenticatedUser(str(owner.id), UserRole.TRUCK_OWNER, True)
+
+    async def scenario():
+        async with async_session_factory() as session:
+            trucks = await get_truck_owner_trucks(str(owner.id), db=session, current_user=current_user)
+            response = Response()
+            first = await get_material_sources(response, None, PageParams(cursor=None, limit=2), db=session)
+            cursor = response.headers.get("X-Next-Cursor")
+            rest = await get_material_sources(Response(), None, PageParams(cursor=cursor, limit=2), db=session)
+        return trucks, first, cursor, rest
+
+    trucks, first, cursor, rest = run_async(scenario())
+    assert [str(t.id) for t in trucks] == [str(truck.id)]
+    assert [s.location for s in first] == ["Deoghar", "Pakur"]
+    assert [s.location for s in rest] == ["Dumka"]
+
+
+def test_user_routes_serialise_users_loaded_asynchronously(db, async_session_factory, run_async, monkeypatch):
+    async def fake_hash(password):
+        return f"hashed:{password}"
+
+    # Hashing itself is covered by test_password_hashing; here only the response matters
+    monkeypatch.setattr(user_routes, "get_password_hash_async", fake_hash)
+    admin = make_user(db, UserRole.ADMIN)
+    admin_user = AuthenticatedUser(str(admin.id), UserRole.ADMIN, True)
+    user_data = UserCreate(
+        email="trucker@example.com", phone="9876543210", first_name="Ravi",
+        last_name="Kumar", role=UserRole.TRUCK_OWNER, password="long-enough"
+    )
+
+    async def scenario():
+        async with async_session_factory() as session:
+            registered = await user_routes.register_user(user_data, db=session)
+        current_user = AuthenticatedUser(registered.id, UserRole.TRUCK_OWNER, True)
+        async with async_session_factory() as session:
+            me = await user_routes.read_users_me(db=session, current_user=current_user)
+        async with async_session_factory() as session:
+            updated = await user_routes.update_users_me(UserUpdate(first_name="Ravindra"), db=session, current_user=current_user)
+        async with async_session_factory() as session:
+            deactivated = await user_routes.deactivate_user(registered.id, db=session, current_user=admin_user)
+        return registered, me, updated, deactivated
+
+    registered, me, updated, deactivated = run_async(scenario())
+    me, updated, deactivated = (UserResponse.model_validate(user) for user in (me, updated, deactivated))
+    assert (registered.email, registered.rating_count, registered.rating_average) == ("trucker@example.com", 0, None)
+    assert me.id == registered.id and me.rating_count == 0
+    assert updated.first_name == "Ravindra"
+    assert deactivated.is_active is False
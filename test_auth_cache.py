@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for cached current-user resolution
+"""
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+from backend.config import settings
+from backend.core.auth_cache import auth_user_cache
+from backend.core.security import create_access_token, get_current_user
+from backend.models.user_role import UserRole
+from backend.schemas.user import UserUpdate
+from backend.services.auth_service import AuthService
+from conftest import QueryCounter, make_user
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    auth_user_cache.clear()
+    yield
+    auth_user_cache.clear()
+
+
+def _token(user, minutes=30):
+    return create_access_token(
+        {"sub": str(user.id), "role": user.role.value, "active": True}, timedelta(minutes=minutes)
+    )
+
+
+@pytest.fixture
+def resolve(async_session_factory, run_async):
+    """get_current_user for a token, on its own session"""
+    async def resolve_token(token):
+        async with async_session_factory() as session:
+            return await get_current_user(token=token, db=session)
+    return lambda token: run_async(resolve_token(token))
+
+
+@pytest.fixture
+def with_service(async_session_factory, run_async):
+    """Call an AuthService method on its own session"""
+    async def call(method, *args):
+        async with async_session_factory() as session:
+            return await method(AuthService(session), *args)
+    return lambda method, *args: run_async(call(method, *args))
+
+
+def test_user_is_cached_until_changed(db, async_engine, resolve, with_service):
+    user = make_user(db, UserRole.TRUCK_OWNER)
+    token = _token(user)
+
+    with QueryCounter(async_engine.sync_engine) as counter:
+        first = resolve(token)
+        second = resolve(token)
+    assert counter.queries == 1
+    assert (second.id, second.role, second.is_active) == (str(user.id), UserRole.TRUCK_OWNER, True)
+
+    # Unrelated profile edits also drop the entry; it is reloaded once
+    with_service(AuthService.update_user, user.id, UserUpdate(first_name="Renamed"))
+    with QueryCounter(async_engine.sync_engine) as counter:
+        resolve(token)
+        resolve(token)
+    assert counter.queries == 1
+
+    # A rolled back change leaves the cached entry alone
+    user.role = UserRole.ADMIN
+    db.flush()
+    db.rollback()
+    assert auth_user_cache.get(str(user.id)).role == UserRole.TRUCK_OWNER
+
+    with_service(AuthService.deactivate_user, user.id)
+    with pytest.raises(HTTPException) as raised:
+        resolve(token)
+    assert raised.value.detail == "Inactive user"
+
+
+def test_cache_is_bounded(db, resolve, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_USER_CACHE_SIZE", 2)
+    users = [make_user(db) for _ in range(3)]
+    for user in users:
+        resolve(_token(user))
+    assert len(auth_user_cache) == 2
+    assert auth_user_cache.get(str(users[0].id)) is None
+
+
+def test_short_lived_token_claims_can_be_trusted(db, async_engine, resolve, monkeypatch):
+    user = make_user(db, UserRole.CUSTOMER)
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+    monkeypatch.setattr(settings, "AUTH_TRUSTED_TOKEN_MAX_MINUTES", 15)
+
+    short, long = _token(user, minutes=10), _token(user, minutes=60)
+
+    with QueryCounter(async_engine.sync_engine) as counter:
+        trusted = resolve(short)
+    assert counter.queries == 0
+    assert trusted.role == UserRole.CUSTOMER
+    assert len(auth_user_cache) == 0
+
+    # Long-lived tokens are always checked against the database
+    with QueryCounter(async_engine.sync_engine) as counter:
+        resolve(long)
+    assert counter.queries == 1
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch dispatch optimizer
+"""
+from datetime import datetime
+from backend.config import settings
+from backend.models.booking import Booking, BookingStatus, BookingStatusHistory
+from backend.models.truck import Truck, TruckStatus
+from backend.models.user_role import UserRole
+from backend.services import dispatch_service
+from backend.services.dispatch_service import DispatchService, shutdown_solver_pool
+from conftest import make_user, make_vehicle_type, make_material_source, make_truck, make_booking
+
+
+def test_batch_dispatch_minimises_total_empty_distance(db):
+    customer = make_user(db)
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db, 30)
+
+    source_a = make_material_source(db, 24.0, 86.0)
+    source_b = make_material_source(db, 24.0, 86.5)
+    booking_a = make_booking(db, customer, source_a, vehicle_type)
+    booking_b = make_booking(db, customer, source_b, vehicle_type)
+    oversized = make_booking(db, customer, source_a, vehicle_type, quantity=45)
+
+    # Greedy first-come would give booking A the truck at 86.25 and send B to 85.7
+    middle_truck = make_truck(db, vehicle_type, owner, 24.0, 86.25)
+    west_truck = make_truck(db, vehicle_type, owner, 24.0, 85.7)
+
+    try:
+        stats = DispatchService(db).run_batch()
+    finally:
+        shutdown_solver_pool()
+
+    # The oversized booking no truck of its type can carry is not even considered
+    assert stats.bookings_considered == 2
+    assert stats.trucks_considered == 2
+    assert stats.assigned == 2
+    assert stats.unassigned == 0
+
+    db.expire_all()
+    assert db.get(Booking, booking_a.id).assigned_truck_id == west_truck.id
+    assert db.get(Booking, booking_b.id).assigned_truck_id == middle_truck.id
+    assert db.get(Booking, oversized.id).status == BookingStatus.PENDING
+    assert db.query(Truck).filter(Truck.status == TruckStatus.BOOKED).count() == 2
+    assert db.query(BookingStatusHistory).count() == 2
+
+
+def test_infeasible_bookings_neither_starve_newer_ones_nor_stay_forever(db, monkeypatch):
+    monkeypatch.setattr(settings, "DISPATCH_BATCH_MAX_BOOKINGS", 1)
+    monkeypatch.setattr(settings, "DISPATCH_BATCH_MAX_MISSES", 2)
+    monkeypatch.setattr(dispatch_service, "_missed_runs", {})
+    monkeypatch.setattr(dispatch_service, "_aged_out", set())
+    customer = make_user(db)
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db, 30)
+    other_type = make_vehicle_type(db, 30)
+    nearby = make_material_source(db, 24.0, 86.0)
+
+    # Older than the feasible booking, but none of them can be served at all
+    make_booking(db, customer, make_material_source(db), vehicle_type)
+    make_booking(db, customer, nearby, vehicle_type, quantity=45)
+    make_booking(db, customer, nearby, other_type)
+    far_away = make_booking(db, customer, make_material_source(db, 28.6, 77.2), vehicle_type)
+    feasible = make_booking(db, customer, nearby, vehicle_type)
+    far_away.created_at, feasible.created_at = datetime(2024, 1, 1), datetime(2024, 1, 2)
+    db.commit()
+    make_truck(db, vehicle_type, owner, 24.0, 86.1)
+    make_truck(db, vehicle_type, owner, 24.0, 86.2)
+
+    try:
+        service = DispatchService(db)
+        runs = [service.run_batch() for _ in range(4)]
+    finally:
+        shutdown_solver_pool()
+
+    # Only the booking too far from every truck takes the single slot, until it ages out
+    assert [(r.bookings_considered, r.assigned, r.aged_out) for r in runs] == [(1, 0, 0), (1, 0, 1), (1, 1, 0), (0, 0, 0)]
+    db.expire_all()
+    assert db.get(Booking, feasible.id).status == BookingStatus.TRUCK_ASSIGNED
+    assert db.get(Booking, far_away.id).status == BookingStatus.PENDING
+    [note] = db.query(BookingStatusHistory).filter(BookingStatusHistory.booking_id == far_away.id).all()
+    assert "assign one manually" in note.notes
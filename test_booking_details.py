@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for single-query booking detail reads
+"""
+import uuid
+import pytest
+from backend.core.exceptions import BookingNotFoundException
+from backend.models.booking import BookingStatus
+from backend.models.user_role import UserRole
+from backend.schemas.booking import BookingDetailsBatchRequest
+from backend.services.booking_service import BookingService
+from conftest import QueryCounter, make_user, make_vehicle_type, make_material_source, make_truck, make_booking
+
+
+def test_booking_details_in_one_query(db, sqlite_engine):
+    customer = make_user(db)
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db, location="Dumka")
+    truck = make_truck(db, vehicle_type, owner)
+    booking = make_booking(db, customer, source, vehicle_type)
+    booking.assigned_truck_id = truck.id
+    booking.status = BookingStatus.TRUCK_ASSIGNED
+    db.commit()
+    booking_id, truck_number = str(booking.id), truck.vehicle_number
+    db.expire_all()
+
+    with QueryCounter(sqlite_engine) as counter:
+        details = BookingService(db).get_booking_with_details(booking_id)
+    assert counter.queries == 1
+
+    assert details.id == booking_id
+    assert details.user_id == str(customer.id)
+    assert details.user_name == "Test User"
+    assert details.material_type == "SAND"
+    assert details.material_source == "Dumka Quarry"
+    assert details.vehicle_type_name == "30 TON"
+    assert details.assigned_truck_number == truck_number
+    assert details.driver_name == "Driver"
+
+    with pytest.raises(BookingNotFoundException):
+        BookingService(db).get_booking_with_details(str(uuid.uuid4()))
+
+
+def test_batch_booking_details(db, sqlite_engine):
+    customer, other = make_user(db), make_user(db)
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db)
+    mine = [str(make_booking(db, customer, source, vehicle_type).id) for _ in range(5)]
+    theirs = str(make_booking(db, other, source, vehicle_type).id)
+    requested = [mine[3], str(uuid.uuid4()), mine[0], theirs, mine[4]]
+    db.expire_all()
+
+    with QueryCounter(sqlite_engine) as counter:
+        details = BookingService(db).get_bookings_with_details(requested)
+    assert counter.queries == 1
+    assert [d.id for d in details] == [mine[3], mine[0], theirs, mine[4]]
+    # Unassigned bookings have no truck columns
+    assert details[0].assigned_truck_number is None
+
+    details = BookingService(db).get_bookings_with_details(requested, customer.id)
+    assert [d.id for d in details] == [mine[3], mine[0], mine[4]]
+
+    with pytest.raises(ValueError):
+        BookingDetailsBatchRequest(booking_ids=["not-a-uuid"])
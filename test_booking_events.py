@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the booking status event stream
+"""
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+from backend.config import settings
+from backend.models.booking import BookingStatus
+from backend.models.user_role import UserRole
+from backend.schemas.booking import BookingCreate, BookingStatusUpdate
+from backend.services.booking_events import booking_events, BookingEvent
+from backend.services.booking_service import BookingService
+from backend.services.truck_pool import truck_pool
+from conftest import make_user, make_vehicle_type, make_material_source, make_truck
+
+
+def _drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return [(event.booking_id, event.status) for event in events]
+
+
+def test_status_changes_reach_customer_and_truck_owner(db, monkeypatch):
+    monkeypatch.setattr(settings, "DISPATCH_MODE", "immediate")
+    monkeypatch.setattr(truck_pool, "loaded", False)
+    customer = make_user(db, UserRole.CUSTOMER)
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db, 24.27, 87.25)
+    make_truck(db, vehicle_type, owner, 24.27, 87.25)
+    customer_id, owner_id = str(customer.id), str(owner.id)
+
+    async def scenario():
+        booking_events.start()
+        try:
+            customer_stream = booking_events.subscribe(customer_id)
+            owner_stream = booking_events.subscribe(owner_id)
+            bystander_stream = booking_events.subscribe(uuid.uuid4())
+            everything = booking_events.subscribe()
+
+            def run():
+                service = BookingService(db)
+                booking = service.create_booking(customer_id, BookingCreate(
+                    material_source_id=str(source.id),
+                    destination="Patna",
+                    vehicle_type_id=str(vehicle_type.id),
+                    quantity=10,
+                    booking_time=datetime.utcnow()
+                ))
+                service.update_booking_status(str(booking.id), BookingStatusUpdate(status=BookingStatus.IN_TRANSIT))
+                service.cancel_booking(str(booking.id), customer_id)
+                return str(booking.id)
+
+            booking_id = await asyncio.to_thread(run)
+            # Deliveries are scheduled onto the loop by the committing thread
+            await asyncio.sleep(0.05)
+            return booking_id, customer_stream, owner_stream, bystander_stream, everything
+        finally:
+            booking_events.stop()
+
+    booking_id, customer_stream, owner_stream, bystander_stream, everything = asyncio.run(scenario())
+    expected = [
+        (booking_id, BookingStatus.PENDING.value),
+        (booking_id, BookingStatus.TRUCK_ASSIGNED.value),
+        (booking_id, BookingStatus.IN_TRANSIT.value),
+        (booking_id, BookingStatus.CANCELLED.value),
+    ]
+    assert _drain(customer_stream) == expected
+    # The owner hears about the booking from the moment its truck is assigned
+    assert _drain(owner_stream) == expected[1:]
+    assert _drain(bystander_stream) == []
+    assert _drain(everything) == expected
+    for subscription in (customer_stream, owner_stream, bystander_stream, everything):
+        booking_events.unsubscribe(subscription)
+
+
+def test_many_idle_subscribers_and_sse_format():
+    async def scenario():
+        booking_events.start()
+        try:
+            user_ids = [uuid.uuid4() for _ in range(20000)]
+            start = time.perf_counter()
+            subscriptions = [booking_events.subscribe(user_id) for user_id in user_ids]
+            subscribe_ms = (time.perf_counter() - start) * 1000
+
+            booking_events.publish(BookingEvent(uuid.uuid4(), user_ids[123], None, BookingStatus.COMPLETED, "Delivered"))
+            stream = booking_events.stream(subscriptions[123])
+            assert await stream.__anext__() == ": connected\n\n"
+            message = await asyncio.wait_for(stream.__anext__(), timeout=1)
+            await stream.aclose()
+
+            others_empty = all(s.queue.empty() for i, s in enumerate(subscriptions) if i != 123)
+            for subscription in subscriptions:
+                booking_events.unsubscribe(subscription)
+            return subscribe_ms, message, others_empty, len(booking_events)
+        finally:
+            booking_events.stop()
+
+    subscribe_ms, message, others_empty, remaining = asyncio.run(scenario())
+    assert subscribe_ms < 2000
+    assert others_empty
+    assert remaining == 0
+    event_line, data_line, _, _ = message.split("\n")
+    assert event_line == "event: status"
+    payload = json.loads(data_line[len("data: "):])
+    assert payload["status"] == BookingStatus.COMPLETED.value
+    assert payload["notes"] == "Delivered"
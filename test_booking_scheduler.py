@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for the future-dated booking scheduler
+"""
+import asyncio
+import random
+from datetime import datetime, timedelta
+from backend.config import settings
+from backend.models.booking import Booking, BookingStatus
+from backend.models.user_role import UserRole
+from backend.schemas.booking import BookingCreate
+from backend.services.booking_scheduler import BookingScheduler
+from backend.services.booking_service import BookingService
+from backend.services.truck_pool import truck_pool
+
+
+def test_scheduler_releases_bookings_in_due_order(monkeypatch):
+    monkeypatch.setattr(settings, "BOOKING_SCHEDULE_LEAD_MINUTES", 0)
+    released = []
+
+    async def scenario():
+        scheduler = BookingScheduler()
+        assert scheduler.schedule("ignored", datetime.utcnow()) is False
+        await scheduler.start(released.append)
+        now = datetime.utcnow()
+        offsets = list(range(5000))
+        random.Random(3).shuffle(offsets)
+        # Thousands of bookings spread over the next 0.3 seconds, plus one far in the future
+        for offset in offsets:
+            scheduler.schedule(f"booking-{offset:04d}", now + timedelta(microseconds=60 * offset))
+        scheduler.schedule("next-week", now + timedelta(days=7))
+        for _ in range(200):
+            if len(released) == 5000:
+                break
+            await asyncio.sleep(0.01)
+        remaining = len(scheduler)
+        await scheduler.stop()
+        return remaining
+
+    assert asyncio.run(scenario()) == 1
+    assert released == [f"booking-{offset:04d}" for offset in range(5000)]
+
+
+def test_future_booking_does_not_claim_a_truck(db, monkeypatch):
+    from conftest import make_user, make_vehicle_type, make_material_source, make_truck
+
+    monkeypatch.setattr(settings, "DISPATCH_MODE", "immediate")
+    monkeypatch.setattr(truck_pool, "loaded", False)
+    customer = make_user(db, UserRole.CUSTOMER)
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db, 24.27, 87.25)
+    truck = make_truck(db, vehicle_type, owner, 24.27, 87.25)
+
+    def book(booking_time):
+        return BookingService(db).create_booking(str(customer.id), BookingCreate(
+            material_source_id=str(source.id),
+            destination="Patna",
+            vehicle_type_id=str(vehicle_type.id),
+            quantity=10,
+            booking_time=booking_time
+        ))
+
+    later = book(datetime.utcnow() + timedelta(days=2))
+    assert later.status == BookingStatus.PENDING
+    assert later.assigned_truck_id is None
+
+    # The truck is still free for a booking that is due now
+    now = book(datetime.utcnow())
+    assert now.status == BookingStatus.TRUCK_ASSIGNED
+    assert str(now.assigned_truck_id) == str(truck.id)
+    assert db.query(Booking).count() == 2
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Query and commit budget for the booking write paths
+"""
+from datetime import datetime
+from decimal import Decimal
+from backend.models.booking import BookingStatus, BookingStatusHistory
+from backend.models.truck import TruckStatus
+from backend.models.user_role import UserRole
+from backend.schemas.booking import BookingCreate, BookingStatusUpdate
+from backend.services.booking_service import BookingService
+from conftest import QueryCounter, make_user, make_vehicle_type, make_material_source, make_truck
+
+
+def _booking_data(source, vehicle_type):
+    return BookingCreate(
+        material_source_id=str(source.id),
+        destination="Patna",
+        vehicle_type_id=str(vehicle_type.id),
+        quantity=Decimal("10"),
+        booking_time=datetime.utcnow()
+    )
+
+
+def test_create_booking_commits_once(db, sqlite_engine):
+    customer = make_user(db)
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db, location="Dumka")
+    truck = make_truck(db, vehicle_type, owner, location="Dumka")
+    customer_id, truck_id, booking_data = customer.id, truck.id, _booking_data(source, vehicle_type)
+    db.expire_all()
+
+    with QueryCounter(sqlite_engine) as counter:
+        booking = BookingService(db).create_booking(customer_id, booking_data)
+
+    # 2 validation reads, 1 booking insert, 2 history inserts, 1 candidate read, 2 conditional claims
+    assert counter.commits == 1
+    assert counter.queries <= 8, counter.statements
+
+    assert booking.status == BookingStatus.TRUCK_ASSIGNED
+    assert booking.assigned_truck_id == truck_id
+    history = db.query(BookingStatusHistory).filter(BookingStatusHistory.booking_id == booking.id).all()
+    assert sorted(h.status for h in history) == sorted([BookingStatus.PENDING.value, BookingStatus.TRUCK_ASSIGNED.value])
+
+
+def test_status_update_and_cancel_commit_once(db, sqlite_engine):
+    customer = make_user(db)
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db, location="Dumka")
+    truck = make_truck(db, vehicle_type, owner, location="Dumka")
+    service = BookingService(db)
+    booking = service.create_booking(customer.id, _booking_data(source, vehicle_type))
+    second = service.create_booking(customer.id, _booking_data(source, vehicle_type))
+    customer_id = customer.id
+    db.expire_all()
+
+    with QueryCounter(sqlite_engine) as counter:
+        service.update_booking_status(str(booking.id), BookingStatusUpdate(status=BookingStatus.COMPLETED))
+    assert counter.commits == 1
+
+    with QueryCounter(sqlite_engine) as counter:
+        service.cancel_booking(str(second.id), customer_id)
+    assert counter.commits == 1
+
+    db.expire_all()
+    assert truck.status == TruckStatus.AVAILABLE
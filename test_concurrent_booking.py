@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test: parallel bookings must never share a truck
+"""
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from backend.models.booking import Booking, BookingStatus
+from backend.models.truck import Truck, TruckStatus
+from backend.models.user_role import UserRole
+from backend.schemas.booking import BookingCreate
+from backend.services.booking_service import BookingService
+from conftest import make_user, make_vehicle_type, make_material_source, make_truck
+
+TRUCK_COUNT = 5
+BOOKING_COUNT = 40
+
+
+def test_parallel_bookings_never_double_assign(db, session_factory):
+    customer = make_user(db)
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db, location="Dumka")
+    for _ in range(TRUCK_COUNT):
+        make_truck(db, vehicle_type, owner, location="Dumka")
+
+    booking_data = BookingCreate(
+        material_source_id=str(source.id),
+        destination="Patna",
+        vehicle_type_id=str(vehicle_type.id),
+        quantity=Decimal("10"),
+        booking_time=datetime.utcnow()
+    )
+    start_barrier = threading.Barrier(BOOKING_COUNT)
+    errors = []
+    latencies = []
+
+    def place_booking():
+        session = session_factory()
+        try:
+            start_barrier.wait()
+            start = time.perf_counter()
+            BookingService(session).create_booking(customer.id, booking_data)
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=place_booking) for _ in range(BOOKING_COUNT)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert not any(thread.is_alive() for thread in threads), "bookings piled up on locks"
+    assert errors == []
+    assert len(latencies) == BOOKING_COUNT
+
+    db.expire_all()
+    assigned = [b.assigned_truck_id for b in db.query(Booking).all() if b.assigned_truck_id]
+    assert len(assigned) == TRUCK_COUNT
+    assert max(Counter(assigned).values()) == 1
+    assert db.query(Truck).filter(Truck.status == TruckStatus.BOOKED).count() == TRUCK_COUNT
+    assert db.query(Booking).filter(Booking.status == BookingStatus.PENDING).count() == BOOKING_COUNT - TRUCK_COUNT
+    print(f"max booking latency: {max(latencies) * 1000:.1f} ms")
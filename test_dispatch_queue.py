@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the background dispatch queue: retries, backoff and thread-safe submit
+"""
+import asyncio
+import threading
+from backend.config import settings
+from backend.models.booking import BookingStatus, BookingStatusHistory
+from backend.services.booking_service import BookingService
+from backend.services.dispatch_queue import DispatchQueue
+from conftest import make_user, make_vehicle_type, make_material_source, make_booking
+
+
+def test_dispatch_queue_retries_until_assigned(monkeypatch):
+    monkeypatch.setattr(settings, "DISPATCH_RETRY_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "DISPATCH_MAX_ATTEMPTS", 5)
+    calls = []
+
+    def handler(booking_id):
+        calls.append(booking_id)
+        # No truck free for the first two attempts
+        return len(calls) >= 3
+
+    async def scenario():
+        queue = DispatchQueue()
+        await queue.start(handler, workers=2)
+        # Request threads submit bookings; duplicates while queued are ignored
+        submitter = threading.Thread(target=lambda: [queue.submit("booking-1") for _ in range(3)])
+        submitter.start()
+        submitter.join()
+        for _ in range(200):
+            if len(calls) >= 3 and len(queue) == 0:
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assert calls == ["booking-1"] * 3
+
+
+def test_dispatch_queue_gives_up_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(settings, "DISPATCH_RETRY_BASE_SECONDS", 0.001)
+    monkeypatch.setattr(settings, "DISPATCH_MAX_ATTEMPTS", 3)
+    calls, abandoned = [], []
+    queue = DispatchQueue()
+
+    async def scenario():
+        assert queue.submit("ignored") is False
+        await queue.start(
+            lambda booking_id: calls.append(booking_id) or False, workers=1,
+            on_give_up=lambda booking_id, attempts: abandoned.append((booking_id, attempts))
+        )
+        queue.submit("booking-2")
+        await asyncio.sleep(0.2)
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assert calls == ["booking-2"] * 3
+    assert abandoned == [("booking-2", 3)]
+    assert (queue.gave_up, len(queue)) == (1, 0)
+
+
+def test_abandoned_pending_bookings_get_a_history_entry(db):
+    customer = make_user(db)
+    vehicle_type = make_vehicle_type(db)
+    source = make_material_source(db)
+    booking = make_booking(db, customer, source, vehicle_type)
+    cancelled = make_booking(db, customer, source, vehicle_type)
+    cancelled.status = BookingStatus.CANCELLED
+    db.commit()
+    service = BookingService(db)
+
+    assert service.record_dispatch_abandoned(str(booking.id), 3) is True
+    assert service.record_dispatch_abandoned(str(cancelled.id), 3) is False
+    [entry] = db.query(BookingStatusHistory).filter(BookingStatusHistory.booking_id == booking.id).all()
+    assert entry.status == BookingStatus.PENDING.value and "after 3 attempts" in entry.notes
+    assert db.query(BookingStatusHistory).filter(BookingStatusHistory.booking_id == cancelled.id).count() == 0
+    db.refresh(booking)
+    assert (booking.status, booking.assigned_truck_id) == (BookingStatus.PENDING, None)
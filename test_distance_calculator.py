@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script to check the batch distance API against the scalar haversine
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from backend.utils.distance_calculator import DistanceCalculator
+
+
+def test_known_distance():
+    """Dumka to Patna is roughly 250 km as the crow flies"""
+    distance = DistanceCalculator.haversine_distance(24.2672, 87.2488, 25.5941, 85.1376)
+    assert 240 < distance < 265
+
+
+def test_batch_matches_scalar():
+    rng = np.random.default_rng(1)
+    lats = rng.uniform(21.5, 27.5, 5000)
+    lons = rng.uniform(83.0, 89.0, 5000)
+
+    start = time.perf_counter()
+    scalar = [DistanceCalculator.haversine_distance(24.27, 87.25, lat, lon) for lat, lon in zip(lats, lons)]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = DistanceCalculator.distances_from(24.27, 87.25, lats, lons)
+    batch_time = time.perf_counter() - start
+
+    assert batch.dtype == np.float64 and batch.shape == (5000,)
+    assert np.allclose(batch, scalar, rtol=1e-9, atol=1e-9)
+    print(f"Scalar loop: {scalar_time * 1000:.2f} ms, batch: {batch_time * 1000:.2f} ms for 5000 points")
+
+
+def test_matrix_and_pairwise():
+    origins_lat, origins_lon = [24.27, 24.89, 25.59], [87.25, 85.54, 85.14]
+    points_lat, points_lon = [24.63, 25.17], [87.85, 86.09]
+
+    matrix = DistanceCalculator.distance_matrix(origins_lat, origins_lon, points_lat, points_lon)
+    assert matrix.shape == (3, 2)
+    for i in range(3):
+        for j in range(2):
+            expected = DistanceCalculator.haversine_distance(origins_lat[i], origins_lon[i], points_lat[j], points_lon[j])
+            assert abs(matrix[i, j] - expected) < 1e-9
+
+    pairwise = DistanceCalculator.pairwise_distances(origins_lat[:2], origins_lon[:2], points_lat, points_lon)
+    assert np.allclose(pairwise, [matrix[0, 0], matrix[1, 1]])
+
+
+if __name__ == "__main__":
+    test_known_distance()
+    test_batch_matches_scalar()
+    test_matrix_and_pairwise()
+    print("✅ All tests passed!")
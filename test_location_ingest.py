@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the GPS location ingestion pipeline
+"""
+import time
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import func
+from backend.models.truck import Truck, TruckLocationPing
+from backend.models.user_role import UserRole
+from backend.schemas.truck import LocationBatch
+from backend.config import settings
+from backend.services import location_ingest
+from backend.services.location_ingest import LocationIngestor
+from backend.services.truck_pool import truck_pool
+from conftest import QueryCounter, make_user, make_vehicle_type, make_truck
+
+
+@pytest.fixture(autouse=True)
+def isolated_pool(monkeypatch):
+    """Let the tests load the shared truck pool and put it back afterwards"""
+    monkeypatch.setattr(truck_pool, "_records", {})
+    monkeypatch.setattr(truck_pool, "_partitions", {})
+    monkeypatch.setattr(truck_pool, "loaded", False)
+
+
+def _ping(truck, latitude, longitude, recorded_at):
+    return {"truck_id": str(truck.id), "latitude": latitude, "longitude": longitude, "recorded_at": recorded_at.isoformat()}
+
+
+def test_latest_position_moves_pool_and_is_written_once(db, sqlite_engine):
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db)
+    truck = make_truck(db, vehicle_type, owner, 24.0, 87.0)
+    truck_pool.load(db)
+    ingestor = LocationIngestor()
+    now = datetime(2024, 5, 1, 10, 0, 0)
+
+    moved = ingestor.ingest(LocationBatch(pings=[
+        _ping(truck, 24.1, 87.1, now + timedelta(seconds=10)),
+        _ping(truck, 24.3, 87.3, now + timedelta(seconds=30)),
+        # Arrives late: kept in the track, does not move the truck back
+        _ping(truck, 24.2, 87.2, now + timedelta(seconds=20)),
+    ]).pings)
+    assert moved == 1
+    record = truck_pool.get(truck.id)
+    assert (record.latitude, record.longitude) == (24.3, 87.3)
+    assert truck_pool.nearest(vehicle_type.id, 24.3, 87.3, k=1, radius_km=1)[0][0].id == str(truck.id)
+
+    # An older batch does not move the truck either
+    assert ingestor.ingest(LocationBatch(pings=[_ping(truck, 25.0, 88.0, now)]).pings) == 0
+
+    with QueryCounter(sqlite_engine) as counter:
+        assert ingestor.flush(db) == (1, 4)
+    assert sum(s.startswith("UPDATE trucks") for s in counter.statements) == 1
+    db.expire_all()
+    stored = db.query(Truck).filter(Truck.id == truck.id).one()
+    assert (float(stored.latitude), float(stored.longitude)) == (24.3, 87.3)
+    track = db.query(TruckLocationPing).order_by(TruckLocationPing.recorded_at).all()
+    assert [(p.latitude, p.longitude) for p in track] == [(25.0, 88.0), (24.1, 87.1), (24.2, 87.2), (24.3, 87.3)]
+
+    # A retried batch is not stored twice
+    ingestor.ingest(LocationBatch(pings=[_ping(truck, 24.3, 87.3, now + timedelta(seconds=30))]).pings)
+    assert ingestor.flush(db) == (0, 1)
+    assert db.query(func.count()).select_from(TruckLocationPing).scalar() == 4
+
+
+def test_ingest_rate_and_coalesced_writes(db, sqlite_engine):
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db)
+    trucks = [make_truck(db, vehicle_type, owner, 24.0, 87.0) for _ in range(100)]
+    truck_pool.load(db)
+    ingestor = LocationIngestor()
+    start_at = datetime(2024, 5, 1, 10, 0, 0)
+
+    # 20 batches of 500 pings: every truck reports every second for 100 seconds
+    payloads = [
+        {"pings": [
+            _ping(trucks[i % 100], 24.0 + (batch * 5 + i // 100) * 1e-4, 87.0, start_at + timedelta(seconds=batch * 5 + i // 100))
+            for i in range(500)
+        ]}
+        for batch in range(20)
+    ]
+    started = time.perf_counter()
+    for payload in payloads:
+        ingestor.ingest(LocationBatch.model_validate(payload).pings)
+    elapsed = time.perf_counter() - started
+    assert 10000 / elapsed > 10000, f"{10000 / elapsed:.0f} pings/s"
+
+    with QueryCounter(sqlite_engine) as counter:
+        assert ingestor.flush(db) == (100, 10000)
+    # One executemany UPDATE for all trucks and one INSERT per chunk, whatever the ping count
+    assert sum(s.startswith("UPDATE trucks") for s in counter.statements) == 1
+    assert sum(s.startswith("INSERT") for s in counter.statements) == 2
+    assert db.query(func.count()).select_from(TruckLocationPing).scalar() == 10000
+
+
+def test_failed_flush_drops_offending_trucks_and_buffer_is_bounded(db, monkeypatch):
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db)
+    good, bad = make_truck(db, vehicle_type, owner, 24.0, 87.0), make_truck(db, vehicle_type, owner, 24.0, 87.0)
+    ingestor = LocationIngestor()
+    now = datetime(2024, 5, 1, 10, 0, 0)
+    record_pings = location_ingest.track_store.record_pings
+    broken = {str(bad.id)}
+
+    def failing_record_pings(session, pings):
+        if broken & {ping["truck_id"] for ping in pings}:
+            raise RuntimeError("cannot write track")
+        return record_pings(session, pings)
+
+    monkeypatch.setattr(location_ingest.track_store, "record_pings", failing_record_pings)
+    ingestor.ingest(LocationBatch(pings=[
+        _ping(good, 24.1, 87.1, now), _ping(good, 24.2, 87.2, now + timedelta(seconds=1)), _ping(bad, 25.0, 88.0, now)
+    ]).pings)
+
+    # The good truck is written on its own; the bad truck's rows are dropped, not re-queued
+    assert ingestor.flush(db) == (1, 2)
+    assert (len(ingestor), ingestor.dropped) == (0, 1)
+    db.expire_all()
+    assert float(db.get(Truck, good.id).latitude) == 24.2
+    assert float(db.get(Truck, bad.id).latitude) == 24.0
+
+    # When nothing can be written the batch is kept, but only the newest pings up to the cap
+    broken.add(str(good.id))
+    monkeypatch.setattr(settings, "TRUCK_LOCATION_BUFFER_MAX", 3)
+    ingestor.ingest(LocationBatch(pings=[_ping(good, 24.3, 87.3, now + timedelta(seconds=i + 2)) for i in range(2)]).pings)
+    with pytest.raises(RuntimeError):
+        ingestor.flush(db)
+    assert len(ingestor) == 2
+    ingestor.ingest(LocationBatch(pings=[_ping(good, 24.4, 87.4, now + timedelta(seconds=i + 4)) for i in range(2)]).pings)
+    assert (len(ingestor), ingestor.dropped) == (3, 2)
+    broken.clear()
+    assert ingestor.flush(db) == (1, 3)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the nearby material location search
+"""
+import random
+import time
+from decimal import Decimal
+from sqlalchemy import text
+from backend.models.location import AvailabilityStatus, LocationMaterial, LocationStatus, MaterialLocation
+from backend.models.user_role import UserRole
+from backend.services.location_service import MaterialLocationService
+from conftest import make_user
+from test_query_plans import _check
+
+
+def _location(db, owner, latitude, longitude, materials, status=LocationStatus.ACTIVE, name="Yard"):
+    location = MaterialLocation(
+        truck_owner_id=owner.id, location_name=name, address="NH 114", city="Dumka", state="Jharkhand",
+        pincode="814101", latitude=Decimal(str(latitude)), longitude=Decimal(str(longitude)), status=status
+    )
+    db.add(location)
+    db.flush()
+    for material_type, price, availability in materials:
+        db.add(LocationMaterial(
+            location_id=location.id, material_type=material_type, price_per_unit=Decimal(price),
+            unit="ton", availability_status=availability
+        ))
+    return location
+
+
+def test_nearby_search_filters_and_ranks(db):
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    near_dear = _location(db, owner, 24.28, 87.25, [("Sand", 1500, AvailabilityStatus.AVAILABLE)], name="Near")
+    mid_cheap = _location(db, owner, 24.40, 87.25, [("Sand", 1100, AvailabilityStatus.LIMITED)], name="Mid")
+    _location(db, owner, 24.30, 87.26, [("Sand", 900, AvailabilityStatus.OUT_OF_STOCK)], name="Empty")
+    _location(db, owner, 24.29, 87.25, [("Stone", 800, AvailabilityStatus.AVAILABLE)], name="Stone")
+    _location(db, owner, 24.29, 87.24, [("Sand", 700, AvailabilityStatus.AVAILABLE)], LocationStatus.INACTIVE)
+    # Inside the bounding box's corner but outside the radius
+    _location(db, owner, 24.44, 87.40, [("Sand", 500, AvailabilityStatus.AVAILABLE)], name="Corner")
+    db.commit()
+    service = MaterialLocationService(db)
+
+    by_price = service.search_nearby(24.27, 87.25, "Sand", radius_km=20)
+    assert [r.location_id for r in by_price] == [str(mid_cheap.id), str(near_dear.id)]
+    assert by_price[0].availability_status == AvailabilityStatus.LIMITED
+    assert by_price[1].distance_km < 2
+
+    by_distance = service.search_nearby(24.27, 87.25, "Sand", radius_km=20, sort_by="distance", limit=1)
+    assert [r.location_id for r in by_distance] == [str(near_dear.id)]
+
+    with_empty = service.search_nearby(24.27, 87.25, "Sand", radius_km=20, include_out_of_stock=True)
+    assert [r.price_per_unit for r in with_empty] == [900, 1100, 1500]
+    assert service.search_nearby(24.27, 87.25, "Gravel", radius_km=20) == []
+
+
+def test_nearby_search_prefilters_on_index(db, sqlite_engine):
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    rng = random.Random(19)
+    for i in range(3000):
+        _location(db, owner, rng.uniform(22.0, 26.0), rng.uniform(84.0, 88.0), [
+            ("Sand", rng.randint(800, 2000), AvailabilityStatus.AVAILABLE),
+            ("Stone", rng.randint(800, 2000), rng.choice(list(AvailabilityStatus)))
+        ], name=f"Yard {i}")
+    db.commit()
+    db.execute(text("ANALYZE"))
+    service = MaterialLocationService(db)
+
+    _check(sqlite_engine, lambda: service.search_nearby(24.27, 87.25, "Sand", radius_km=30))
+
+    timings = []
+    for _ in range(50):
+        started = time.perf_counter()
+        results = service.search_nearby(rng.uniform(22.5, 25.5), rng.uniform(84.5, 87.5), "Stone", radius_km=30)
+        timings.append(time.perf_counter() - started)
+        assert all(r.distance_km <= 30 for r in results)
+        assert [r.price_per_unit for r in results] == sorted(r.price_per_unit for r in results)
+    timings.sort()
+    assert timings[len(timings) // 2] < 0.05
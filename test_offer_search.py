@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the preloaded-material offer index and search
+"""
+import random
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from backend.core.exceptions import OfferNotAvailableException, UnauthorizedAccessException
+from backend.models.truck import PreloadedMaterial, PreloadedMaterialStatus
+from backend.models.user_role import UserRole
+from backend.schemas.truck import PreloadedOfferCreate
+from backend.services.offer_index import offer_index
+from backend.services.offer_service import OfferService
+from conftest import make_user, make_vehicle_type, make_truck
+
+
+@pytest.fixture(autouse=True)
+def isolated_index(monkeypatch):
+    """Give each test an empty shared offer index and put the original back afterwards"""
+    monkeypatch.setattr(offer_index, "_by_material", {})
+    monkeypatch.setattr(offer_index, "_material_of", {})
+    monkeypatch.setattr(offer_index, "loaded", False)
+
+
+def _offer(truck, material_type="Sand", destination="Patna", price=5000):
+    return PreloadedOfferCreate(
+        truck_id=str(truck.id), material_type=material_type, quantity=Decimal(20), unit="ton",
+        destination=destination, price=Decimal(price)
+    )
+
+
+def test_offers_are_searchable_until_booked(db):
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    other_owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db)
+    near = make_truck(db, vehicle_type, owner, 24.30, 87.25)
+    far = make_truck(db, vehicle_type, owner, 25.60, 85.10)
+    service = OfferService(db)
+
+    cheap_far = service.create_offer(owner, _offer(far, destination="Patna City", price=4000))
+    dear_near = service.create_offer(owner, _offer(near, destination="Patna", price=6000))
+    service.create_offer(owner, _offer(near, material_type="Stone", destination="Ranchi", price=3000))
+    with pytest.raises(UnauthorizedAccessException):
+        service.create_offer(other_owner, _offer(near))
+
+    results = OfferService.search_offers(material_type="sand", destination="patna")
+    assert [r.id for r in results] == [str(cheap_far.id), str(dear_near.id)]
+    assert all(r.distance_km is None for r in results)
+
+    results = OfferService.search_offers(material_type="Sand", latitude=24.27, longitude=87.25)
+    assert [r.id for r in results] == [str(dear_near.id), str(cheap_far.id)]
+    assert results[0].distance_km < 5
+
+    assert [r.id for r in OfferService.search_offers(latitude=24.27, longitude=87.25, radius_km=50, max_price=5000)] == [
+        r.id for r in OfferService.search_offers(material_type="Stone")
+    ]
+
+    booked = service.book_offer(str(dear_near.id))
+    assert booked.status == PreloadedMaterialStatus.BOOKED
+    assert [r.id for r in OfferService.search_offers(material_type="Sand")] == [str(cheap_far.id)]
+    with pytest.raises(OfferNotAvailableException):
+        service.book_offer(str(dear_near.id))
+
+    service.withdraw_offer(str(cheap_far.id), owner)
+    assert OfferService.search_offers(material_type="Sand") == []
+
+    # A fresh load from the table sees the same available offers
+    assert offer_index.load(db) == 1
+
+
+def test_search_latency_at_thousands_of_offers():
+    rng = random.Random(11)
+    materials = ["Sand", "Stone", "Gravel", "Coal", "Cement"]
+    cities = ["Patna", "Ranchi", "Dhanbad", "Gaya", "Bhagalpur", "Jamshedpur", "Bokaro", "Dumka"]
+    for _ in range(5000):
+        offer = PreloadedMaterial(
+            id=uuid.uuid4(), truck_id=uuid.uuid4(), material_type=rng.choice(materials),
+            quantity=Decimal(20), unit="ton", destination=rng.choice(cities),
+            price=Decimal(rng.randint(2000, 9000)), status=PreloadedMaterialStatus.AVAILABLE,
+            created_at=datetime(2024, 5, 1)
+        )
+        offer_index.upsert(offer, 23 + rng.random() * 3, 85 + rng.random() * 3)
+    assert len(offer_index) == 5000
+
+    timings = []
+    for i in range(300):
+        kwargs = {"material_type": rng.choice(materials)}
+        if i % 2:
+            kwargs.update(latitude=24.27, longitude=87.25, radius_km=150)
+        if i % 3 == 0:
+            kwargs.update(destination=rng.choice(cities).lower()[:3], max_price=6000)
+        start = time.perf_counter()
+        OfferService.search_offers(**kwargs)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99)]
+    assert p99 < 10, f"p99 {p99:.2f}ms"
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for keyset pagination of list endpoints
+"""
+from datetime import datetime, timedelta
+import pytest
+from backend.config import settings
+from backend.core.exceptions import ValidationException
+from backend.models.vehicle_type import VehicleType
+from backend.services.booking_service import BookingService
+from backend.utils.pagination import PageParams, keyset_page, decode_cursor, encode_cursor
+from conftest import QueryCounter, make_user, make_vehicle_type, make_material_source, make_booking
+
+
+def test_bookings_page_through_history_without_gaps(db, sqlite_engine):
+    customer, other = make_user(db), make_user(db)
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db)
+    base = datetime(2024, 1, 1, 8, 0, 0)
+    expected = []
+    for i in range(23):
+        booking = make_booking(db, customer, source, vehicle_type)
+        # Groups of three share a timestamp so the id tie-break matters
+        booking.created_at = base + timedelta(minutes=i // 3)
+        expected.append(booking)
+    make_booking(db, other, source, vehicle_type)
+    db.commit()
+    expected.sort(key=lambda b: (b.created_at, b.id.hex), reverse=True)
+    expected_ids = [str(b.id) for b in expected]
+    customer_id = customer.id
+
+    service = BookingService(db)
+    seen, cursor, pages = [], None, 0
+    while True:
+        with QueryCounter(sqlite_engine) as counter:
+            bookings, cursor = service.get_bookings(customer_id, page=PageParams(cursor=cursor, limit=5))
+        assert counter.queries == 1
+        seen.extend(str(b.id) for b in bookings)
+        pages += 1
+        if cursor is None:
+            break
+    assert seen == expected_ids
+    assert pages == 5
+
+
+def test_page_size_is_capped_and_cursor_validated(db, monkeypatch):
+    monkeypatch.setattr(settings, "PAGE_SIZE_MAX", 3)
+    for capacity in range(10, 17):
+        make_vehicle_type(db, capacity)
+
+    page = PageParams(cursor=None, limit=1000)
+    assert page.limit == 3
+    vehicle_types, cursor = keyset_page(db.query(VehicleType), VehicleType, page)
+    assert len(vehicle_types) == 3 and cursor
+
+    created_at, row_id = decode_cursor(cursor)
+    assert (created_at, row_id) == (vehicle_types[-1].created_at, str(vehicle_types[-1].id))
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+    for bad in ("not-a-cursor", encode_cursor(created_at, "not-a-uuid")):
+        with pytest.raises(ValidationException):
+            keyset_page(db.query(VehicleType), VehicleType, PageParams(cursor=bad, limit=3))
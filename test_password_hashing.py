@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark and checks for running bcrypt in the password hashing process pool
+"""
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from backend.config import settings
+from backend.core import password_hashing
+from backend.core.exceptions import ServiceBusyException
+from backend.core.security import get_password_hash, verify_password
+
+CONCURRENT_LOGINS = 16
+PASSWORD = "correct horse battery"
+
+
+def bcrypt_usable() -> bool:
+    """passlib 1.7 cannot drive bcrypt >= 4.1; hashing itself is then unavailable"""
+    try:
+        password_hashing.hash_password("probe")
+        return True
+    except (ValueError, AttributeError):
+        return False
+
+
+needs_bcrypt = pytest.mark.skipif(not bcrypt_usable(), reason="passlib cannot use the installed bcrypt")
+
+
+@pytest.fixture
+def hash_pool(monkeypatch):
+    """Fresh pool per test with the settings it patches"""
+    password_hashing.shutdown_hash_pool()
+    yield monkeypatch
+    password_hashing.shutdown_hash_pool()
+
+
+def test_pool_refuses_calls_beyond_its_queue(hash_pool):
+    hash_pool.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    hash_pool.setattr(settings, "PASSWORD_HASH_QUEUE_SIZE", 0)
+    hash_pool.setattr(settings, "PASSWORD_HASH_WAIT_SECONDS", 0.05)
+
+    busy = threading.Thread(target=password_hashing.run_in_hash_pool, args=(time.sleep, 1.0))
+    busy.start()
+    time.sleep(0.2)
+    with pytest.raises(ServiceBusyException) as refused:
+        password_hashing.run_in_hash_pool(time.sleep, 0)
+    assert refused.value.status_code == 503
+    assert refused.value.headers["Retry-After"]
+    busy.join()
+    # The slot is free again once the running call finishes
+    password_hashing.run_in_hash_pool(time.sleep, 0)
+
+
+@needs_bcrypt
+def test_hash_and_verify_in_pool(hash_pool):
+    hash_pool.setattr(settings, "PASSWORD_HASH_WORKERS", 2)
+    hashed = get_password_hash(PASSWORD)
+    assert verify_password(PASSWORD, hashed)
+    assert not verify_password("wrong password", hashed)
+
+
+def _login_burst(hashed: str) -> float:
+    """Logins per second with CONCURRENT_LOGINS request threads verifying at once"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(CONCURRENT_LOGINS) as threads:
+        results = list(threads.map(lambda _: verify_password(PASSWORD, hashed), range(CONCURRENT_LOGINS)))
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    return CONCURRENT_LOGINS / elapsed
+
+
+@needs_bcrypt
+def test_concurrent_login_throughput(hash_pool):
+    hashed = password_hashing.hash_password(PASSWORD)
+
+    hash_pool.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    inline = _login_burst(hashed)
+
+    hash_pool.setattr(settings, "PASSWORD_HASH_WORKERS", None)
+    password_hashing.run_in_hash_pool(time.sleep, 0)  # start the worker processes
+    pooled = _login_burst(hashed)
+
+    print(f"Inline bcrypt:    {inline:.1f} logins/s")
+    print(f"Hash pool ({password_hashing.hash_workers()} procs): {pooled:.1f} logins/s")
+    if (os.cpu_count() or 1) >= 4:
+        assert pooled > inline
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-s", "-q"])
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for connection pool metrics
+"""
+import time
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from backend.core.pool_metrics import InstrumentedQueuePool, PoolMetricsRegistry
+
+
+def _engine(tmp_path, **options):
+    return create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+        pool_size=1, max_overflow=0, pool_timeout=0.2, **options
+    )
+
+
+def test_checkout_occupancy_timeouts_and_wait_histogram(tmp_path):
+    registry = PoolMetricsRegistry()
+    engine = _engine(tmp_path)
+    registry.register("test", engine)
+
+    held = engine.connect()
+    held.execute(text("SELECT 1"))
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    [stats] = registry.snapshot()
+    assert (stats["pool_size"], stats["checked_out"], stats["checked_in"], stats["overflow"]) == (1, 1, 0, 0)
+    assert stats["checkout_timeouts"] == 1
+
+    held.close()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    [stats] = registry.snapshot()
+    wait = stats["checkout_wait"]
+    assert (stats["checked_out"], stats["checkouts"], stats["connections_created"]) == (0, 2, 1)
+    assert wait["count"] == 3
+    # The timed out checkout waited pool_timeout and lands in the 250 ms bucket, the others below it
+    assert wait["max_ms"] >= 200
+    counts = {bucket["le_ms"]: bucket["count"] for bucket in wait["buckets"]}
+    assert counts[100] == 2 and counts[250] == 3 and counts[None] == 3
+
+    # A disposed pool is replaced by one reporting to the same metrics
+    engine.dispose()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    [stats] = registry.snapshot()
+    assert (stats["checkout_wait"]["count"], stats["connections_created"], stats["connections_closed"]) == (4, 2, 1)
+
+
+def test_recycled_and_invalidated_connections_are_told_apart(tmp_path):
+    registry = PoolMetricsRegistry()
+    engine = _engine(tmp_path, pool_recycle=3600)
+    metrics = registry.register("test", engine)
+
+    with engine.connect() as conn:
+        conn.invalidate()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert (metrics.connections_invalidated, metrics.connections_recycled, metrics.connections_created) == (1, 0, 2)
+
+    engine.pool._recycle = 0.01
+    time.sleep(0.02)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert (metrics.connections_invalidated, metrics.connections_recycled, metrics.connections_created) == (1, 1, 3)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression suite: runs the hot service queries against a seeded database,
+captures EXPLAIN output for every statement they issue and fails on full table scans
+or sorts that the indexes should have avoided.
+"""
+import re
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event, text
+from backend.models.booking import BookingStatus
+from backend.models.material import MaterialType, MaterialTypeModel
+from backend.models.truck import Truck
+from backend.models.user_role import UserRole
+from backend.services.booking_service import BookingService
+from backend.services.dispatch_service import DispatchService
+from backend.services.truck_pool import truck_pool
+from backend.utils.pagination import PageParams
+from conftest import make_user, make_vehicle_type, make_material_source, make_truck, make_booking
+
+
+# "SCAN trucks" without "USING ... INDEX" reads the whole table
+_SQLITE_FULL_SCAN = re.compile(r"SCAN (\S+)( AS \S+)?( LEFT-JOIN)?$")
+
+# One row per MaterialType value; scanning it is cheaper than an index probe
+SMALL_TABLES = {"material_types"}
+
+
+class PlanCapture:
+    """Records every SELECT issued on an engine together with its parameters"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def explain(engine, statement, parameters):
+    """Plan problems of one statement: full scans and sorts that did not come from an index"""
+    problems = []
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            for row in rows:
+                detail = row[-1]
+                scan = _SQLITE_FULL_SCAN.match(detail)
+                if scan and scan.group(1) not in SMALL_TABLES:
+                    problems.append(detail)
+                if "USE TEMP B-TREE FOR" in detail:
+                    problems.append(detail)
+        else:
+            result = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            columns = list(result.keys())
+            for row in result:
+                plan = dict(zip(columns, row))
+                if plan.get("type") == "ALL" and plan.get("table") not in SMALL_TABLES:
+                    problems.append(f"full scan of {plan.get('table')}")
+                if "Using filesort" in (plan.get("Extra") or ""):
+                    problems.append(f"filesort on {plan.get('table')}")
+    return problems
+
+
+@pytest.fixture
+def seeded(db):
+    """A few hundred trucks, bookings and history rows across several users and vehicle types"""
+    owners = [make_user(db, UserRole.TRUCK_OWNER) for _ in range(5)]
+    customers = [make_user(db) for _ in range(10)]
+    vehicle_types = [make_vehicle_type(db, capacity) for capacity in (15, 20, 25, 30)]
+    for material_type in MaterialType:
+        if material_type != MaterialType.SAND:
+            db.add(MaterialTypeModel(type=material_type))
+    sources = [make_material_source(db, 24.0 + i * 0.1, 87.25, location=f"Site {i}") for i in range(20)]
+    source = sources[0]
+    for i in range(200):
+        make_truck(db, vehicle_types[i % 4], owners[i % 5], 24.0 + i * 0.01, 87.0)
+    statuses = list(BookingStatus)
+    base = datetime(2024, 1, 1)
+    bookings = []
+    for i in range(300):
+        booking = make_booking(db, customers[i % 10], source, vehicle_types[i % 4])
+        booking.status = statuses[i % len(statuses)]
+        booking.created_at = base + timedelta(minutes=i)
+        bookings.append(booking)
+    db.commit()
+    service = BookingService(db)
+    for booking in bookings[:100]:
+        service._add_status_history(booking, BookingStatus.PENDING, "Booking created")
+    db.commit()
+    db.execute(text("ANALYZE"))
+    return {"customer_id": customers[0].id, "booking": bookings[0]}
+
+
+def _check(sqlite_engine, run):
+    with PlanCapture(sqlite_engine) as capture:
+        run()
+    assert capture.statements
+    for statement, parameters in capture.statements:
+        problems = explain(sqlite_engine, statement, parameters)
+        assert not problems, f"{problems} in plan of:\n{statement}"
+
+
+def test_truck_candidate_query_uses_index(db, sqlite_engine, seeded, monkeypatch):
+    monkeypatch.setattr(truck_pool, "loaded", False)
+    booking = seeded["booking"]
+    booking_id = booking.id
+    db.expire_all()
+    booking = BookingService(db).get_booking_details(booking_id)
+    _check(sqlite_engine, lambda: BookingService(db)._find_candidate_trucks(booking))
+
+
+def test_booking_list_queries_use_index(db, sqlite_engine, seeded):
+    service = BookingService(db)
+    customer_id = seeded["customer_id"]
+
+    def run():
+        _, cursor = service.get_bookings(customer_id, page=PageParams(cursor=None, limit=5))
+        service.get_bookings(customer_id, page=PageParams(cursor=cursor, limit=5))
+        _, cursor = service.get_bookings(customer_id, BookingStatus.PENDING, PageParams(cursor=None, limit=2))
+        service.get_bookings(customer_id, BookingStatus.PENDING, PageParams(cursor=cursor, limit=2))
+
+    _check(sqlite_engine, run)
+
+
+def test_booking_history_and_details_use_index(db, sqlite_engine, seeded):
+    service = BookingService(db)
+    booking_id = str(seeded["booking"].id)
+
+    def run():
+        service.get_booking_status_history(booking_id)
+        service.get_booking_with_details(booking_id)
+
+    _check(sqlite_engine, run)
+
+
+def test_pending_dispatch_query_uses_index(db, sqlite_engine, seeded):
+    vehicle_type_ids = {vehicle_type_id for (vehicle_type_id,) in db.query(Truck.vehicle_type_id).distinct()}
+    aged_out = {str(seeded["booking"].id)}
+    _check(sqlite_engine, lambda: DispatchService(db)._pending_bookings(vehicle_type_ids, aged_out))
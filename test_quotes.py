@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the material plus freight quote engine
+"""
+import random
+import time
+import uuid
+from decimal import Decimal
+import pytest
+from backend.models.vehicle_type import FreightTariff
+from backend.schemas.quote import QuoteRequest
+from backend.schemas.vehicle_type import FreightTariffResponse
+from backend.services.quote_service import QuoteService, pricing_cache
+from conftest import QueryCounter, make_material_source, make_vehicle_type
+
+
+@pytest.fixture(autouse=True)
+def fresh_tables():
+    pricing_cache.invalidate()
+    yield
+    pricing_cache.invalidate()
+
+
+def _tariff(db, vehicle_type, base_fare=1000, rate_per_km=50, minimum_fare=0):
+    tariff = FreightTariff(
+        vehicle_type_id=vehicle_type.id, base_fare=Decimal(base_fare),
+        rate_per_km=Decimal(rate_per_km), minimum_fare=Decimal(minimum_fare)
+    )
+    db.add(tariff)
+    db.commit()
+    return tariff
+
+
+def _request(source, vehicle_type, quantity, latitude=24.27, longitude=87.25):
+    return QuoteRequest(
+        material_source_id=str(source.id), vehicle_type_id=str(vehicle_type.id), quantity=Decimal(quantity),
+        destination_latitude=latitude, destination_longitude=longitude
+    )
+
+
+def test_quote_prices_material_and_freight(db):
+    source = make_material_source(db, 24.27, 87.25, price_per_unit=1200)
+    unpriced = make_material_source(db, 24.30, 87.30)
+    unpriced.price_per_unit = None
+    db.commit()
+    truck_30 = make_vehicle_type(db, capacity_ton=30)
+    no_tariff = make_vehicle_type(db, capacity_ton=10)
+    tariff = _tariff(db, truck_30, base_fare=1000, rate_per_km=50, minimum_fare=2000)
+    assert FreightTariffResponse.model_validate(tariff).vehicle_type_id == str(truck_30.id)
+
+    results = QuoteService(db).quote_batch([
+        # Same place: one trip at the minimum fare
+        _request(source, truck_30, 20),
+        # 70 ton needs three trips
+        _request(source, truck_30, 70, latitude=24.57),
+        _request(unpriced, truck_30, 10),
+        _request(source, no_tariff, 10),
+        QuoteRequest(
+            material_source_id=uuid.uuid4().hex, vehicle_type_id=str(truck_30.id), quantity=Decimal(1),
+            destination_latitude=0, destination_longitude=0
+        ),
+    ])
+    assert results[0].trips == 1
+    assert results[0].material_cost == Decimal("24000.00")
+    assert results[0].freight_cost == Decimal("2000.00")
+    assert results[0].total_cost == Decimal("26000.00")
+
+    far = results[1]
+    assert far.trips == 3
+    assert 41 < far.distance_km < 42.5
+    assert float(far.freight_cost) == pytest.approx(3 * (1000 + 50 * far.distance_km), abs=0.1)
+    assert far.total_cost == far.material_cost + far.freight_cost
+
+    assert [r.error for r in results[2:]] == [
+        "Material source has no price", "No freight tariff for vehicle type", "Material source not found"
+    ]
+    assert results[2].total_cost is None
+
+
+def test_batch_quotes_read_cached_tables_once(db, sqlite_engine):
+    rng = random.Random(20)
+    sources = [make_material_source(db, rng.uniform(22, 26), rng.uniform(84, 88)) for _ in range(40)]
+    vehicle_types = [make_vehicle_type(db, capacity_ton=c) for c in (10, 20, 30)]
+    for vehicle_type in vehicle_types:
+        _tariff(db, vehicle_type)
+    requests = [
+        _request(rng.choice(sources), rng.choice(vehicle_types), rng.randint(5, 100),
+                 rng.uniform(22, 26), rng.uniform(84, 88))
+        for _ in range(1000)
+    ]
+    service = QuoteService(db)
+
+    with QueryCounter(sqlite_engine) as counter:
+        first = service.quote_batch(requests)
+    assert counter.queries == 2
+    with QueryCounter(sqlite_engine) as counter:
+        started = time.perf_counter()
+        second = service.quote_batch(requests)
+        elapsed = time.perf_counter() - started
+    assert counter.queries == 0
+    assert first == second
+    assert all(r.error is None for r in second)
+    assert elapsed < 0.5
+
+    # A price change is seen once the tables are invalidated
+    sources[0].price_per_unit = Decimal(1)
+    db.commit()
+    pricing_cache.invalidate()
+    cheap = service.quote_batch([_request(sources[0], vehicle_types[0], 10)])[0]
+    assert cheap.material_cost == Decimal("10.00")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for per-user rating aggregates kept alongside rating inserts
+"""
+import pytest
+from backend.core.exceptions import RatingNotAllowedException
+from backend.models.booking import BookingStatus
+from backend.models.rating import UserRatingAggregate
+from backend.models.truck import Truck
+from backend.models.user import User
+from backend.models.user_role import UserRole
+from backend.schemas.rating import RatingCreate
+from backend.schemas.user import UserResponse
+from backend.services.rating_service import RatingService
+from backend.services.truck_pool import truck_pool
+from conftest import QueryCounter, make_user, make_vehicle_type, make_material_source, make_truck, make_booking
+
+
+def _completed_booking(db, customer, truck, vehicle_type, source):
+    booking = make_booking(db, customer, source, vehicle_type)
+    booking.assigned_truck_id = truck.id
+    booking.status = BookingStatus.COMPLETED
+    db.commit()
+    return booking
+
+
+def test_ratings_update_aggregates_in_one_transaction(db, sqlite_engine):
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    customers = [make_user(db) for _ in range(3)]
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db, 24.27, 87.25)
+    truck = make_truck(db, vehicle_type, owner, 24.27, 87.25)
+    bookings = [_completed_booking(db, customer, truck, vehicle_type, source) for customer in customers]
+    service = RatingService(db)
+
+    with QueryCounter(sqlite_engine) as counter:
+        service.create_rating(customers[0].id, RatingCreate(booking_id=str(bookings[0].id), rating=5))
+    assert counter.commits == 1
+
+    service.create_rating(customers[1].id, RatingCreate(booking_id=str(bookings[1].id), rating=4))
+    service.create_rating(customers[2].id, RatingCreate(booking_id=str(bookings[2].id), rating=4, review="Late"))
+    # The owner rates the customer back
+    service.create_rating(owner.id, RatingCreate(booking_id=str(bookings[0].id), rating=3))
+
+    summary = service.get_user_summary(owner.id)
+    assert summary.rating_count == 3
+    assert summary.rating_average == 4.33
+    assert summary.histogram == {1: 0, 2: 0, 3: 0, 4: 2, 5: 1}
+    assert service.get_user_summary(customers[0].id).histogram[3] == 1
+    assert service.get_user_summary(customers[1].id).rating_count == 0
+
+    # Exposed on users and trucks without touching the ratings table
+    db.expire_all()
+    assert (owner.rating_average, owner.rating_count) == (4.33, 3)
+    listed = db.query(Truck).all()
+    assert (listed[0].owner_rating_average, listed[0].owner_rating_count) == (4.33, 3)
+    assert db.query(UserRatingAggregate).count() == 2
+
+    # The truck pool keeps the owner's running average for dispatch scoring
+    assert truck_pool.owner_rating(owner.id) is not None
+
+
+def test_rating_rules(db):
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    customer, stranger = make_user(db), make_user(db)
+    vehicle_type = make_vehicle_type(db, 30)
+    source = make_material_source(db)
+    truck = make_truck(db, vehicle_type, owner)
+    service = RatingService(db)
+
+    pending = make_booking(db, customer, source, vehicle_type)
+    with pytest.raises(RatingNotAllowedException):
+        service.create_rating(customer.id, RatingCreate(booking_id=str(pending.id), rating=5))
+
+    booking = _completed_booking(db, customer, truck, vehicle_type, source)
+    with pytest.raises(RatingNotAllowedException):
+        service.create_rating(stranger.id, RatingCreate(booking_id=str(booking.id), rating=5))
+
+    service.create_rating(customer.id, RatingCreate(booking_id=str(booking.id), rating=2))
+    with pytest.raises(RatingNotAllowedException):
+        service.create_rating(customer.id, RatingCreate(booking_id=str(booking.id), rating=5))
+    assert service.get_user_summary(owner.id).rating_count == 1
+
+    with pytest.raises(ValueError):
+        RatingCreate(booking_id=str(booking.id), rating=6)
+
+
+def test_users_serialise_with_their_rating_in_one_query(db, sqlite_engine):
+    users = [make_user(db) for _ in range(3)]
+    rated, unrated = users[0].id, users[1].id
+    user_ids = [user.id for user in users]
+    db.add(UserRatingAggregate(user_id=rated.replace("-", ""), rating_count=2, rating_sum=9))
+    db.commit()
+    db.expire_all()
+
+    with QueryCounter(sqlite_engine) as counter:
+        loaded = db.query(User).filter(User.id.in_(user_ids)).all()
+        serialised = {r.id: r for r in (UserResponse.model_validate(user) for user in loaded)}
+    assert counter.queries == 1
+    assert (serialised[rated].rating_count, serialised[rated].rating_average) == (2, 4.5)
+    assert (serialised[unrated].rating_count, serialised[unrated].rating_average) == (0, None)
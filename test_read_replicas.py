@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for read replica routing
+"""
+import contextvars
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from backend.config import settings
+from backend.core.read_replicas import Replica, ReplicaRouter, get_async_read_db, get_read_db, replica_router
+from backend.database import AsyncSessionLocal, request_user_id
+from backend.models.user_role import UserRole
+from conftest import make_user
+
+
+def _replica(path, name):
+    return Replica(name, create_engine(f"sqlite:///{path}"), create_async_engine(f"sqlite+aiosqlite:///{path}"))
+
+
+def test_round_robin_over_healthy_replicas_with_read_your_writes(tmp_path, monkeypatch):
+    first, second = _replica(tmp_path / "r0.db", "replica-0"), _replica(tmp_path / "r1.db", "replica-1")
+    router = ReplicaRouter([first, second])
+
+    assert [router.pick().name for _ in range(4)] == ["replica-0", "replica-1", "replica-0", "replica-1"]
+
+    second.healthy = False
+    assert {router.pick().name for _ in range(3)} == {"replica-0"}
+    first.healthy = False
+    assert router.pick() is None
+    first.healthy = second.healthy = True
+
+    # A user who just wrote reads from the primary until the window passes; others are unaffected
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0.05)
+    router.note_write("writer")
+    assert router.pick("writer") is None
+    assert router.pick("reader") is not None
+    time.sleep(0.06)
+    assert router.pick("writer") is not None
+
+    assert ReplicaRouter([]).pick() is None
+
+
+def test_health_check_takes_unreachable_replicas_out_of_rotation(tmp_path, run_async):
+    reachable = _replica(tmp_path / "r0.db", "replica-0")
+    unreachable = _replica(tmp_path / "missing" / "r1.db", "replica-1")
+    router = ReplicaRouter([reachable, unreachable])
+
+    run_async(router.check_health())
+    run_async(router.dispose())
+    assert (reachable.healthy, unreachable.healthy) == (True, False)
+    assert {router.pick().name for _ in range(3)} == {"replica-0"}
+
+
+def test_committed_writes_of_the_request_user_are_noted(db):
+    user = make_user(db, UserRole.CUSTOMER)
+    other = make_user(db, UserRole.CUSTOMER)
+
+    def update(user_id, first_name):
+        request_user_id.set(user_id)
+        user.first_name = first_name
+        db.commit()
+
+    contextvars.copy_context().run(update, str(user.id), "Renamed")
+    assert replica_router.recently_wrote(user.id)
+
+    # Commits without changes, and commits made outside a request, are nobody's writes
+    contextvars.copy_context().run(lambda: (request_user_id.set(str(other.id)), db.commit()))
+    assert not replica_router.recently_wrote(other.id)
+    writers = dict(replica_router._writes)
+    user.last_name = "Changed"
+    db.commit()
+    assert replica_router._writes.keys() == writers.keys()
+
+
+def test_read_sessions_are_bound_to_the_picked_replica(tmp_path, run_async, monkeypatch):
+    replica = _replica(tmp_path / "r0.db", "replica-0")
+    monkeypatch.setattr(replica_router, "replicas", [replica])
+
+    sync_dependency = get_read_db(user_id=None)
+    assert next(sync_dependency).get_bind() is replica.engine
+    sync_dependency.close()
+
+    async def async_binds(user_id):
+        dependency = get_async_read_db(user_id=user_id)
+        db = await dependency.__anext__()
+        await dependency.aclose()
+        return db.bind
+
+    assert run_async(async_binds(None)) is replica.async_engine
+    replica_router.note_write("writer")
+    assert run_async(async_binds("writer")) is AsyncSessionLocal.kw["bind"]
+    run_async(replica.async_engine.dispose())
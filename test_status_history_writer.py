@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for the batched booking status history writer
+"""
+import asyncio
+import uuid
+from datetime import datetime
+import pytest
+from sqlalchemy import func
+from backend.config import settings
+from backend.database import unit_of_work
+from backend.models.booking import BookingStatus, BookingStatusHistory
+from backend.services.status_history_writer import StatusHistoryWriter, status_history_writer
+from conftest import QueryCounter, make_user, make_vehicle_type, make_material_source, make_booking
+
+
+def _history_inserts(counter):
+    return [s for s in counter.statements if s.startswith("INSERT INTO booking_status_history")]
+
+
+def _history_count(db):
+    return db.query(func.count(BookingStatusHistory.id)).scalar()
+
+
+def _bookings(db, count):
+    customer = make_user(db)
+    vehicle_type = make_vehicle_type(db)
+    source = make_material_source(db, 24.27, 87.25)
+    return [make_booking(db, customer, source, vehicle_type) for _ in range(count)]
+
+
+def test_transactional_rows_are_one_insert_in_the_callers_commit(db, sqlite_engine, monkeypatch):
+    monkeypatch.setattr(settings, "HISTORY_WRITE_MODE", "transactional")
+    bookings = _bookings(db, 50)
+
+    with QueryCounter(sqlite_engine) as counter:
+        with unit_of_work(db):
+            for booking in bookings:
+                booking.status = BookingStatus.CANCELLED
+                status_history_writer.add(db, booking.id, BookingStatus.CANCELLED, "Cancelled")
+
+    assert len(_history_inserts(counter)) == 1
+    assert counter.commits == 1
+    assert _history_count(db) == 50
+
+
+def test_rolled_back_rows_are_dropped(db, monkeypatch):
+    monkeypatch.setattr(settings, "HISTORY_WRITE_MODE", "transactional")
+    booking = _bookings(db, 1)[0]
+
+    try:
+        with unit_of_work(db):
+            status_history_writer.add(db, booking.id, BookingStatus.CANCELLED)
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    db.commit()
+
+    assert _history_count(db) == 0
+
+
+def test_buffered_rows_are_written_in_batches_after_commit(db, sqlite_engine, session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "HISTORY_WRITE_MODE", "buffered")
+    monkeypatch.setattr(settings, "HISTORY_BATCH_SIZE", 100)
+    monkeypatch.setattr(settings, "HISTORY_FLUSH_INTERVAL_SECONDS", 60.0)
+    bookings = _bookings(db, 250)
+    writer = status_history_writer
+
+    async def scenario():
+        await writer.start(session_factory)
+        for booking in bookings:
+            with unit_of_work(db):
+                writer.add(db, booking.id, BookingStatus.TRUCK_ASSIGNED)
+        # Not written by the callers' commits
+        assert _history_count(db) == 0
+        # A full batch triggers a flush long before the interval
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if not len(writer):
+                break
+        assert len(writer) == 0
+        await writer.stop()
+
+    with QueryCounter(sqlite_engine) as counter:
+        asyncio.run(scenario())
+    # One insert per batch rather than per commit
+    assert len(_history_inserts(counter)) == 3
+    db.expire_all()
+    assert _history_count(db) == 250
+
+
+def test_buffer_is_bounded_while_the_database_keeps_failing(db, session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "HISTORY_BUFFER_MAX", 5)
+    bookings = _bookings(db, 8)
+    writer = StatusHistoryWriter()
+
+    def unavailable():
+        raise RuntimeError("database unavailable")
+
+    writer._session_factory = unavailable
+    rows = [
+        {"id": uuid.uuid4(), "booking_id": booking.id, "status": "pending", "notes": str(i), "updated_at": datetime(2024, 1, 1, 0, i)}
+        for i, booking in enumerate(bookings)
+    ]
+    writer._enqueue(rows[:4])
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert (len(writer), writer.dropped) == (4, 0)
+
+    # Only the newest rows are kept, and the dropped ones are counted
+    writer._enqueue(rows[4:])
+    assert (len(writer), writer.dropped) == (5, 3)
+    writer._session_factory = session_factory
+    assert writer.flush() == 5
+    kept = db.query(BookingStatusHistory.notes).order_by(BookingStatusHistory.updated_at).all()
+    assert [notes for (notes,) in kept] == ["3", "4", "5", "6", "7"]
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for delta-encoded trip track storage
+"""
+import random
+from datetime import datetime, timedelta
+from backend.config import settings
+from backend.models.booking import BookingStatus, TripTrackSegment
+from backend.models.user_role import UserRole
+from backend.services.location_ingest import LocationIngestor
+from backend.services.track_store import TrackStore
+from backend.schemas.truck import LocationBatch
+from backend.utils.track_codec import decode_points, encode_points
+from conftest import make_user, make_vehicle_type, make_material_source, make_truck, make_booking
+
+
+def test_codec_round_trip_and_append():
+    rng = random.Random(7)
+    points, t, lat, lon = [], 0, 24_270_000, 87_250_000
+    for _ in range(600):
+        t += rng.randint(900, 1100)
+        lat += rng.randint(-300, 300)
+        lon += rng.randint(-300, 300)
+        points.append((t, lat, lon))
+
+    data = encode_points(points)
+    assert decode_points(data) == points
+    # A 1 Hz trace of slow moving trucks packs to a few bytes per point
+    assert len(data) / len(points) < 8
+    # Encoding the second half against the last point of the first gives the same blob
+    assert encode_points(points[:300]) + encode_points(points[300:], points[299]) == data
+    # Negative coordinates and backwards deltas survive zigzag encoding
+    assert decode_points(encode_points([(5, -33_000_000, -70_500_000), (3, -33_000_001, 151_000_000)])) == [
+        (5, -33_000_000, -70_500_000), (3, -33_000_001, 151_000_000)
+    ]
+
+
+def test_trip_pings_are_stored_in_segments_and_read_by_range(db, monkeypatch):
+    monkeypatch.setattr(settings, "TRACK_SEGMENT_SECONDS", 600)
+    customer = make_user(db)
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db)
+    source = make_material_source(db, 24.27, 87.25)
+    truck = make_truck(db, vehicle_type, owner, 24.27, 87.25)
+    idle_truck = make_truck(db, vehicle_type, owner, 24.27, 87.25)
+    booking = make_booking(db, customer, source, vehicle_type)
+    booking.assigned_truck_id = truck.id
+    booking.status = BookingStatus.IN_TRANSIT
+    db.commit()
+
+    # One hour of 1 Hz pings for both trucks, delivered in 5 second batches
+    start = datetime(2024, 5, 1, 10, 0, 0)
+    ingestor = LocationIngestor()
+    for batch in range(720):
+        pings = []
+        for second in range(batch * 5, batch * 5 + 5):
+            for t in (truck, idle_truck):
+                pings.append({
+                    "truck_id": str(t.id), "latitude": 24.27 + second * 1e-5, "longitude": 87.25,
+                    "recorded_at": (start + timedelta(seconds=second)).isoformat()
+                })
+        ingestor.ingest(LocationBatch(pings=pings).pings)
+        if batch % 12 == 11:
+            ingestor.flush(db)
+    # A re-sent batch does not duplicate points
+    ingestor.ingest(LocationBatch(pings=pings).pings)
+    ingestor.flush(db)
+
+    segments = db.query(TripTrackSegment).all()
+    assert len(segments) == 6
+    assert sum(segment.point_count for segment in segments) == 3600
+    assert sum(len(segment.data) for segment in segments) < 3600 * 8
+
+    store = TrackStore()
+    points, segments_read = store.polyline(db, booking.id)
+    assert len(points) == 3600 and segments_read == 6
+    assert points[0] == (start, 24.27, 87.25)
+
+    # Ten minutes in the middle only touches the two segments it overlaps
+    window_start = start + timedelta(minutes=25)
+    points, segments_read = store.polyline(db, booking.id, window_start, window_start + timedelta(minutes=10))
+    assert segments_read == 2
+    assert len(points) == 601
+    assert points[0][0] == window_start and points[-1][0] == window_start + timedelta(minutes=10)
+
+    # One point a minute, plus the final position
+    points, _ = store.polyline(db, booking.id, resolution_seconds=60)
+    assert len(points) == 61
+    assert points[1][0] == start + timedelta(minutes=1)
+    assert points[-1][0] == start + timedelta(seconds=3599)
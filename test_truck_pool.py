@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark and correctness checks for the in-memory truck pool against a full scan
+"""
+import sys
+import os
+import random
+import time
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+from backend.models.truck import Truck, TruckStatus
+from backend.models.user_role import UserRole
+from backend.services.truck_pool import TruckPool
+from backend.utils.distance_calculator import DistanceCalculator
+
+TRUCK_COUNT = 20000
+VEHICLE_TYPES = [str(uuid.uuid4()) for _ in range(4)]
+QUERY_COUNT = 200
+
+
+def make_transient_truck(vehicle_type_id, lat, lon, available=True):
+    return Truck(
+        id=uuid.uuid4(),
+        vehicle_number=uuid.uuid4().hex[:10],
+        vehicle_type_id=vehicle_type_id,
+        truck_owner_id="owner",
+        driver_name="Driver",
+        driver_contact="9999999999",
+        current_location="Dumka",
+        latitude=lat,
+        longitude=lon,
+        is_available=available,
+        status=TruckStatus.AVAILABLE if available else TruckStatus.BOOKED
+    )
+
+
+def build_fleet(seed=42):
+    """Random trucks spread over Bihar / Jharkhand / West Bengal"""
+    rng = random.Random(seed)
+    return [
+        make_transient_truck(rng.choice(VEHICLE_TYPES), rng.uniform(21.5, 27.5), rng.uniform(83.0, 89.0))
+        for _ in range(TRUCK_COUNT)
+    ]
+
+
+def scan_nearest(fleet, vehicle_type_id, lat, lon, k, radius_km):
+    """What _auto_assign_truck did before the pool: look at every available truck"""
+    matches = []
+    for truck in fleet:
+        if truck.vehicle_type_id != vehicle_type_id:
+            continue
+        distance = DistanceCalculator.haversine_distance(lat, lon, truck.latitude, truck.longitude)
+        if distance <= radius_km:
+            matches.append((distance, str(truck.id)))
+    matches.sort()
+    return [(truck_id, distance) for distance, truck_id in matches[:k]]
+
+
+def test_truck_pool_matches_scan_and_is_faster():
+    fleet = build_fleet()
+    pool = TruckPool()
+    for truck in fleet:
+        pool.upsert(truck)
+
+    rng = random.Random(7)
+    queries = [
+        (rng.choice(VEHICLE_TYPES), rng.uniform(22.0, 27.0), rng.uniform(83.5, 88.5))
+        for _ in range(QUERY_COUNT)
+    ]
+
+    start = time.perf_counter()
+    scan_results = [scan_nearest(fleet, vt, lat, lon, 10, 50.0) for vt, lat, lon in queries]
+    scan_time = (time.perf_counter() - start) / QUERY_COUNT
+
+    start = time.perf_counter()
+    pool_results = [pool.nearest(vt, lat, lon, k=10, radius_km=50.0) for vt, lat, lon in queries]
+    pool_time = (time.perf_counter() - start) / QUERY_COUNT
+
+    for expected, actual in zip(scan_results, pool_results):
+        assert [record.id for record, _ in actual] == [truck_id for truck_id, _ in expected]
+
+    print(f"Full scan:   {scan_time * 1000:.3f} ms/query over {TRUCK_COUNT} trucks")
+    print(f"Truck pool:  {pool_time * 1000:.3f} ms/query")
+    assert pool_time < scan_time
+
+
+def test_truck_pool_write_through():
+    pool = TruckPool()
+    vehicle_type_id = VEHICLE_TYPES[0]
+    near = make_transient_truck(vehicle_type_id, 24.27, 87.25)
+    far = make_transient_truck(vehicle_type_id, 24.30, 87.30)
+    pool.upsert(near)
+    pool.upsert(far)
+    assert [r.id for r, _ in pool.nearest(vehicle_type_id, 24.27, 87.25, k=2)] == [str(near.id), str(far.id)]
+
+    # Assigned trucks drop out and remember when they were last used
+    pool.mark_assigned(near.id)
+    assert [r.id for r, _ in pool.nearest(vehicle_type_id, 24.27, 87.25, k=2)] == [str(far.id)]
+    assert pool.get(near.id).last_assigned_ts is not None
+
+    pool.mark_available(near.id)
+    assert len(pool.available(vehicle_type_id)) == 2
+
+    # Moved trucks are re-bucketed
+    far.latitude, far.longitude = 26.0, 85.0
+    pool.upsert(far)
+    assert [r.id for r, _ in pool.nearest(vehicle_type_id, 26.0, 85.0, k=2)] == [str(far.id)]
+
+
+def test_truck_pool_reconcile_fixes_drift(db, sqlite_engine, monkeypatch):
+    from backend.config import settings
+    from conftest import QueryCounter, make_user, make_vehicle_type, make_truck
+
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db, 30)
+    truck = make_truck(db, vehicle_type, owner, 24.27, 87.25)
+    pool = TruckPool()
+    assert pool.load(db) == 1
+    assert pool.reconcile(db) == 0
+
+    # Another worker books the truck without telling this pool
+    truck.is_available = False
+    truck.status = TruckStatus.BOOKED
+    db.commit()
+    assert len(pool.available(vehicle_type.id)) == 1
+    pool.get(truck.id).completed_trips = 7
+    with QueryCounter(sqlite_engine) as counter:
+        assert pool.reconcile(db) == 1
+    assert pool.available(vehicle_type.id) == []
+    # Only the trucks are re-read; the pool's own trip count survives
+    assert counter.queries == 1 and "bookings" not in counter.statements[0]
+    assert pool.get(truck.id).completed_trips == 7
+
+    # A GPS move not yet written behind is not reverted to the stale row
+    pool.move(truck.id, 25.0, 86.0)
+    assert pool.reconcile(db) == 0
+    assert (pool.get(truck.id).latitude, pool.get(truck.id).longitude) == (25.0, 86.0)
+    monkeypatch.setattr(settings, "TRUCK_POOL_RECONCILE_KEEP_MOVED_SECONDS", 0)
+    assert pool.reconcile(db) == 1
+    assert pool.get(truck.id).latitude == 24.27
+
+
+def test_truck_pool_reconcile_applies_drift_of_trucks_reporting_positions(db):
+    from conftest import make_user, make_vehicle_type, make_truck
+
+    owner = make_user(db, UserRole.TRUCK_OWNER)
+    vehicle_type = make_vehicle_type(db, 30)
+    truck = make_truck(db, vehicle_type, owner, 24.27, 87.25)
+    pool = TruckPool()
+    pool.load(db)
+
+    # The truck keeps pinging while another worker takes it out of service
+    pool.move(truck.id, 24.28, 87.26)
+    truck.is_available = False
+    db.commit()
+    pool.move(truck.id, 24.29, 87.27)
+    assert pool.reconcile(db) == 1
+    assert pool.available(vehicle_type.id) == []
+    pool.move(truck.id, 24.30, 87.28)
+    assert pool.reconcile(db) == 0
+
+    # Back in service: available again, still at its latest reported position
+    truck.is_available = True
+    db.commit()
+    pool.move(truck.id, 24.31, 87.29)
+    assert pool.reconcile(db) == 1
+    [record] = pool.available(vehicle_type.id)
+    assert (record.latitude, record.longitude) == (24.31, 87.29)
+
+if __name__ == "__main__":
+    test_truck_pool_write_through()
+    test_truck_pool_matches_scan_and_is_faster()
+    print("✅ All tests passed!")
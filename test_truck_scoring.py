@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the truck scoring engine: signal behaviour and ranking of many candidates
+"""
+import random
+import time
+import uuid
+from backend.models.truck import Truck, TruckStatus
+from backend.services.truck_pool import TruckPool
+from backend.services.truck_scoring import TruckScorer
+
+WEIGHTS = {"distance": 0.45, "idle_time": 0.2, "least_used": 0.1, "owner_rating": 0.15, "preferred_owner": 0.1}
+ORIGIN = (24.27, 87.25)
+
+
+def add_truck(pool, lat, lon, owner_id="owner", last_assigned_ts=None, completed_trips=0):
+    truck = Truck(
+        id=uuid.uuid4(), vehicle_number=uuid.uuid4().hex[:10], vehicle_type_id="vt", truck_owner_id=owner_id,
+        driver_name="Driver", driver_contact="9999999999", current_location="Dumka",
+        latitude=lat, longitude=lon, is_available=True, status=TruckStatus.AVAILABLE
+    )
+    pool.upsert(truck)
+    record = pool.get(truck.id)
+    record.last_assigned_ts = last_assigned_ts
+    record.completed_trips = completed_trips
+    return record
+
+
+def test_scoring_signals_order_candidates():
+    pool = TruckPool()
+    scorer = TruckScorer(WEIGHTS, pool)
+
+    near, far = add_truck(pool, 24.27, 87.26), add_truck(pool, 24.50, 87.25)
+    assert scorer.rank([far, near], ORIGIN) == [near, far]
+
+    # Same place: the truck that has been idle longer and done fewer trips goes first
+    busy = add_truck(pool, 24.27, 87.26, last_assigned_ts=time.time(), completed_trips=40)
+    rested = add_truck(pool, 24.27, 87.26, last_assigned_ts=time.time() - 2 * 86400, completed_trips=2)
+    assert scorer.rank([busy, rested], ORIGIN) == [rested, busy]
+
+    # Owner ratings are folded into the pool's records as they arrive
+    good, poor = add_truck(pool, 24.27, 87.26, owner_id="good"), add_truck(pool, 24.27, 87.26, owner_id="poor")
+    pool.record_owner_rating("good", 5)
+    pool.record_owner_rating("poor", 2)
+    assert (good.owner_rating, poor.owner_rating) == (5.0, 2.0)
+    assert scorer.rank([poor, good], ORIGIN) == [good, poor]
+
+    # A customer's earlier trips make that owner preferred for them only
+    pool.record_completed_trip(poor.id, "customer-1")
+    pool.record_owner_rating("poor", 5)
+    pool.record_owner_rating("poor", 5)
+    assert poor.completed_trips == 1
+    assert pool.customer_owners("customer-1") == {"poor"}
+    assert scorer.rank([good, poor], ORIGIN, customer_id="customer-1") == [poor, good]
+    assert scorer.rank([good, poor], ORIGIN, customer_id="customer-2") == [good, poor]
+
+
+def test_ranking_1k_candidates():
+    rng = random.Random(11)
+    pool = TruckPool()
+    owners = [str(uuid.uuid4()) for _ in range(200)]
+    now = time.time()
+    for _ in range(1000):
+        add_truck(
+            pool, rng.uniform(24.0, 24.5), rng.uniform(87.0, 87.5), owner_id=rng.choice(owners),
+            last_assigned_ts=now - rng.uniform(0, 72) * 3600 if rng.random() < 0.8 else None,
+            completed_trips=rng.randint(0, 300)
+        )
+    for owner_id in owners:
+        for _ in range(rng.randint(0, 5)):
+            pool.record_owner_rating(owner_id, rng.randint(1, 5))
+    pool.record_completed_trip(pool.available("vt")[0].id, "customer")
+
+    # Candidates arrive from the pool's geo lookup together with their distances
+    nearest = pool.nearest("vt", *ORIGIN, k=1000, radius_km=200.0)
+    candidates = [record for record, _ in nearest]
+    distances = [distance for _, distance in nearest]
+    scorer = TruckScorer(WEIGHTS, pool)
+
+    scorer.rank(candidates, ORIGIN, distances=distances)
+    runs = 50
+    start = time.perf_counter()
+    for _ in range(runs):
+        ranked = scorer.rank(candidates, ORIGIN, customer_id="customer", distances=distances)
+    elapsed = (time.perf_counter() - start) / runs
+
+    # The timing is a benchmark to read with -s, not a pass/fail criterion on shared runners
+    print(f"Ranked {len(candidates)} candidates in {elapsed * 1000:.3f} ms")
+    assert sorted(id(record) for record in ranked) == sorted(id(record) for record in candidates)
+    distance_of = {id(record): distance for record, distance in zip(candidates, distances)}
+    scores = scorer.scores(scorer.features(ranked, ORIGIN, "customer", [distance_of[id(r)] for r in ranked]))
+    assert all(a >= b for a, b in zip(scores, scores[1:]))